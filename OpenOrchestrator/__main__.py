@@ -3,6 +3,8 @@
 import argparse
 import subprocess
 
+from OpenOrchestrator.database import db_util, retention
+from OpenOrchestrator.scheduler import headless, output_capture, retention_job, warm_worker
 from OpenOrchestrator.scheduler.application import Application as s_app
 from OpenOrchestrator.orchestrator.application import Application as o_app
 
@@ -16,35 +18,92 @@ def main():
 
     subparsers = parser.add_subparsers(title="Subcommands", required=True)
 
-    o_parser = subparsers.add_parser("orchestrator", aliases=["o"], help="Start the Orchestrator application.")
+    pool_parser = argparse.ArgumentParser(add_help=False)
+    pool_group = pool_parser.add_argument_group("Connection pool", "Options for the database connection pool. Options in the connection string take precedence.")
+    pool_group.add_argument("--pool-size", type=int, help="The number of connections to keep open in the pool.")
+    pool_group.add_argument("--max-overflow", type=int, help="The number of connections allowed above the pool size.")
+    pool_group.add_argument("--pool-recycle", type=int, help="The number of seconds after which a connection is replaced.")
+    pool_group.add_argument("--pool-timeout", type=float, help="The number of seconds to wait for a connection from the pool.")
+    pool_group.add_argument("--no-pool-pre-ping", dest="pool_pre_ping", action="store_false", default=None, help="Set if connections shouldn't be tested before use.")
+
+    o_parser = subparsers.add_parser("orchestrator", aliases=["o"], parents=[pool_parser], help="Start the Orchestrator application.")
     o_parser.add_argument("-p", "--port", type=int, help="Set the desired port for Orchestrator.")
     o_parser.add_argument("-d", "--dont_show", action="store_false", help="Set if you don't want Orchestrator to open in the browser automatically.")
     o_parser.set_defaults(func=orchestrator_command)
 
-    s_parser = subparsers.add_parser("scheduler", aliases=["s"], help="Start the Scheduler application.")
+    s_parser = subparsers.add_parser("scheduler", aliases=["s"], parents=[pool_parser], help="Start the Scheduler application.")
+    s_parser.add_argument("--slots", type=int, help="The number of job slots for running triggers at the same time. Defaults to the number of CPUs.")
+    s_parser.add_argument("--forward-output", action="store_true", help="Set to write the output of processes to the Logs table.")
+    s_parser.add_argument("--warm-workers", type=int, default=0, help="The number of warm Python processes to keep ready for running processes. Defaults to 0 (disabled).")
+    s_parser.add_argument("--retention-policy", type=str, help="The path of a json retention policy to apply to logs and queue elements while running.")
+    s_parser.add_argument("--retention-interval", type=float, default=24, help="The number of hours between runs of the retention policy. Defaults to 24.")
+    headless_group = s_parser.add_argument_group("Headless", "Options for running the Scheduler without a window. The encryption key is read from the environment variable 'OpenOrchestratorKey'.")
+    headless_group.add_argument("--headless", action="store_true", help="Set to run the Scheduler without a window. Stop it with Ctrl+C or SIGTERM.")
+    headless_group.add_argument("-c", "--connection-string", type=str, help="The connection string to the database. Defaults to the environment variable 'OpenOrchestratorConnString'.")
+    headless_group.add_argument("-e", "--exclusive", action="store_true", help="Set to only run triggers that whitelist this Scheduler.")
+    headless_group.add_argument("--log-file", type=str, help="The file to log to. Defaults to stderr.")
+    headless_group.add_argument("--log-max-bytes", type=int, default=10_000_000, help="The size in bytes at which the log file is rotated.")
+    headless_group.add_argument("--log-backups", type=int, default=5, help="The number of rotated log files to keep.")
     s_parser.set_defaults(func=scheduler_command)
 
     u_parser = subparsers.add_parser("upgrade", aliases=["u"], help="Upgrade the database to the newest revision or create a new database from scratch.")
     u_parser.add_argument("connection_string", type=str, help="The connection string to the database.")
     u_parser.add_argument("-n", "--new", action="store_true", help="Set if you're creating a new database from scratch.")
+    u_parser.add_argument("-s", "--search-index", action="store_true", help="Set to rebuild the queue search index after the upgrade. Needed when enabling 'search_backend=token' on an existing database.")
     u_parser.set_defaults(func=upgrade_command)
 
+    r_parser = subparsers.add_parser("retention", aliases=["r"], parents=[pool_parser], help="Delete or archive old logs and finished queue elements using a retention policy.")
+    r_parser.add_argument("connection_string", type=str, help="The connection string to the database.")
+    r_parser.add_argument("policy", type=str, help="The path of the json retention policy.")
+    r_parser.set_defaults(func=retention_command)
+
     args = parser.parse_args()
     args.func(args)
 
 
+def configure_pool(args: argparse.Namespace):
+    """Configure the database connection pool from the pool arguments.
+
+    Args:
+        args: The arguments Namespace object.
+    """
+    db_util.configure_pool(
+        pool_size=args.pool_size,
+        max_overflow=args.max_overflow,
+        pool_recycle=args.pool_recycle,
+        pool_pre_ping=args.pool_pre_ping,
+        pool_timeout=args.pool_timeout
+    )
+
+
 def orchestrator_command(args: argparse.Namespace):
     """Start the Orchestrator app.
 
     Args:
         args: The arguments Namespace object.
     """
+    configure_pool(args)
     o_app(port=args.port, show=args.dont_show)
 
 
-def scheduler_command(args: argparse.Namespace):  # pylint: disable=unused-argument
-    """Start the Scheduler app."""
-    s_app()
+def scheduler_command(args: argparse.Namespace):
+    """Start the Scheduler app.
+
+    Args:
+        args: The arguments Namespace object.
+    """
+    configure_pool(args)
+    output_capture.set_log_forwarding(args.forward_output)
+
+    warm_worker.set_pool_size(args.warm_workers)
+
+    retention_job.set_policy(args.retention_policy, args.retention_interval * 60 * 60)
+
+    if args.headless:
+        headless.setup_logging(args.log_file, args.log_max_bytes, args.log_backups)
+        headless.run(args.connection_string, args.exclusive, args.slots)
+    else:
+        s_app(args.slots)
 
 
 def upgrade_command(args: argparse.Namespace):
@@ -58,6 +117,7 @@ def upgrade_command(args: argparse.Namespace):
     if args.new:
         subprocess.run(upgrade_args, check=True)
         print("Database upgraded to the newest revision!")
+        rebuild_search_index(args)
         return
 
     confirmation = input("Are you sure you want to upgrade the database to the newest revision? This cannot be undone. (y/n)").strip()
@@ -75,9 +135,44 @@ def upgrade_command(args: argparse.Namespace):
 
         subprocess.run(upgrade_args, check=True)
         print("Database upgraded to the newest revision!")
+        rebuild_search_index(args)
     else:
         print("Upgrade canceled")
 
 
+def rebuild_search_index(args: argparse.Namespace):
+    """Rebuild the queue search index if requested.
+
+    Args:
+        args: The arguments Namespace object.
+    """
+    if not args.search_index:
+        return
+
+    if not db_util.connect(args.connection_string):
+        print("Couldn't connect to the database to rebuild the search index.")
+        return
+
+    db_util.rebuild_queue_search_index()
+    print("Queue search index rebuilt!")
+
+
+def retention_command(args: argparse.Namespace):
+    """Apply a retention policy to the database once.
+
+    Args:
+        args: The arguments Namespace object.
+    """
+    configure_pool(args)
+    policy = retention.load_policy(args.policy)
+
+    if not db_util.connect(args.connection_string):
+        print("Couldn't connect to the database.")
+        return
+
+    report = retention.apply_policy(policy)
+    print(report.summary())
+
+
 if __name__ == '__main__':
     main()
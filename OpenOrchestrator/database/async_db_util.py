@@ -0,0 +1,74 @@
+"""This module is an async facade over db_util used by Orchestrator.
+The functions of db_util are run in a thread pool, so a slow query doesn't block the event loop
+and other users of the ui can keep working while it runs."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from typing import Callable, Coroutine, ParamSpec, TypeVar, Any
+
+from OpenOrchestrator.database import db_util
+
+# The maximum number of queries run at the same time.
+# Kept below the default size of the connection pool plus its overflow,
+# so queries don't wait for a connection in the pool.
+MAX_WORKERS = 8
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="async_db_util")
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+async def run(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run a blocking function in the thread pool and wait for the result.
+
+    Args:
+        func: The function to run. It shouldn't touch the ui.
+        *args: The positional arguments for the function.
+        **kwargs: The keyword arguments for the function.
+
+    Returns:
+        The result of the function.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def _wrap(func: Callable[P, T]) -> Callable[P, Coroutine[Any, Any, T]]:
+    """Create an async version of a function that runs it in the thread pool.
+
+    Args:
+        func: The function to wrap.
+
+    Returns:
+        The async function with the same signature and docstring.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        return await run(func, *args, **kwargs)
+
+    return wrapper
+
+
+get_trigger = _wrap(db_util.get_trigger)
+create_single_trigger = _wrap(db_util.create_single_trigger)
+create_scheduled_trigger = _wrap(db_util.create_scheduled_trigger)
+create_queue_trigger = _wrap(db_util.create_queue_trigger)
+update_trigger = _wrap(db_util.update_trigger)
+delete_trigger = _wrap(db_util.delete_trigger)
+set_trigger_status = _wrap(db_util.set_trigger_status)
+
+get_logs = _wrap(db_util.get_logs)
+
+get_constant = _wrap(db_util.get_constant)
+create_constant = _wrap(db_util.create_constant)
+update_constant = _wrap(db_util.update_constant)
+delete_constant = _wrap(db_util.delete_constant)
+
+get_credential = _wrap(db_util.get_credential)
+create_credential = _wrap(db_util.create_credential)
+update_credential = _wrap(db_util.update_credential)
+delete_credential = _wrap(db_util.delete_credential)
+
+get_queue_elements = _wrap(db_util.get_queue_elements)
@@ -1,55 +1,247 @@
 """This module handles the connection to the database in OpenOrchestrator."""
 # pylint: disable=too-many-lines
 
+from collections import Counter
 from datetime import datetime
-from uuid import UUID
+import json
+import os
+import random
+import re
+from typing import Any, Callable
+from uuid import UUID, uuid4
 
 from cronsim import CronSim
-from sqlalchemy import Engine, create_engine, select, insert, desc, text
+from sqlalchemy import Engine, URL, String, create_engine, make_url, select, insert, update, delete, desc, text
+from sqlalchemy import and_, or_, case, false, type_coerce
 
 from sqlalchemy import exc as alc_exc
 from sqlalchemy import func as alc_func
-from sqlalchemy.orm import Session, selectin_polymorphic
+from sqlalchemy.orm import Session, selectin_polymorphic, with_polymorphic
 
 from OpenOrchestrator.common import crypto_util
-from OpenOrchestrator.database.logs import Log, LogLevel
+from OpenOrchestrator.database.logs import Log, LogLevel, ProcessName
 from OpenOrchestrator.database.constants import Constant, Credential
-from OpenOrchestrator.database.triggers import Trigger, SingleTrigger, ScheduledTrigger, QueueTrigger, TriggerStatus
-from OpenOrchestrator.database.queues import QueueElement, QueueStatus
+from OpenOrchestrator.database.triggers import Trigger, SingleTrigger, ScheduledTrigger, QueueTrigger, TriggerStatus, TriggerType
+from OpenOrchestrator.database.queues import QueueElement, QueueStatus, QueueCount, QueueSearchToken
 from OpenOrchestrator.database.schedulers import Scheduler
 from OpenOrchestrator.database.truncated_string import truncate_message
 
 _connection_engine: Engine | None = None
+_connection_string: str | None = None
+_connection_pool_options: dict[str, int | float | bool] = {}
+
+# The maximum number of ids sent in a single 'IN' clause.
+# MSSQL allows at most 2100 parameters per statement.
+_BULK_CHUNK_SIZE = 1000
+
+# Engine pool options and the environment variables that can set them.
+# The options can also be set in the query of the connection string, which takes precedence.
+_POOL_ENV_VARS = {
+    "pool_size": "OpenOrchestratorPoolSize",
+    "max_overflow": "OpenOrchestratorMaxOverflow",
+    "pool_recycle": "OpenOrchestratorPoolRecycle",
+    "pool_pre_ping": "OpenOrchestratorPoolPrePing",
+    "pool_timeout": "OpenOrchestratorPoolTimeout"
+}
+
+# Check connections before use and recycle them before the server or network
+# silently drops them. Pool sizes are left to the default of the dialect.
+_DEFAULT_POOL_OPTIONS = {
+    "pool_pre_ping": True,
+    "pool_recycle": 1800
+}
+
+_pool_options: dict[str, int | float | bool] = {}
+
+# Names of queues whose rows in the Queue_Counts table are known to exist.
+_counted_queues: set[str] = set()
+
+# The number of rows in the Queue_Counts table per queue and status.
+# Each transaction adjusts a random shard, so workers draining the same queue
+# rarely wait for each other's locks on the counts.
+_QUEUE_COUNT_SHARDS = 8
+
+# Process names known to exist in the Process_Names table.
+_registered_process_names: set[str] = set()
+
+# The backends for the search term of get_queue_elements.
+# 'like' scans the queue with LIKE filters.
+# 'token' looks up words in the Queue_Search_Tokens table, which is kept up to date while it's used.
+# The backend can be set in the query of the connection string or the environment variable.
+_SEARCH_BACKENDS = ("like", "token")
+_SEARCH_BACKEND_ENV_VAR = "OpenOrchestratorSearchBackend"
+_search_backend = "like"
+
+# The maximum length of a search token. Longer words are cut off.
+_SEARCH_TOKEN_LENGTH = 50
+
+
+def configure_pool(pool_size: int | None = None, max_overflow: int | None = None, pool_recycle: int | None = None,
+                   pool_pre_ping: bool | None = None, pool_timeout: float | None = None) -> None:
+    """Set the connection pool options used on the next call to connect.
+    Options set here override environment variables but are overridden by
+    options in the query of the connection string.
+    Options that are None are reset to their defaults.
+
+    Args:
+        pool_size: The number of connections to keep open in the pool.
+        max_overflow: The number of connections allowed above pool_size.
+        pool_recycle: The number of seconds after which a connection is replaced.
+        pool_pre_ping: Whether to test connections before they are used.
+        pool_timeout: The number of seconds to wait for a connection from the pool.
+    """
+    options = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pool_pre_ping,
+        "pool_timeout": pool_timeout
+    }
+
+    _pool_options.clear()
+    _pool_options.update({key: value for key, value in options.items() if value is not None})
+
+
+def _parse_pool_option(key: str, value: str) -> int | float | bool:
+    """Convert a pool option from a string to its proper type.
+
+    Args:
+        key: The name of the pool option.
+        value: The string value of the option.
+
+    Returns:
+        The converted value.
+
+    Raises:
+        ValueError: If the value can't be converted.
+    """
+    match key:
+        case "pool_pre_ping":
+            if value.lower() in ("1", "true", "yes"):
+                return True
+            if value.lower() in ("0", "false", "no"):
+                return False
+            raise ValueError(f"Invalid value for '{key}': {value}")
+        case "pool_timeout":
+            return float(value)
+        case _:
+            return int(value)
+
+
+def _get_pool_options(url: URL) -> tuple[URL, dict[str, int | float | bool]]:
+    """Collect the pool options from the defaults, the environment,
+    configure_pool and the connection string in that order of precedence.
+    Pool options are removed from the query of the url, so they aren't passed to the driver.
+
+    Args:
+        url: The connection url.
+
+    Returns:
+        The url without pool options and the pool options.
+    """
+    options = dict(_DEFAULT_POOL_OPTIONS)
+
+    for key, env_var in _POOL_ENV_VARS.items():
+        if env_var in os.environ:
+            options[key] = _parse_pool_option(key, os.environ[env_var])
+
+    options.update(_pool_options)
+
+    for key in _POOL_ENV_VARS:
+        if key in url.query:
+            options[key] = _parse_pool_option(key, url.query[key])
+
+    url = url.difference_update_query(_POOL_ENV_VARS)
+
+    return url, options
+
+
+def _get_search_backend(url: URL) -> tuple[URL, str]:
+    """Get the search backend from the connection string or the environment.
+    The search backend is removed from the query of the url, so it isn't passed to the driver.
+
+    Args:
+        url: The connection url.
+
+    Returns:
+        The url without the search backend and the search backend.
+
+    Raises:
+        ValueError: If the search backend is unknown.
+    """
+    backend = url.query.get("search_backend", os.environ.get(_SEARCH_BACKEND_ENV_VAR, "like"))
+
+    if backend not in _SEARCH_BACKENDS:
+        raise ValueError(f"Invalid search backend: {backend}. Must be one of {_SEARCH_BACKENDS}.")
+
+    return url.difference_update_query(["search_backend"]), backend
 
 
 def connect(conn_string: str) -> bool:
     """Connects to the database using the given connection string.
+    The connection pool is configured using the options given in the connection string,
+    configure_pool or the environment. See _get_pool_options.
+    The search backend for queue elements can be set with 'search_backend' in the connection string.
+    If already connected to the same database with the same pool options the existing engine is reused.
 
     Args:
         conn_string: The connection string.
 
     Returns:
         bool: True if successful.
+
+    Raises:
+        ValueError: If a pool option or the search backend has an invalid value.
     """
-    global _connection_engine  # pylint: disable=global-statement
+    global _connection_engine, _connection_string, _search_backend  # pylint: disable=global-statement
+
+    engine = None
 
     try:
-        engine = create_engine(conn_string)
-        engine.connect()
+        url, pool_options = _get_pool_options(make_url(conn_string))
+        url, search_backend = _get_search_backend(url)
+
+        if _connection_engine and _connection_engine.url == url and _connection_pool_options == pool_options:
+            _connection_string = conn_string
+            _search_backend = search_backend
+            _counted_queues.clear()
+            _registered_process_names.clear()
+            return True
+
+        engine = create_engine(url, **pool_options)
+
+        # Test the connection and return it to the pool
+        with engine.connect():
+            pass
+
+        if _connection_engine:
+            _connection_engine.dispose()
+
         _connection_engine = engine
+        _connection_string = conn_string
+        _search_backend = search_backend
+        _connection_pool_options.clear()
+        _connection_pool_options.update(pool_options)
+        _counted_queues.clear()
+        _registered_process_names.clear()
         return True
     except (alc_exc.InterfaceError, alc_exc.ArgumentError, alc_exc.OperationalError):
+        if engine:
+            engine.dispose()
         _connection_engine = None
+        _connection_string = None
 
     return False
 
 
 def disconnect() -> None:
     """Disconnect from the database."""
-    global _connection_engine  # pylint: disable=global-statement
+    global _connection_engine, _connection_string  # pylint: disable=global-statement
     if _connection_engine:
         _connection_engine.dispose()
     _connection_engine = None
+    _connection_string = None
+    _connection_pool_options.clear()
 
 
 def check_database_revision() -> bool:
@@ -62,7 +254,7 @@ def check_database_revision() -> bool:
     except alc_exc.ProgrammingError:
         return False
 
-    return version == "9698388a0709"
+    return version == "c4d7a2e9f031"
 
 
 def _get_session() -> Session:
@@ -82,15 +274,16 @@ def _get_session() -> Session:
 
 
 def get_conn_string() -> str:
-    """Get the connection string.
+    """Get the connection string as it was given to connect.
+    This includes any pool options in the query of the connection string.
 
     Returns:
         str: The connection string if any.
     """
-    if not _connection_engine:
+    if not _connection_engine or not _connection_string:
         raise RuntimeError("Not connected to database.")
 
-    return str(_connection_engine.url)
+    return _connection_string
 
 
 def get_trigger(trigger_id: UUID | str) -> Trigger:
@@ -142,6 +335,8 @@ def update_trigger(trigger: Trigger):
     Args:
         trigger: The trigger object with updated values.
     """
+    _register_process_names(trigger.process_name)
+
     with _get_session() as session:
         session.add(trigger)
         session.commit()
@@ -247,6 +442,8 @@ def create_log(process_name: str, level: LogLevel, message: str) -> None:
         level: The level of the log.
         message: The message of the log.
     """
+    _register_process_names(process_name)
+
     with _get_session() as session:
         log = Log(
             log_level = level,
@@ -257,17 +454,42 @@ def create_log(process_name: str, level: LogLevel, message: str) -> None:
         session.commit()
 
 
+def bulk_create_logs(logs: list[tuple[str, LogLevel, str, datetime]]) -> None:
+    """Insert multiple logs into the logs table in a single statement.
+
+    Args:
+        logs: A list of (process_name, level, message, log_time) tuples.
+    """
+    if len(logs) == 0:
+        return
+
+    _register_process_names(*(process_name for process_name, _, _, _ in logs))
+
+    log_dicts = (
+        {
+            "process_name": process_name,
+            "log_level": level,
+            "log_message": truncate_message(message),
+            "log_time": log_time
+        }
+        for process_name, level, message, log_time in logs
+    )
+
+    with _get_session() as session:
+        session.execute(insert(Log), log_dicts)  # type: ignore
+        session.commit()
+
+
 def get_unique_log_process_names() -> tuple[str, ...]:
-    """Get a list of unique process names in the logs database.
+    """Get a list of unique process names of logs and triggers.
+    The names are read from the Process_Names table instead of scanning the logs table.
 
     Returns:
         A list of unique process names.
     """
-
     query = (
-        select(Log.process_name)
-        .distinct()
-        .order_by(Log.process_name)
+        select(ProcessName.process_name)
+        .order_by(ProcessName.process_name)
     )
 
     with _get_session() as session:
@@ -275,10 +497,79 @@ def get_unique_log_process_names() -> tuple[str, ...]:
         return tuple(result)
 
 
+def _register_process_names(*process_names: str) -> None:
+    """Make sure the given process names exist in the Process_Names table.
+    Names already registered by this process are skipped.
+
+    Args:
+        process_names: The process names.
+    """
+    for process_name in set(process_names) - _registered_process_names:
+        with _get_session() as session:
+            if session.get(ProcessName, process_name) is None:
+                session.add(ProcessName(process_name=process_name))
+
+                try:
+                    session.commit()
+                except alc_exc.IntegrityError:
+                    # The name was registered by another process in the meantime
+                    session.rollback()
+
+        _registered_process_names.add(process_name)
+
+
+def delete_old_logs(before: datetime, process_name: str | None = None, exclude_process_names: tuple[str, ...] = (),
+                    limit: int = _BULK_CHUNK_SIZE, before_commit: Callable[[list[dict[str, Any]]], None] | None = None) -> list[dict[str, Any]]:
+    """Delete a batch of the oldest logs with a log time before the given time.
+    Call it until it returns fewer logs than the limit to delete all matching logs.
+
+    Args:
+        before: Logs older than this are deleted.
+        process_name: The process name to filter on. If none the filter is disabled.
+        exclude_process_names: Process names whose logs are never deleted.
+        limit: The maximum number of logs to delete.
+        before_commit: A function called with the deleted logs before the deletion is committed, e.g. to archive them.
+            If it raises an exception the deletion is rolled back.
+
+    Returns:
+        The deleted logs as dicts of column values.
+    """
+    query = (
+        select(Log.__table__)
+        .where(Log.log_time < before)
+        .order_by(Log.log_time)
+        .limit(limit)
+    )
+
+    if process_name:
+        query = query.where(Log.process_name == process_name)
+
+    if exclude_process_names:
+        query = query.where(Log.process_name.not_in(exclude_process_names))
+
+    with _get_session() as session:
+        rows = [dict(row) for row in session.execute(query).mappings()]
+        log_ids = [row["id"] for row in rows]
+
+        for i in range(0, len(log_ids), _BULK_CHUNK_SIZE):
+            session.execute(
+                delete(Log)
+                .where(Log.id.in_(log_ids[i:i+_BULK_CHUNK_SIZE]))
+                .execution_options(synchronize_session=False)
+            )
+
+        if before_commit and rows:
+            before_commit(rows)
+
+        session.commit()
+
+    return rows
+
+
 # pylint: disable=too-many-positional-arguments
 def create_single_trigger(trigger_name: str, process_name: str, next_run: datetime,
                           process_path: str, process_args: str, is_git_repo: bool, is_blocking: bool,
-                          priority: int, scheduler_whitelist: list[str] | None = None, git_branch: str | None = None) -> UUID:
+                          priority: int, scheduler_whitelist: list[str] | None = None, git_branch: str | None = None, weight: int = 1) -> UUID:
     """Create a new single trigger in the database.
 
     Args:
@@ -292,10 +583,13 @@ def create_single_trigger(trigger_name: str, process_name: str, next_run: dateti
         priority: The integer priority of the trigger.
         scheduler_whitelist: A list of names of schedulers the trigger may run on.
         git_branch: The specific git branch of the trigger.
+        weight: The number of job slots the trigger takes up on a Scheduler.
 
     Returns:
         The id of the trigger that was created.
     """
+    _register_process_names(process_name)
+
     with _get_session() as session:
         trigger = SingleTrigger(
             trigger_name= trigger_name,
@@ -307,7 +601,8 @@ def create_single_trigger(trigger_name: str, process_name: str, next_run: dateti
             next_run = next_run,
             priority=priority,
             scheduler_whitelist=scheduler_whitelist,
-            git_branch=git_branch
+            git_branch=git_branch,
+            weight=weight
         )
         session.add(trigger)
         session.commit()
@@ -318,7 +613,7 @@ def create_single_trigger(trigger_name: str, process_name: str, next_run: dateti
 def create_scheduled_trigger(trigger_name: str, process_name: str, cron_expr: str, next_run: datetime,
                              process_path: str, process_args: str, is_git_repo: bool,
                              is_blocking: bool, priority: int, scheduler_whitelist: list[str] | None = None,
-                             git_branch: str | None = None) -> UUID:
+                             git_branch: str | None = None, weight: int = 1) -> UUID:
     """Create a new scheduled trigger in the database.
 
     Args:
@@ -333,10 +628,13 @@ def create_scheduled_trigger(trigger_name: str, process_name: str, cron_expr: st
         priority: The integer priority of the trigger.
         scheduler_whitelist: A list of names of schedulers the trigger may run on.
         git_branch: The specific git branch of the trigger.
+        weight: The number of job slots the trigger takes up on a Scheduler.
 
     Returns:
         The id of the trigger that was created.
     """
+    _register_process_names(process_name)
+
     with _get_session() as session:
         trigger = ScheduledTrigger(
             trigger_name= trigger_name,
@@ -349,7 +647,8 @@ def create_scheduled_trigger(trigger_name: str, process_name: str, cron_expr: st
             cron_expr = cron_expr,
             priority=priority,
             scheduler_whitelist=scheduler_whitelist,
-            git_branch=git_branch
+            git_branch=git_branch,
+            weight=weight
         )
         session.add(trigger)
         session.commit()
@@ -360,7 +659,7 @@ def create_scheduled_trigger(trigger_name: str, process_name: str, cron_expr: st
 def create_queue_trigger(trigger_name: str, process_name: str, queue_name: str, process_path: str,
                          process_args: str, is_git_repo: bool, is_blocking: bool,
                          min_batch_size: int, priority: int, scheduler_whitelist: list[str] | None = None,
-                         git_branch: str | None = None) -> UUID:
+                         git_branch: str | None = None, weight: int = 1) -> UUID:
     """Create a new queue trigger in the database.
 
     Args:
@@ -375,10 +674,13 @@ def create_queue_trigger(trigger_name: str, process_name: str, queue_name: str,
         priority: The integer priority of the trigger.
         scheduler_whitelist: A list of names of schedulers the trigger may run on.
         git_branch: The specific git branch of the trigger.
+        weight: The number of job slots the trigger takes up on a Scheduler.
 
     Returns:
         The id of the trigger that was created.
     """
+    _register_process_names(process_name)
+
     with _get_session() as session:
         trigger = QueueTrigger(
             trigger_name= trigger_name,
@@ -391,7 +693,8 @@ def create_queue_trigger(trigger_name: str, process_name: str, queue_name: str,
             min_batch_size = min_batch_size,
             priority=priority,
             scheduler_whitelist=scheduler_whitelist,
-            git_branch=git_branch
+            git_branch=git_branch,
+            weight=weight
         )
         session.add(trigger)
         session.commit()
@@ -668,20 +971,185 @@ def get_pending_queue_triggers() -> list[QueueTrigger]:
     with _get_session() as session:
 
         sub_query = (
-            select(alc_func.count())  # pylint: disable=not-callable
-            .where(QueueElement.queue_name == QueueTrigger.queue_name)
-            .where(QueueElement.status == QueueStatus.NEW)
+            select(alc_func.sum(QueueCount.count))
+            .where(QueueCount.queue_name == QueueTrigger.queue_name)
+            .where(QueueCount.status == QueueStatus.NEW)
             .scalar_subquery()
         )
 
         query = (
             select(QueueTrigger)
             .where(QueueTrigger.process_status == TriggerStatus.IDLE)
-            .where(sub_query >= QueueTrigger.min_batch_size)
+            .where(alc_func.coalesce(sub_query, 0) >= QueueTrigger.min_batch_size)
         )
         return list(session.scalars(query))
 
 
+def get_pending_triggers(scheduler_name: str, exclusive: bool, allow_blocking: bool, max_weight: int | None = None) -> list[Trigger]:
+    """Get all triggers of any type that are ready to run on the given Scheduler in a single query.
+    The triggers are ordered by priority and then by type: Single > Scheduled > Queue.
+
+    Args:
+        scheduler_name: The name of the Scheduler polling for triggers.
+        exclusive: If true only triggers with the Scheduler in their whitelist are returned.
+            Else triggers without a whitelist are returned as well.
+        allow_blocking: Whether blocking triggers should be returned.
+        max_weight: The largest trigger weight to return. If None the filter is disabled.
+
+    Returns:
+        All eligible triggers ready to run if any.
+    """
+    query, _ = _pending_triggers_query(scheduler_name, exclusive, allow_blocking, max_weight)
+
+    with _get_session() as session:
+        return list(session.scalars(query))
+
+
+def claim_next_trigger(scheduler_name: str, exclusive: bool, allow_blocking: bool, max_weight: int | None = None) -> Trigger | None:
+    """Pick the first trigger that is ready to run on the given Scheduler and set it to 'running'
+    in a single conditional update, so concurrent Schedulers never claim the same trigger.
+    The last run time is set to the current time and for scheduled triggers the next run time is updated.
+    See get_pending_triggers for the order of the triggers.
+
+    Args:
+        scheduler_name: The name of the Scheduler claiming the trigger.
+        exclusive: If true only triggers with the Scheduler in their whitelist are considered.
+            Else triggers without a whitelist are considered as well.
+        allow_blocking: Whether blocking triggers should be considered.
+        max_weight: The largest trigger weight to consider. If None the filter is disabled.
+
+    Returns:
+        The claimed trigger if any.
+    """
+    query, triggers = _pending_triggers_query(scheduler_name, exclusive, allow_blocking, max_weight)
+
+    # Lock the selected row and skip rows already locked by other Schedulers.
+    # The hints are only rendered by the dialect they belong to.
+    sub_query = (
+        query.with_only_columns(triggers.id)
+        .limit(1)
+        .with_for_update(of=Trigger, skip_locked=True)
+        .with_hint(Trigger, "WITH (ROWLOCK, READPAST, UPDLOCK)", "mssql")
+        .scalar_subquery()
+    )
+
+    now = datetime.now()
+
+    claim = (
+        update(Trigger)
+        .where(Trigger.id == sub_query)
+        .where(Trigger.process_status == TriggerStatus.IDLE)
+        .values(process_status=TriggerStatus.RUNNING, last_run=now)
+        .returning(Trigger.id)
+        .execution_options(synchronize_session=False)
+    )
+
+    with _get_session() as session:
+        trigger_id = session.scalar(claim)
+
+        if trigger_id is None:
+            session.commit()
+            return None
+
+        trigger = session.scalar(
+            select(Trigger)
+            .where(Trigger.id == trigger_id)
+            .options(selectin_polymorphic(Trigger, (ScheduledTrigger, QueueTrigger, SingleTrigger)))
+        )
+
+        if isinstance(trigger, ScheduledTrigger):
+            trigger.next_run = next(CronSim(trigger.cron_expr, now))
+            session.flush()
+
+        # Detach the trigger before committing to keep the loaded values
+        session.expunge(trigger)
+        session.commit()
+
+    return trigger
+
+
+def get_next_trigger_run() -> datetime | None:
+    """Get the earliest next run time among idle single and scheduled triggers.
+
+    Returns:
+        The earliest next run time or None if there are no idle single or scheduled triggers.
+    """
+    with _get_session() as session:
+        single_query = (
+            select(alc_func.min(SingleTrigger.next_run))
+            .where(SingleTrigger.process_status == TriggerStatus.IDLE)
+            .scalar_subquery()
+        )
+        scheduled_query = (
+            select(alc_func.min(ScheduledTrigger.next_run))
+            .where(ScheduledTrigger.process_status == TriggerStatus.IDLE)
+            .scalar_subquery()
+        )
+        next_runs = session.execute(select(single_query, scheduled_query)).one()
+
+    next_runs = [next_run for next_run in next_runs if next_run is not None]
+    return min(next_runs, default=None)
+
+
+def _pending_triggers_query(scheduler_name: str, exclusive: bool, allow_blocking: bool, max_weight: int | None):
+    """Create a polymorphic query selecting all triggers ready to run on the given Scheduler.
+    See get_pending_triggers.
+
+    Args:
+        scheduler_name: The name of the Scheduler.
+        exclusive: Whether only whitelisted triggers should be selected.
+        allow_blocking: Whether blocking triggers should be selected.
+        max_weight: The largest trigger weight to select if any.
+
+    Returns:
+        The select query and the polymorphic trigger entity it selects.
+    """
+    triggers = with_polymorphic(Trigger, [SingleTrigger, ScheduledTrigger, QueueTrigger])
+    now = datetime.now()
+
+    queue_count = (
+        select(alc_func.sum(QueueCount.count))
+        .where(QueueCount.queue_name == triggers.QueueTrigger.queue_name)
+        .where(QueueCount.status == QueueStatus.NEW)
+        .scalar_subquery()
+    )
+
+    # The whitelist is stored as a json list, so look for the json string of the name
+    whitelist = type_coerce(triggers.scheduler_whitelist, String)
+    whitelisted = whitelist.contains(json.dumps(scheduler_name), autoescape=True)
+    unlisted = or_(whitelist.is_(None), whitelist == "[]")
+
+    type_rank = case(
+        (triggers.type == TriggerType.SINGLE, 0),
+        (triggers.type == TriggerType.SCHEDULED, 1),
+        else_=2
+    )
+
+    query = (
+        select(triggers)
+        .where(triggers.process_status == TriggerStatus.IDLE)
+        .where(or_(
+            and_(triggers.type == TriggerType.SINGLE, triggers.SingleTrigger.next_run <= now),
+            and_(triggers.type == TriggerType.SCHEDULED, triggers.ScheduledTrigger.next_run <= now),
+            and_(triggers.type == TriggerType.QUEUE, alc_func.coalesce(queue_count, 0) >= triggers.QueueTrigger.min_batch_size)
+        ))
+        .where(whitelisted if exclusive else or_(whitelisted, unlisted))
+        .order_by(
+            desc(triggers.priority),
+            type_rank,
+            alc_func.coalesce(triggers.SingleTrigger.next_run, triggers.ScheduledTrigger.next_run)
+        )
+    )
+
+    if not allow_blocking:
+        query = query.where(triggers.is_blocking == false())
+
+    if max_weight is not None:
+        query = query.where(triggers.weight <= max_weight)
+
+    return query, triggers
+
+
 def begin_queue_trigger(trigger_id: UUID | str) -> bool:
     """Set the status of a queue trigger to 'running' and
     set the last run time to the current time.
@@ -743,14 +1211,21 @@ def create_queue_element(queue_name: str, reference: str | None = None, data: st
     Returns:
         QueueElement: The created queue element.
     """
+    _ensure_queue_counts(queue_name)
+
     with _get_session() as session:
         q_element = QueueElement(
+            id = uuid4(),
             queue_name = queue_name,
             data = data,
             reference = reference,
             created_by = created_by
         )
         session.add(q_element)
+        _adjust_queue_counts(session, Counter({(queue_name, QueueStatus.NEW): 1}))
+
+        if _search_backend == "token":
+            _insert_search_tokens(session, [(queue_name, q_element.id, reference, data, None)])
         session.commit()
         session.refresh(q_element)
 
@@ -779,23 +1254,32 @@ def bulk_create_queue_elements(queue_name: str, references: tuple[str | None, ..
     if len(references) != len(data):
         raise ValueError(f"The number of references and data strings don't match: {len(references)} != {len(data)}.")
 
-    q_elements = (
+    q_elements = [
         {
+            "id": uuid4(),
             "queue_name": queue_name,
             "reference": ref,
             "data": dat,
             "created_by": created_by
         }
         for ref, dat in zip(references, data)
-    )
+    ]
+
+    _ensure_queue_counts(queue_name)
 
     with _get_session() as session:
-        session.execute(insert(QueueElement), q_elements)  # type: ignore
+        session.execute(insert(QueueElement), q_elements)
+        _adjust_queue_counts(session, Counter({(queue_name, QueueStatus.NEW): len(references)}))
+
+        if _search_backend == "token":
+            _insert_search_tokens(session, [(queue_name, element["id"], element["reference"], element["data"], None) for element in q_elements])
         session.commit()
 
 
 def get_next_queue_element(queue_name: str, reference: str | None = None, set_status: bool = True) -> QueueElement | None:
     """Gets the next queue element from the given queue that has the status 'new'.
+    When set_status is true the element is claimed in a single atomic statement,
+    so concurrent workers never receive the same element.
 
     Args:
         queue_name: The name of the queue to retrieve from.
@@ -805,34 +1289,114 @@ def get_next_queue_element(queue_name: str, reference: str | None = None, set_st
     Returns:
         QueueElement | None: The next queue element in the queue if any.
     """
+    if not set_status:
+        with _get_session() as session:
+            return session.scalar(_next_queue_elements_query(queue_name, reference, 1))
 
-    with _get_session() as session:
-        query = (
-            select(QueueElement)
-            .where(QueueElement.queue_name == queue_name)
-            .where(QueueElement.status == QueueStatus.NEW)
-            .order_by(QueueElement.created_date)
-            .limit(1)
-        )
+    q_elements = _claim_queue_elements(queue_name, reference, 1)
+    return q_elements[0] if q_elements else None
 
-        if reference is not None:
-            query = query.where(QueueElement.reference == reference)
 
-        q_element = session.scalar(query)
+def get_next_queue_elements(queue_name: str, n: int, reference: str | None = None) -> tuple[QueueElement, ...]:
+    """Claim up to n queue elements with the status 'new' from the given queue.
+    The elements are set to 'in progress' and their start time is noted in a single
+    atomic statement, so concurrent workers never receive the same element.
 
-        if q_element and set_status:
-            q_element.status = QueueStatus.IN_PROGRESS
-            q_element.start_date = datetime.now()
-            session.commit()
-            session.refresh(q_element)
+    Args:
+        queue_name: The name of the queue to retrieve from.
+        n: The maximum number of queue elements to claim.
+        reference (optional): The reference to filter on. If None the filter is disabled.
+
+    Returns:
+        tuple[QueueElement]: The claimed queue elements ordered by created_date.
 
-        return q_element
+    Raises:
+        ValueError: If n is less than 1.
+    """
+    if n < 1:
+        raise ValueError(f"The number of queue elements to claim must be at least 1: {n}.")
+
+    return _claim_queue_elements(queue_name, reference, n)
+
+
+def _next_queue_elements_query(queue_name: str, reference: str | None, limit: int):
+    """Create a query selecting the next queue elements with the status 'new'.
+
+    Args:
+        queue_name: The name of the queue to retrieve from.
+        reference: The reference to filter on. If None the filter is disabled.
+        limit: The maximum number of queue elements to select.
+
+    Returns:
+        The select query.
+    """
+    query = (
+        select(QueueElement)
+        .where(QueueElement.queue_name == queue_name)
+        .where(QueueElement.status == QueueStatus.NEW)
+        .order_by(QueueElement.created_date)
+        .limit(limit)
+    )
+
+    if reference is not None:
+        query = query.where(QueueElement.reference == reference)
+
+    return query
+
+
+def _claim_queue_elements(queue_name: str, reference: str | None, limit: int) -> tuple[QueueElement, ...]:
+    """Atomically set the next queue elements to 'in progress' and return them.
+
+    Args:
+        queue_name: The name of the queue to claim from.
+        reference: The reference to filter on. If None the filter is disabled.
+        limit: The maximum number of queue elements to claim.
+
+    Returns:
+        tuple[QueueElement]: The claimed queue elements ordered by created_date.
+    """
+    # Lock the selected rows and skip rows already locked by other workers.
+    # The hints are only rendered by the dialect they belong to.
+    sub_query = (
+        _next_queue_elements_query(queue_name, reference, limit)
+        .with_only_columns(QueueElement.id)
+        .with_for_update(skip_locked=True)
+        .with_hint(QueueElement, "WITH (ROWLOCK, READPAST, UPDLOCK)", "mssql")
+    )
+
+    claim = (
+        update(QueueElement)
+        .where(QueueElement.id.in_(sub_query))
+        .where(QueueElement.status == QueueStatus.NEW)
+        .values(status=QueueStatus.IN_PROGRESS, start_date=datetime.now())
+        .returning(QueueElement)
+        .execution_options(synchronize_session=False)
+    )
+
+    _ensure_queue_counts(queue_name)
+
+    with _get_session() as session:
+        q_elements = session.scalars(claim).all()
+
+        _adjust_queue_counts(session, Counter({
+            (queue_name, QueueStatus.NEW): -len(q_elements),
+            (queue_name, QueueStatus.IN_PROGRESS): len(q_elements)
+        }))
+
+        # Detach the elements before committing to keep the returned values
+        # without having to refresh them in another round trip.
+        session.expunge_all()
+        session.commit()
+
+    # The order of returned rows is not guaranteed by any dialect
+    return tuple(sorted(q_elements, key=lambda e: e.created_date))
 
 
 def get_queue_elements(queue_name: str, reference: str | None = None, status: QueueStatus | None = None,
                        from_date: datetime | None = None, to_date: datetime | None = None,
                        offset: int = 0, limit: int | None = 100, search_term: str | None = None,
-                       order_by: str | None = None, order_desc: bool = False, include_count: bool = False) -> tuple[QueueElement, ...] | tuple[tuple[QueueElement, ...], int]:
+                       order_by: str | None = None, order_desc: bool = False, include_count: bool = False,
+                       after: tuple[Any, UUID] | None = None) -> tuple[QueueElement, ...] | tuple[tuple[QueueElement, ...], int]:
     """Get multiple queue elements from a queue. The elements are ordered by created_date.
 
     Args:
@@ -844,9 +1408,14 @@ def get_queue_elements(queue_name: str, reference: str | None = None, status: Qu
         order_by (optional): Column to order the result by. If None, will use created_date.
         order_desc (optional): Should result be in descending order, only used with order_by.
         include_count (optional): Return a tuple with results as well as the total count of elements without limit applied.
+        after (optional): A cursor from get_queue_element_cursor of the last element of the previous page.
+            Only elements after the cursor are returned, which is much faster than skipping elements with offset.
 
     Returns:
         tuple[QueueElement] | tuple[tuple[QueueElement], int]: A tuple of queue elements or a tuple with a tuple of queue elements and an element count.
+
+    Raises:
+        ValueError: If a cursor is given and the order column can be null.
     """
     def _apply_filters(query):
         """Create filters for query, to allow for optional return of count.
@@ -868,20 +1437,32 @@ def get_queue_elements(queue_name: str, reference: str | None = None, status: Qu
         if status is not None:
             query = query.where(QueueElement.status == status)
         if search_term is not None:
-            query = query.where(QueueElement.reference.startswith(search_term) |
-                                QueueElement.data.like(f"%{search_term}%") |
-                                QueueElement.message.like(f"%{search_term}%"))
+            query = query.where(_search_filter(queue_name, search_term))
         return query
 
+    order_by = order_by if order_by and order_by in QueueElement.__table__.c else 'created_date'
+    order_column = getattr(QueueElement, order_by)
+
     with _get_session() as session:
         # Main query
         query = _apply_filters(select(QueueElement))
 
-        if order_by:
-            order_column = getattr(QueueElement, order_by, 'created_date')
+        # The id makes the order unique, so a cursor points to an exact position
+        if order_desc:
+            query = query.order_by(desc(order_column), desc(QueueElement.id))
         else:
-            order_column = 'created_date'
-        query = query.order_by(desc(order_column) if order_desc else order_column)
+            query = query.order_by(order_column, QueueElement.id)
+
+        if after is not None:
+            if QueueElement.__table__.c[order_by].nullable:
+                raise ValueError(f"Can't use a cursor when ordering by the nullable column '{order_by}'.")
+
+            # The first condition alone lets the database seek directly to the cursor in an index
+            after_value, after_id = after
+            if order_desc:
+                query = query.where(order_column <= after_value, or_(order_column < after_value, QueueElement.id < after_id))
+            else:
+                query = query.where(order_column >= after_value, or_(order_column > after_value, QueueElement.id > after_id))
 
         if offset:
             query = query.offset(offset)
@@ -892,24 +1473,99 @@ def get_queue_elements(queue_name: str, reference: str | None = None, status: Qu
         elements_tuple = tuple(result)
 
         if include_count:
-            count_query = _apply_filters(select(alc_func.count()))  # pylint: disable=not-callable
+            if from_date is None and to_date is None and reference is None and search_term is None:
+                # Without other filters the count can be read from the Queue_Counts table
+                count_query = select(alc_func.coalesce(alc_func.sum(QueueCount.count), 0)).where(QueueCount.queue_name == queue_name)
+                if status is not None:
+                    count_query = count_query.where(QueueCount.status == status)
+            else:
+                count_query = _apply_filters(select(alc_func.count()))  # pylint: disable=not-callable
+
             total_count = session.scalar(count_query)
             return elements_tuple, total_count
 
         return elements_tuple
 
 
+def _search_filter(queue_name: str, search_term: str):
+    """Create a filter for queue elements matching a search term using the current search backend.
+    With the 'like' backend the reference must start with the term or the data or message must contain it.
+    With the 'token' backend every word in the term must be the start of a word in the reference, data or message.
+    Terms without any words are always searched with the 'like' backend.
+
+    Args:
+        queue_name: The name of the queue being searched.
+        search_term: The term to search for.
+
+    Returns:
+        The filter expression.
+    """
+    words = _tokenize(search_term) if _search_backend == "token" else set()
+
+    if not words:
+        return (QueueElement.reference.startswith(search_term) |
+                QueueElement.data.like(f"%{search_term}%") |
+                QueueElement.message.like(f"%{search_term}%"))
+
+    return and_(*(
+        QueueElement.id.in_(
+            select(QueueSearchToken.element_id)
+            .where(QueueSearchToken.queue_name == queue_name)
+            .where(_token_prefix_filter(word))
+        )
+        for word in sorted(words)
+    ))
+
+
+def _token_prefix_filter(prefix: str):
+    """Create a filter for search tokens starting with a prefix.
+    SQLite can't use an index for LIKE since it's case insensitive, so a range is used instead.
+    Tokens are lowercase and SQLite compares strings by code point, so the range is exact.
+    Other databases use LIKE, since a range depends on the collation.
+
+    Args:
+        prefix: The prefix of the tokens.
+
+    Returns:
+        The filter expression.
+    """
+    if _connection_engine is not None and _connection_engine.dialect.name == "sqlite":
+        return and_(QueueSearchToken.token >= prefix, QueueSearchToken.token < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+    return QueueSearchToken.token.startswith(prefix, autoescape=True)
+
+
+def get_queue_element_cursor(queue_element: QueueElement, order_by: str | None = None) -> tuple[Any, UUID] | None:
+    """Get a cursor pointing at a queue element for use with get_queue_elements.
+
+    Args:
+        queue_element: The queue element to point at.
+        order_by (optional): The column the elements are ordered by. If None, will use created_date.
+
+    Returns:
+        A cursor of the element's value in the order column and its id,
+        or None if the order column can be null and a cursor can't be used.
+    """
+    order_by = order_by if order_by and order_by in QueueElement.__table__.c else 'created_date'
+
+    if QueueElement.__table__.c[order_by].nullable:
+        return None
+
+    return getattr(queue_element, order_by), queue_element.id
+
+
 def get_queue_count() -> dict[str, dict[QueueStatus, int]]:
     """Count the number of queue elements of each status for every queue.
+    The counts are read from the Queue_Counts table instead of counting the queue elements.
 
     Returns:
         A dict for each queue with the count for each status. E.g. result[queue_name][status] => count.
     """
     with _get_session() as session:
         query = (
-            select(QueueElement.queue_name, QueueElement.status, alc_func.count())  # pylint: disable=not-callable
-            .group_by(QueueElement.queue_name)
-            .group_by(QueueElement.status)
+            select(QueueCount.queue_name, QueueCount.status, alc_func.sum(QueueCount.count))
+            .group_by(QueueCount.queue_name, QueueCount.status)
+            .having(alc_func.sum(QueueCount.count) > 0)
         )
         rows = session.execute(query)
         rows = tuple(rows)
@@ -924,6 +1580,125 @@ def get_queue_count() -> dict[str, dict[QueueStatus, int]]:
     return result
 
 
+def rebuild_queue_counts() -> None:
+    """Recount the queue elements of each status in every queue and rewrite the counts in the Queue_Counts table.
+    The counts are written to the first shard and the other shards are set to 0.
+    Existing rows are kept with a count of 0 for empty queues, since other processes
+    may expect the rows of the queues they have used to exist.
+    This is only needed if the Queues table has been changed without using the functions in this module.
+    """
+    with _get_session() as session:
+        query = (
+            select(QueueElement.queue_name, QueueElement.status, alc_func.count())  # pylint: disable=not-callable
+            .group_by(QueueElement.queue_name)
+            .group_by(QueueElement.status)
+        )
+        counts = {(queue_name, status): count for queue_name, status, count in session.execute(query)}
+        queue_names = {queue_name for queue_name, _ in counts}
+
+        existing_rows = set(session.execute(select(QueueCount.queue_name, QueueCount.status).where(QueueCount.shard == 0)))
+        session.execute(update(QueueCount).values(count=0).execution_options(synchronize_session=False))
+
+        for queue_name in queue_names:
+            for status in QueueStatus:
+                count = counts.get((queue_name, status), 0)
+
+                if (queue_name, status) not in existing_rows:
+                    session.add(QueueCount(queue_name=queue_name, status=status, count=count))
+                elif count:
+                    session.execute(
+                        update(QueueCount)
+                        .where(QueueCount.queue_name == queue_name)
+                        .where(QueueCount.status == status)
+                        .where(QueueCount.shard == 0)
+                        .values(count=count)
+                        .execution_options(synchronize_session=False)
+                    )
+
+        session.commit()
+
+    _counted_queues.clear()
+
+
+def _ensure_queue_counts(*queue_names: str) -> None:
+    """Make sure the Queue_Counts table has a row for every status and shard of the given queues,
+    so the counts can be adjusted with a plain update.
+    Queues already checked by this process are skipped.
+
+    Args:
+        queue_names: The names of the queues.
+    """
+    for queue_name in set(queue_names) - _counted_queues:
+        with _get_session() as session:
+            query = select(QueueCount.status, QueueCount.shard).where(QueueCount.queue_name == queue_name)
+            existing_rows = set(session.execute(query))
+
+            session.add_all(
+                QueueCount(queue_name=queue_name, status=status, shard=shard, count=0)
+                for status in QueueStatus
+                for shard in range(_QUEUE_COUNT_SHARDS)
+                if (status, shard) not in existing_rows
+            )
+
+            try:
+                session.commit()
+            except alc_exc.IntegrityError:
+                # The rows were created by another process in the meantime
+                session.rollback()
+
+        _counted_queues.add(queue_name)
+
+
+def _adjust_queue_counts(session: Session, changes: Counter[tuple[str, QueueStatus]]) -> None:
+    """Adjust the counts in the Queue_Counts table as part of the given session's transaction.
+    The changes are made to a random shard, so concurrent transactions rarely lock the same rows.
+    The rows should have been created using _ensure_queue_counts. A missing row is created.
+
+    Args:
+        session: The session to run the updates in.
+        changes: The change in count for each (queue_name, status) pair.
+    """
+    shard = random.randrange(_QUEUE_COUNT_SHARDS)
+
+    # Always update the rows in the same order, so concurrent transactions don't deadlock
+    for (queue_name, status), change in sorted(changes.items(), key=lambda item: (item[0][0], item[0][1].name)):
+        if change == 0:
+            continue
+
+        query = (
+            update(QueueCount)
+            .where(QueueCount.queue_name == queue_name)
+            .where(QueueCount.status == status)
+            .where(QueueCount.shard == shard)
+            .values(count=QueueCount.count + change)
+            .execution_options(synchronize_session=False)
+        )
+        result = session.execute(query)
+
+        if result.rowcount == 0:
+            # The row was deleted after this process checked the queue
+            session.add(QueueCount(queue_name=queue_name, status=status, shard=shard, count=change))
+            session.flush()
+
+
+def _lock_queue_element_query(element_id: UUID):
+    """Create a query selecting a queue element and locking it for update.
+    'with_for_update' renders no lock on MSSQL, so the lock is given as a table hint there.
+
+    Args:
+        element_id: The id of the queue element.
+
+    Returns:
+        The select query.
+    """
+    return (
+        select(QueueElement)
+        .where(QueueElement.id == element_id)
+        .with_for_update()
+        .with_hint(QueueElement, "WITH (ROWLOCK, UPDLOCK)", "mssql")
+    )
+
+
 def set_queue_element_status(element_id: UUID | str, status: QueueStatus, message: str | None = None) -> None:
     """Set the status of a queue element.
     If the new status is 'in progress' the start date is noted.
@@ -938,16 +1713,26 @@ def set_queue_element_status(element_id: UUID | str, status: QueueStatus, messag
         element_id = UUID(element_id)
 
     with _get_session() as session:
-        q_element = session.get(QueueElement, element_id)
+        q_element = session.scalar(_lock_queue_element_query(element_id))
 
         if not q_element:
             raise ValueError("No queue element with the given id was found.")
 
+        changes: Counter[tuple[str, QueueStatus]] = Counter()
+        changes[(q_element.queue_name, q_element.status)] -= 1
+        changes[(q_element.queue_name, status)] += 1
+
+        _ensure_queue_counts(q_element.queue_name)
+        _adjust_queue_counts(session, changes)
+
         q_element.status = status
 
         if message is not None:
             q_element.message = message
 
+            if _search_backend == "token":
+                _replace_message_tokens(session, [(q_element.queue_name, element_id, message)])
+
         match status:
             case QueueStatus.IN_PROGRESS:
                 q_element.start_date = datetime.now()
@@ -959,18 +1744,273 @@ def set_queue_element_status(element_id: UUID | str, status: QueueStatus, messag
         session.commit()
 
 
+def bulk_set_queue_element_status(updates: list[tuple[UUID | str, QueueStatus, str | None]]) -> None:
+    """Set the status of multiple queue elements in a single transaction.
+    Elements sharing the same status and message are updated in a single statement.
+    If the new status is 'in progress' the start date is noted.
+    If the new status is 'Done', 'Failed' or 'Abandoned' the end date is noted.
+
+    Args:
+        updates: A list of (element_id, status, message) tuples. A message of None leaves any existing message untouched.
+
+    Raises:
+        ValueError: If any of the queue elements doesn't exist. No elements are updated in this case.
+    """
+    # Group the elements by their new values. If an id is given more than once the last update wins.
+    latest_updates = {}
+    for element_id, status, message in updates:
+        if isinstance(element_id, str):
+            element_id = UUID(element_id)
+        latest_updates[element_id] = (status, message)
+
+    groups: dict[tuple[QueueStatus, str | None], list[UUID]] = {}
+    for element_id, values in latest_updates.items():
+        groups.setdefault(values, []).append(element_id)
+
+    now = datetime.now()
+    element_ids = list(latest_updates)
+
+    with _get_session() as session:
+        # Find the current status of the elements to keep the queue counts in sync
+        current_statuses = _lock_queue_element_statuses(session, element_ids)
+
+        if len(current_statuses) != len(element_ids):
+            raise ValueError(f"Not all queue elements with the given ids were found: {len(current_statuses)} of {len(element_ids)}.")
+
+        count_changes: Counter[tuple[str, QueueStatus]] = Counter()
+        for element_id, (queue_name, old_status) in current_statuses.items():
+            count_changes[(queue_name, old_status)] -= 1
+            count_changes[(queue_name, latest_updates[element_id][0])] += 1
+
+        _ensure_queue_counts(*(queue_name for queue_name, _ in current_statuses.values()))
+        _adjust_queue_counts(session, count_changes)
+
+        for (status, message), group_ids in groups.items():
+            values = {"status": status}
+
+            if message is not None:
+                values["message"] = message
+
+                if _search_backend == "token":
+                    _replace_message_tokens(session, [(current_statuses[element_id][0], element_id, message) for element_id in group_ids])
+
+            match status:
+                case QueueStatus.IN_PROGRESS:
+                    values["start_date"] = now
+                case QueueStatus.DONE | QueueStatus.FAILED | QueueStatus.ABANDONED:
+                    values["end_date"] = now
+                case _:
+                    pass
+
+            # Split the ids in chunks to stay below the parameter limits of the database
+            for i in range(0, len(group_ids), _BULK_CHUNK_SIZE):
+                query = (
+                    update(QueueElement)
+                    .where(QueueElement.id.in_(group_ids[i:i+_BULK_CHUNK_SIZE]))
+                    .values(values)
+                    .execution_options(synchronize_session=False)
+                )
+                session.execute(query)
+
+        session.commit()
+
+
+def _lock_queue_element_statuses(session: Session, element_ids: list[UUID]) -> dict[UUID, tuple[str, QueueStatus]]:
+    """Lock the given queue elements for update and get their queue names and current statuses.
+
+    Args:
+        session: The session to lock the elements in.
+        element_ids: The ids of the queue elements.
+
+    Returns:
+        A dict from element id to a tuple of (queue_name, status) for each element found.
+    """
+    result = {}
+    for i in range(0, len(element_ids), _BULK_CHUNK_SIZE):
+        query = (
+            select(QueueElement.id, QueueElement.queue_name, QueueElement.status)
+            .where(QueueElement.id.in_(element_ids[i:i+_BULK_CHUNK_SIZE]))
+            .with_for_update()
+            .with_hint(QueueElement, "WITH (ROWLOCK, UPDLOCK)", "mssql")
+        )
+        for element_id, queue_name, status in session.execute(query):
+            result[element_id] = (queue_name, status)
+
+    return result
+
+
+def _tokenize(*texts: str | None) -> set[str]:
+    """Split texts into lowercase words for the search index.
+
+    Args:
+        texts: The texts to split.
+
+    Returns:
+        The unique words in the texts.
+    """
+    tokens = set()
+    for text_ in texts:
+        if text_:
+            tokens.update(word[:_SEARCH_TOKEN_LENGTH] for word in re.findall(r"\w+", text_.lower()))
+    return tokens
+
+
+def _insert_search_tokens(session: Session, elements: list[tuple[str, UUID, str | None, str | None, str | None]]) -> None:
+    """Add the words of new queue elements to the Queue_Search_Tokens table.
+
+    Args:
+        session: The session to insert the tokens in.
+        elements: A list of (queue_name, element_id, reference, data, message) tuples.
+    """
+    tokens = []
+    for queue_name, element_id, reference, data, message in elements:
+        tokens.extend({"queue_name": queue_name, "token": token, "element_id": element_id, "in_message": False}
+                      for token in _tokenize(reference, data))
+        tokens.extend({"queue_name": queue_name, "token": token, "element_id": element_id, "in_message": True}
+                      for token in _tokenize(message))
+
+    if tokens:
+        session.execute(insert(QueueSearchToken.__table__), tokens)
+
+
+def _replace_message_tokens(session: Session, elements: list[tuple[str, UUID, str]]) -> None:
+    """Replace the words of the messages of queue elements in the Queue_Search_Tokens table.
+
+    Args:
+        session: The session to replace the tokens in.
+        elements: A list of (queue_name, element_id, message) tuples.
+    """
+    element_ids = [element_id for _, element_id, _ in elements]
+    for i in range(0, len(element_ids), _BULK_CHUNK_SIZE):
+        session.execute(
+            delete(QueueSearchToken)
+            .where(QueueSearchToken.element_id.in_(element_ids[i:i+_BULK_CHUNK_SIZE]))
+            .where(QueueSearchToken.in_message)
+        )
+
+    _insert_search_tokens(session, [(queue_name, element_id, None, None, message) for queue_name, element_id, message in elements])
+
+
+def rebuild_queue_search_index() -> None:
+    """Rewrite the Queue_Search_Tokens table from all queue elements.
+    This is needed when the 'token' search backend is enabled on a database with existing queue elements,
+    or if queue elements have been changed by programs not using the 'token' backend.
+    """
+    with _get_session() as session:
+        session.execute(delete(QueueSearchToken))
+
+        # Page through the elements by id, so the tokens can be inserted between reads
+        last_id = None
+        while True:
+            query = (
+                select(QueueElement.queue_name, QueueElement.id, QueueElement.reference, QueueElement.data, QueueElement.message)
+                .order_by(QueueElement.id)
+                .limit(_BULK_CHUNK_SIZE)
+            )
+            if last_id is not None:
+                query = query.where(QueueElement.id > last_id)
+
+            elements = [tuple(row) for row in session.execute(query)]
+            if not elements:
+                break
+
+            _insert_search_tokens(session, elements)  # type: ignore
+            last_id = elements[-1][1]
+
+        session.commit()
+
+
 def delete_queue_element(element_id: UUID | str) -> None:
     """Delete a queue element from the database.
 
     Args:
         element_id: The id of the queue element.
     """
+    if isinstance(element_id, str):
+        element_id = UUID(element_id)
+
     with _get_session() as session:
-        q_element = session.get(QueueElement, element_id)
+        q_element = session.scalar(_lock_queue_element_query(element_id))
+
+        if not q_element:
+            raise ValueError("No queue element with the given id was found.")
+
+        _ensure_queue_counts(q_element.queue_name)
+        _adjust_queue_counts(session, Counter({(q_element.queue_name, q_element.status): -1}))
+
+        # Tokens are always removed, so a disabled index doesn't keep tokens of deleted elements
+        session.execute(delete(QueueSearchToken).where(QueueSearchToken.element_id == element_id))
         session.delete(q_element)
         session.commit()
 
 
+def delete_old_queue_elements(before: datetime, queue_name: str | None = None, exclude_queue_names: tuple[str, ...] = (),
+                              limit: int = _BULK_CHUNK_SIZE, before_commit: Callable[[list[dict[str, Any]]], None] | None = None) -> list[dict[str, Any]]:
+    """Delete a batch of the oldest finished queue elements that ended before the given time.
+    Finished elements have the status 'Done', 'Failed' or 'Abandoned'. Elements without an end date
+    are judged by their created date. The queue counts and search tokens are updated in the same transaction.
+    Call it until it returns fewer elements than the limit to delete all matching elements.
+
+    Args:
+        before: Finished queue elements older than this are deleted.
+        queue_name: The queue name to filter on. If none the filter is disabled.
+        exclude_queue_names: Queue names whose elements are never deleted.
+        limit: The maximum number of queue elements to delete.
+        before_commit: A function called with the deleted queue elements before the deletion is committed, e.g. to archive them.
+            If it raises an exception the deletion is rolled back.
+
+    Returns:
+        The deleted queue elements as dicts of column values.
+    """
+    query = (
+        select(QueueElement.__table__)
+        .where(QueueElement.status.in_((QueueStatus.DONE, QueueStatus.FAILED, QueueStatus.ABANDONED)))
+        .where(or_(
+            QueueElement.end_date < before,
+            and_(QueueElement.end_date.is_(None), QueueElement.created_date < before)
+        ))
+        .order_by(QueueElement.created_date)
+        .limit(limit)
+        .with_for_update()
+        .with_hint(QueueElement.__table__, "WITH (ROWLOCK, UPDLOCK)", "mssql")
+    )
+
+    if queue_name:
+        query = query.where(QueueElement.queue_name == queue_name)
+
+    if exclude_queue_names:
+        query = query.where(QueueElement.queue_name.not_in(exclude_queue_names))
+
+    with _get_session() as session:
+        rows = [dict(row) for row in session.execute(query).mappings()]
+        if not rows:
+            return rows
+
+        changes: Counter[tuple[str, QueueStatus]] = Counter()
+        for row in rows:
+            changes[(row["queue_name"], row["status"])] -= 1
+
+        _ensure_queue_counts(*(name for name, _ in changes))
+        _adjust_queue_counts(session, changes)
+
+        element_ids = [row["id"] for row in rows]
+        for i in range(0, len(element_ids), _BULK_CHUNK_SIZE):
+            chunk = element_ids[i:i+_BULK_CHUNK_SIZE]
+            session.execute(delete(QueueSearchToken).where(QueueSearchToken.element_id.in_(chunk)))
+            session.execute(
+                delete(QueueElement)
+                .where(QueueElement.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+
+        if before_commit:
+            before_commit(rows)
+
+        session.commit()
+
+    return rows
+
+
 def get_schedulers() -> tuple[Scheduler, ...]:
     """Get Schedulers from the database"""
     with _get_session() as session:
@@ -4,7 +4,7 @@ from datetime import datetime
 import enum
 import uuid
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from OpenOrchestrator.common import datetime_util
@@ -24,6 +24,11 @@ class LogLevel(enum.Enum):
 class Log(Base):
     """A class representing log objects in the ORM."""
     __tablename__ = "Logs"
+    __table_args__ = (
+        Index("ix_Logs_log_time", "log_time"),
+        Index("ix_Logs_process_name_log_time", "process_name", "log_time"),
+        Index("ix_Logs_log_level_log_time", "log_level", "log_time"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     log_time: Mapped[datetime] = mapped_column(default=datetime.now)
@@ -40,3 +45,13 @@ class Log(Base):
             "Message": self.log_message,
             "ID": str(self.id)
         }
+
+
+class ProcessName(Base):
+    """A class representing a process name in the ORM.
+    The process names of logs and triggers are registered by db_util, so the unique
+    process names can be read without scanning the logs table.
+    """
+    __tablename__ = "Process_Names"
+
+    process_name: Mapped[str] = mapped_column(String(100), primary_key=True)
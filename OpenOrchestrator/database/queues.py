@@ -5,7 +5,7 @@ import enum
 from typing import Optional
 import uuid
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from OpenOrchestrator.common import datetime_util
@@ -27,9 +27,14 @@ class QueueStatus(enum.Enum):
 class QueueElement(Base):
     """A class representing a queue element in the ORM."""
     __tablename__ = "Queues"
+    __table_args__ = (
+        Index("ix_Queues_queue_name_status_created_date", "queue_name", "status", "created_date"),
+        Index("ix_Queues_queue_name_reference", "queue_name", "reference"),
+        Index("ix_Queues_queue_name_created_date_id", "queue_name", "created_date", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
-    queue_name: Mapped[str] = mapped_column(String(100), index=True)
+    queue_name: Mapped[str] = mapped_column(String(100))
     status: Mapped[QueueStatus] = mapped_column(default=QueueStatus.NEW)
     data: Mapped[Optional[str]] = mapped_column(String(2000))
     reference: Mapped[Optional[str]] = mapped_column(String(100))
@@ -52,3 +57,34 @@ class QueueElement(Base):
             "Message": self.message,
             "Created By": self.created_by
         }
+
+
+class QueueCount(Base):
+    """A class representing part of the number of queue elements with a given status in a queue.
+    The counts are maintained by the queue functions in db_util, so queue sizes
+    can be read without counting the queue elements.
+    Each queue and status has several shards that are summed on read, so concurrent
+    changes to the same queue rarely wait for each other's row locks.
+    """
+    __tablename__ = "Queue_Counts"
+
+    queue_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    status: Mapped[QueueStatus] = mapped_column(primary_key=True)
+    shard: Mapped[int] = mapped_column(primary_key=True, default=0)
+    count: Mapped[int] = mapped_column(default=0)
+
+
+class QueueSearchToken(Base):
+    """A class representing a word in the reference, data or message of a queue element.
+    The tokens are used to search queue elements when the 'token' search backend is used.
+    See db_util.get_queue_elements.
+    """
+    __tablename__ = "Queue_Search_Tokens"
+    __table_args__ = (
+        Index("ix_Queue_Search_Tokens_element_id", "element_id"),
+    )
+
+    queue_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    token: Mapped[str] = mapped_column(String(50), primary_key=True)
+    element_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    in_message: Mapped[bool] = mapped_column(primary_key=True)
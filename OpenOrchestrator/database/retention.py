@@ -0,0 +1,278 @@
+"""This module deletes old logs and finished queue elements according to a retention policy.
+Rows are deleted in bounded batches, so each transaction stays short, and can be archived
+to gzip compressed JSON Lines files before they are deleted.
+
+A policy is a json file like this:
+{
+    "logs": {"*": 90, "Important Process": 365},
+    "queues": {"*": 30, "Audit Queue": null},
+    "archive_folder": "C:/Archive",
+    "batch_size": 1000
+}
+'logs' holds the number of days to keep logs per process name and 'queues' the number of days
+to keep finished queue elements per queue name. The key '*' applies to all other names
+and null keeps the rows forever. Names without a policy are kept forever.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import enum
+import gzip
+import json
+import os
+from typing import Any, Callable
+from uuid import UUID
+
+from OpenOrchestrator.database import db_util
+
+# The key in a policy that applies to all names without their own policy.
+DEFAULT_KEY = "*"
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass
+class RetentionPolicy:
+    """The number of days to keep logs and finished queue elements."""
+    logs: dict[str, int | None] = field(default_factory=dict)
+    queues: dict[str, int | None] = field(default_factory=dict)
+    archive_folder: str | None = None
+    batch_size: int = DEFAULT_BATCH_SIZE
+
+
+@dataclass
+class RetentionReport:
+    """The result of applying a retention policy.
+    The reclaimed bytes are estimated from the size of the deleted rows as json.
+    """
+    logs_deleted: int = 0
+    queue_elements_deleted: int = 0
+    bytes_reclaimed: int = 0
+    archive_files: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """Get a human readable summary of the report.
+
+        Returns:
+            The summary.
+        """
+        text = (f"Retention deleted {self.logs_deleted} logs and {self.queue_elements_deleted} queue elements "
+                f"reclaiming about {self.bytes_reclaimed / 1_000_000:.1f} MB.")
+
+        if self.archive_files:
+            text += f" Archived to: {', '.join(self.archive_files)}"
+
+        return text
+
+
+def load_policy(path: str) -> RetentionPolicy:
+    """Read a retention policy from a json file.
+
+    Args:
+        path: The path of the json file.
+
+    Raises:
+        ValueError: If the file isn't a valid policy.
+
+    Returns:
+        The retention policy.
+    """
+    with open(path, encoding="utf-8") as file:
+        try:
+            data = json.load(file)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"The retention policy isn't valid json: {exc}") from exc
+
+    return parse_policy(data)
+
+
+def parse_policy(data: Any) -> RetentionPolicy:
+    """Create a retention policy from a json object.
+
+    Args:
+        data: The decoded json object.
+
+    Raises:
+        ValueError: If the object isn't a valid policy.
+
+    Returns:
+        The retention policy.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("The retention policy must be a json object.")
+
+    unknown_keys = set(data) - {"logs", "queues", "archive_folder", "batch_size"}
+    if unknown_keys:
+        raise ValueError(f"Unknown keys in the retention policy: {', '.join(sorted(unknown_keys))}")
+
+    policy = RetentionPolicy(
+        logs=_parse_days(data.get("logs", {}), "logs"),
+        queues=_parse_days(data.get("queues", {}), "queues"),
+        archive_folder=data.get("archive_folder"),
+        batch_size=data.get("batch_size", DEFAULT_BATCH_SIZE)
+    )
+
+    if policy.archive_folder is not None and not isinstance(policy.archive_folder, str):
+        raise ValueError("'archive_folder' must be a string.")
+
+    if not isinstance(policy.batch_size, int) or isinstance(policy.batch_size, bool) or policy.batch_size < 1:
+        raise ValueError("'batch_size' must be a positive integer.")
+
+    return policy
+
+
+def _parse_days(days: Any, key: str) -> dict[str, int | None]:
+    """Validate the days to keep per name in a policy.
+
+    Args:
+        days: The decoded json value.
+        key: The key of the value in the policy used in error messages.
+
+    Raises:
+        ValueError: If the value isn't an object of non-negative integers or nulls.
+
+    Returns:
+        The days to keep per name.
+    """
+    if not isinstance(days, dict):
+        raise ValueError(f"'{key}' must be a json object of names and days to keep.")
+
+    for name, value in days.items():
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+            raise ValueError(f"The days to keep for '{name}' in '{key}' must be a non-negative integer or null.")
+
+    return days
+
+
+def apply_policy(policy: RetentionPolicy, now: datetime | None = None) -> RetentionReport:
+    """Delete the logs and finished queue elements that are older than the policy allows.
+    If the policy has an archive folder the rows are written to it before they are deleted.
+
+    Args:
+        policy: The retention policy to apply.
+        now: The time to count the days back from. Defaults to the current time.
+
+    Returns:
+        A report of the deleted rows.
+    """
+    now = now or datetime.now()
+    report = RetentionReport()
+
+    for table_name, days_per_name, delete_func in (
+        ("Logs", policy.logs, db_util.delete_old_logs),
+        ("Queues", policy.queues, db_util.delete_old_queue_elements)
+    ):
+        archive_path = None
+        if policy.archive_folder:
+            archive_path = os.path.join(policy.archive_folder, f"{table_name}_{now:%Y%m%d_%H%M%S}.jsonl.gz")
+
+        deleted, deleted_bytes = _apply_days(days_per_name, delete_func, now, policy.batch_size, archive_path)
+
+        if table_name == "Logs":
+            report.logs_deleted += deleted
+        else:
+            report.queue_elements_deleted += deleted
+        report.bytes_reclaimed += deleted_bytes
+
+        if archive_path and deleted:
+            report.archive_files.append(archive_path)
+
+    return report
+
+
+def _apply_days(days_per_name: dict[str, int | None], delete_func: Callable[..., list[dict[str, Any]]],
+                now: datetime, batch_size: int, archive_path: str | None) -> tuple[int, int]:
+    """Delete rows in batches for each name in a policy.
+
+    Args:
+        days_per_name: The days to keep per name.
+        delete_func: The db_util function deleting a batch of rows.
+        now: The time to count the days back from.
+        batch_size: The maximum number of rows to delete in a transaction.
+        archive_path: The file to archive the rows to if any.
+
+    Returns:
+        The number of rows deleted and their estimated size in bytes.
+    """
+    named = tuple(name for name in days_per_name if name != DEFAULT_KEY)
+
+    # Each name with its own policy and then all other names
+    targets = [(name, days_per_name[name], ()) for name in named]
+    if DEFAULT_KEY in days_per_name:
+        targets.append((None, days_per_name[DEFAULT_KEY], named))
+
+    deleted = 0
+    deleted_bytes = 0
+    lines: list[str] = []
+
+    def archive(rows: list[dict[str, Any]]):
+        lines.extend(_to_json_lines(rows))
+        if archive_path:
+            _write_archive(archive_path, lines)
+
+    for name, days, exclude in targets:
+        if days is None:
+            continue
+
+        before = now - timedelta(days=days)
+        while True:
+            lines.clear()
+            rows = delete_func(before, name, exclude, limit=batch_size, before_commit=archive)
+
+            deleted += len(rows)
+            deleted_bytes += sum(len(line.encode()) for line in lines)
+
+            if len(rows) < batch_size:
+                break
+
+    return deleted, deleted_bytes
+
+
+def _to_json_lines(rows: list[dict[str, Any]]) -> list[str]:
+    """Convert rows to lines of json.
+
+    Args:
+        rows: The rows as dicts of column values.
+
+    Returns:
+        A json line for each row.
+    """
+    return [json.dumps(row, default=_json_default, ensure_ascii=False) + "\n" for row in rows]
+
+
+def _json_default(value: Any) -> Any:
+    """Convert the column values json doesn't support.
+
+    Args:
+        value: The value to convert.
+
+    Raises:
+        TypeError: If the value can't be converted.
+
+    Returns:
+        A json compatible value.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    if isinstance(value, UUID):
+        return str(value)
+
+    if isinstance(value, enum.Enum):
+        return value.value
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _write_archive(path: str, lines: list[str]) -> None:
+    """Append lines to a gzip compressed archive file.
+    Each call adds a gzip member to the file, which is read as one stream by gzip tools.
+
+    Args:
+        path: The path of the archive file.
+        lines: The lines to write.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with gzip.open(path, "at", encoding="utf-8") as file:
+        file.writelines(lines)
@@ -51,6 +51,7 @@ class Trigger(Base):
     is_blocking: Mapped[bool]
     scheduler_whitelist: Mapped[Optional[StringList]] = mapped_column(StringList(250))
     priority: Mapped[int] = mapped_column(default=0)
+    weight: Mapped[int] = mapped_column(default=1)
     type: Mapped[TriggerType]
 
     __mapper_args__ = {
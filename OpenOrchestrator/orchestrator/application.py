@@ -5,6 +5,7 @@ import socket
 
 from nicegui import ui, app
 
+from OpenOrchestrator.orchestrator import data_cache
 from OpenOrchestrator.orchestrator.tabs.trigger_tab import TriggerTab
 from OpenOrchestrator.orchestrator.tabs.settings_tab import SettingsTab
 from OpenOrchestrator.orchestrator.tabs.logging_tab import LoggingTab
@@ -29,7 +30,7 @@ class Application():
 
             ui.space()
             ui.button(icon="contrast", on_click=ui.dark_mode().toggle)
-            ui.button(icon='refresh', on_click=self.update_tab).props("auto-id=refresh_button")
+            ui.button(icon='refresh', on_click=self.refresh_tab).props("auto-id=refresh_button")
 
         with ui.tab_panels(self.tabs, value='Settings', on_change=self.update_tab).classes('w-full') as self.tab_panels:
             self.t_tab = TriggerTab('Triggers')
@@ -45,26 +46,31 @@ class Application():
         app.on_exception(lambda exc: ui.notify(exc, type='negative'))
         ui.run(title="Orchestrator", favicon='🤖', native=False, port=port or get_free_port(), reload=False, show=show)
 
-    def update_tab(self):
+    async def update_tab(self):
         """Update the date in the currently selected tab."""
         match self.tab_panels.value:
             case 'Triggers':
-                self.t_tab.update()
+                await self.t_tab.update()
             case 'Logs':
-                self.l_tab.update()
+                await self.l_tab.update()
             case 'Constants':
-                self.c_tab.update()
+                await self.c_tab.update()
             case 'Schedulers':
-                self.s_tab.update()
+                await self.s_tab.update()
             case 'Queues':
-                self.q_tab.update()
+                await self.q_tab.update()
+
+    async def refresh_tab(self):
+        """Update the currently selected tab with fresh data from the database."""
+        data_cache.clear()
+        await self.update_tab()
 
     async def update_loop(self):
         """Update the selected tab on a timer but only if the page is in focus."""
         try:
             in_focus = await ui.run_javascript("document.hasFocus()")
             if in_focus:
-                self.update_tab()
+                await self.update_tab()
         except TimeoutError:
             pass
 
@@ -0,0 +1,155 @@
+"""This module is a cache in front of the read functions in db_util used by the tabs in Orchestrator.
+The cache is shared by all connected browsers, so the load on the database doesn't grow
+with the number of clients. Results are kept for a short time and concurrent calls
+for the same data wait for a single query instead of running their own."""
+
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+from OpenOrchestrator.database import db_util
+from OpenOrchestrator.database.constants import Constant, Credential
+from OpenOrchestrator.database.queues import QueueStatus
+from OpenOrchestrator.database.schedulers import Scheduler
+from OpenOrchestrator.database.triggers import Trigger
+
+# The time in seconds a result is kept.
+TTL = 5.0
+
+T = TypeVar("T")
+
+
+# pylint: disable-next=too-few-public-methods
+class _Entry():
+    """A cached result and the lock used to fetch it."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value: Any = None
+        self.expires = 0.0
+        self.generation = 0
+
+    def expire(self) -> None:
+        """Mark the cached result as expired and discard any fetch in progress."""
+        self.expires = 0.0
+        self.generation += 1
+
+
+_entries: dict[tuple[str | None, str], _Entry] = {}
+_entries_lock = threading.Lock()
+
+
+def _get_entry(name: str) -> _Entry:
+    """Get the cache entry of a function for the current database.
+
+    Args:
+        name: The name of the function.
+
+    Returns:
+        The cache entry.
+    """
+    with _entries_lock:
+        return _entries.setdefault((db_util.get_conn_string(), name), _Entry())
+
+
+def _get(func: Callable[[], T]) -> T:
+    """Get the result of a function from the cache or call it if the cached result has expired.
+    If another thread is already calling the function the result of that call is used.
+
+    Args:
+        func: The function to get the result of.
+
+    Returns:
+        The result of the function.
+    """
+    entry = _get_entry(func.__name__)
+
+    if time.monotonic() < entry.expires:
+        return entry.value
+
+    with entry.lock:
+        if time.monotonic() < entry.expires:
+            return entry.value
+
+        generation = entry.generation
+        value = func()
+
+        # Don't keep the result if the data was changed while it was fetched
+        if generation == entry.generation:
+            entry.value = value
+            entry.expires = time.monotonic() + TTL
+
+        return value
+
+
+def invalidate(*funcs: Callable) -> None:
+    """Remove the cached results of the given functions so the next call reads from the database.
+    Should be called after writing to the database.
+
+    Args:
+        funcs: The cached functions in this module whose results to remove.
+    """
+    for func in funcs:
+        _get_entry(func.__name__).expire()
+
+
+def clear() -> None:
+    """Remove all cached results so the next calls read from the database."""
+    with _entries_lock:
+        entries = list(_entries.values())
+
+    for entry in entries:
+        entry.expire()
+
+
+def get_all_triggers() -> tuple[Trigger, ...]:
+    """Get all triggers in the database through the cache.
+
+    Returns:
+        A tuple of Trigger objects.
+    """
+    return _get(db_util.get_all_triggers)
+
+
+def get_queue_count() -> dict[str, dict[QueueStatus, int]]:
+    """Get the number of queue elements per queue and status through the cache.
+
+    Returns:
+        A dict with queue names as keys and dicts of statuses and counts as values.
+    """
+    return _get(db_util.get_queue_count)
+
+
+def get_schedulers() -> tuple[Scheduler, ...]:
+    """Get all schedulers in the database through the cache.
+
+    Returns:
+        A tuple of Scheduler objects.
+    """
+    return _get(db_util.get_schedulers)
+
+
+def get_unique_log_process_names() -> tuple[str, ...]:
+    """Get the unique process names in the logs table through the cache.
+
+    Returns:
+        A tuple of process names.
+    """
+    return _get(db_util.get_unique_log_process_names)
+
+
+def get_constants() -> tuple[Constant, ...]:
+    """Get all constants in the database through the cache.
+
+    Returns:
+        A tuple of Constant objects.
+    """
+    return _get(db_util.get_constants)
+
+
+def get_credentials() -> tuple[Credential, ...]:
+    """Get all credentials in the database through the cache.
+
+    Returns:
+        A tuple of Credential objects.
+    """
+    return _get(db_util.get_credentials)
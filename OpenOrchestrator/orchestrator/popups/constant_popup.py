@@ -5,10 +5,10 @@ from typing import TYPE_CHECKING
 
 from nicegui import ui
 
-from OpenOrchestrator.database import db_util
+from OpenOrchestrator.database import async_db_util
 from OpenOrchestrator.database.constants import Constant
 from OpenOrchestrator.orchestrator.popups.generic_popups import question_popup
-from OpenOrchestrator.orchestrator import test_helper
+from OpenOrchestrator.orchestrator import data_cache, test_helper
 
 if TYPE_CHECKING:
     from OpenOrchestrator.orchestrator.tabs.constants_tab import ConstantTab
@@ -57,7 +57,7 @@ class ConstantPopup():
             self.name_input.disable()
             self.value_input.value = self.constant.value
 
-    def _create_constant(self):
+    async def _create_constant(self):
         """Creates a new constant in the database using the data from the
         UI.
         """
@@ -71,11 +71,11 @@ class ConstantPopup():
         value = self.value_input.value
 
         if self.constant:
-            db_util.update_constant(name, value)
+            await async_db_util.update_constant(name, value)
         else:
             # Check if constant already exists
             try:
-                db_util.get_constant(name)
+                await async_db_util.get_constant(name)
                 exists = True
             except ValueError:
                 exists = False
@@ -84,15 +84,17 @@ class ConstantPopup():
                 ui.notify("A constant with that name already exists.", type='negative')
                 return
 
-            db_util.create_constant(name, value)
+            await async_db_util.create_constant(name, value)
 
         self.dialog.close()
-        self.constant_tab.update()
+        data_cache.invalidate(data_cache.get_constants)
+        await self.constant_tab.update()
 
     async def _delete_constant(self):
         if not self.constant:
             return
         if await question_popup(f"Delete constant '{self.constant.name}?", "Delete", "Cancel", color1='red'):
-            db_util.delete_constant(self.constant.name)
+            await async_db_util.delete_constant(self.constant.name)
             self.dialog.close()
-            self.constant_tab.update()
+            data_cache.invalidate(data_cache.get_constants)
+            await self.constant_tab.update()
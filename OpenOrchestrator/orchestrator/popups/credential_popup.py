@@ -5,10 +5,10 @@ from typing import TYPE_CHECKING
 
 from nicegui import ui
 
-from OpenOrchestrator.database import db_util
+from OpenOrchestrator.database import async_db_util
 from OpenOrchestrator.database.constants import Credential
 from OpenOrchestrator.orchestrator.popups.generic_popups import question_popup
-from OpenOrchestrator.orchestrator import test_helper
+from OpenOrchestrator.orchestrator import data_cache, test_helper
 
 if TYPE_CHECKING:
     from OpenOrchestrator.orchestrator.tabs.constants_tab import ConstantTab
@@ -60,7 +60,7 @@ class CredentialPopup():
             self.name_input.disable()
             self.username_input.value = self.credential.username
 
-    def _save_credential(self):
+    async def _save_credential(self):
         """Create or update a credential in the database using the data from the UI."""
         self.name_input.validate()
         self.username_input.validate()
@@ -74,11 +74,11 @@ class CredentialPopup():
         password = self.password_input.value
 
         if self.credential:
-            db_util.update_credential(name, username, password)
+            await async_db_util.update_credential(name, username, password)
         else:
             # Check if credential already exists
             try:
-                db_util.get_credential(name, decrypt_password=False)
+                await async_db_util.get_credential(name, decrypt_password=False)
                 exists = True
             except ValueError:
                 exists = False
@@ -87,16 +87,18 @@ class CredentialPopup():
                 ui.notify("A credential with that name already exists.", type='negative')
                 return
 
-            db_util.create_credential(name, username, password)
+            await async_db_util.create_credential(name, username, password)
 
         self.dialog.close()
-        self.constant_tab.update()
+        data_cache.invalidate(data_cache.get_credentials)
+        await self.constant_tab.update()
 
     async def _delete_credential(self):
         """Delete the selected credential."""
         if not self.credential:
             return
         if await question_popup(f"Delete credential '{self.credential.name}'?", "Delete", "Cancel", color1='red'):
-            db_util.delete_credential(self.credential.name)
+            await async_db_util.delete_credential(self.credential.name)
             self.dialog.close()
-            self.constant_tab.update()
+            data_cache.invalidate(data_cache.get_credentials)
+            await self.constant_tab.update()
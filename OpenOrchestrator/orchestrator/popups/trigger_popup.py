@@ -8,10 +8,10 @@ from nicegui import ui
 from cronsim import CronSim, CronSimError
 
 from OpenOrchestrator.orchestrator.datetime_input import DatetimeInput
-from OpenOrchestrator.database import db_util
+from OpenOrchestrator.database import async_db_util
 from OpenOrchestrator.database.triggers import Trigger, TriggerStatus, TriggerType, ScheduledTrigger, SingleTrigger, QueueTrigger
 from OpenOrchestrator.orchestrator.popups import generic_popups
-from OpenOrchestrator.orchestrator import test_helper
+from OpenOrchestrator.orchestrator import data_cache, test_helper
 
 if TYPE_CHECKING:
     from OpenOrchestrator.orchestrator.tabs.trigger_tab import TriggerTab
@@ -53,6 +53,7 @@ class TriggerPopup():
             self.args_input = ui.input("Process Arguments").classes("w-full")
             self.blocking_check = ui.checkbox(text="Is process blocking?", value=True)
             self.priority_input = ui.number("Priority", value=0, precision=0, format="%.0f")
+            self.weight_input = ui.number("Weight", value=1, min=1, precision=0, format="%.0f")
             self.whitelist_input = ui.input_chips("Scheduler whitelist").classes("w-full")
 
             if trigger:
@@ -103,6 +104,7 @@ class TriggerPopup():
         self.branch_input.value = self.trigger.git_branch
         self.blocking_check.value = self.trigger.is_blocking
         self.priority_input.value = self.trigger.priority
+        self.weight_input.value = self.trigger.weight
         self.whitelist_input.value = self.trigger.scheduler_whitelist
 
         if isinstance(self.trigger, ScheduledTrigger):
@@ -176,16 +178,17 @@ class TriggerPopup():
         is_git = self.git_check.value
         is_blocking = self.blocking_check.value
         priority = self.priority_input.value
+        weight = self.weight_input.value
         whitelist = self.whitelist_input.value
 
         if self.trigger is None:
             # Create new trigger in database
             if self.trigger_type == TriggerType.SINGLE:
-                db_util.create_single_trigger(trigger_name, process_name, next_run, path, args, is_git, is_blocking, priority, whitelist, git_branch)
+                await async_db_util.create_single_trigger(trigger_name, process_name, next_run, path, args, is_git, is_blocking, priority, whitelist, git_branch, weight)
             elif self.trigger_type == TriggerType.SCHEDULED:
-                db_util.create_scheduled_trigger(trigger_name, process_name, cron_expr, next_run, path, args, is_git, is_blocking, priority, whitelist, git_branch)
+                await async_db_util.create_scheduled_trigger(trigger_name, process_name, cron_expr, next_run, path, args, is_git, is_blocking, priority, whitelist, git_branch, weight)
             elif self.trigger_type == TriggerType.QUEUE:
-                db_util.create_queue_trigger(trigger_name, process_name, queue_name, path, args, is_git, is_blocking, min_batch_size, priority, whitelist, git_branch)
+                await async_db_util.create_queue_trigger(trigger_name, process_name, queue_name, path, args, is_git, is_blocking, min_batch_size, priority, whitelist, git_branch, weight)
 
             ui.notify("Trigger created", type='positive')
         else:
@@ -197,6 +200,7 @@ class TriggerPopup():
             self.trigger.is_git_repo = is_git
             self.trigger.is_blocking = is_blocking
             self.trigger.priority = priority
+            self.trigger.weight = weight
             self.trigger.scheduler_whitelist = whitelist
             self.trigger.git_branch = git_branch
 
@@ -209,42 +213,47 @@ class TriggerPopup():
                 self.trigger.queue_name = queue_name
                 self.trigger.min_batch_size = min_batch_size
 
-            db_util.update_trigger(self.trigger)
+            await async_db_util.update_trigger(self.trigger)
             ui.notify("Trigger updated", type='positive')
 
         self.dialog.close()
-        self.trigger_tab.update()
+        data_cache.invalidate(data_cache.get_all_triggers)
+        await self.trigger_tab.update()
 
     async def _delete_trigger(self):
         if not self.trigger:
             return
 
         if await generic_popups.question_popup(f"Delete trigger '{self.trigger.trigger_name}'?", "Delete", "Cancel", color1='red'):
-            db_util.delete_trigger(self.trigger.id)
+            await async_db_util.delete_trigger(self.trigger.id)
             ui.notify("Trigger deleted", type='positive')
             self.dialog.close()
-            self.trigger_tab.update()
+            data_cache.invalidate(data_cache.get_all_triggers)
+            await self.trigger_tab.update()
 
-    def _disable_trigger(self):
+    async def _disable_trigger(self):
         if not self.trigger:
             return
 
         if self.trigger.process_status == TriggerStatus.RUNNING:
-            db_util.set_trigger_status(self.trigger.id, TriggerStatus.PAUSING)
+            await async_db_util.set_trigger_status(self.trigger.id, TriggerStatus.PAUSING)
         else:
-            db_util.set_trigger_status(self.trigger.id, TriggerStatus.PAUSED)
+            await async_db_util.set_trigger_status(self.trigger.id, TriggerStatus.PAUSED)
         ui.notify("Trigger status set to 'Paused'.", type='positive')
-        self.trigger_tab.update()
+        data_cache.invalidate(data_cache.get_all_triggers)
+        await self.trigger_tab.update()
 
-    def _kill_trigger(self):
-        db_util.set_trigger_status(self.trigger.id, TriggerStatus.KILLING)
+    async def _kill_trigger(self):
+        await async_db_util.set_trigger_status(self.trigger.id, TriggerStatus.KILLING)
         ui.notify("Killing trigger", type='warning')
-        self.trigger_tab.update()
+        data_cache.invalidate(data_cache.get_all_triggers)
+        await self.trigger_tab.update()
 
-    def _enable_trigger(self):
+    async def _enable_trigger(self):
         if not self.trigger:
             return
 
-        db_util.set_trigger_status(self.trigger.id, TriggerStatus.IDLE)
+        await async_db_util.set_trigger_status(self.trigger.id, TriggerStatus.IDLE)
         ui.notify("Trigger status set to 'Idle'.", type='positive')
-        self.trigger_tab.update()
+        data_cache.invalidate(data_cache.get_all_triggers)
+        await self.trigger_tab.update()
@@ -0,0 +1,62 @@
+"""This module contains a single class called QueryRunner which is used
+by Orchestrator to run database queries from filter inputs without blocking the ui."""
+
+import asyncio
+from typing import Any, Callable
+
+from nicegui import background_tasks
+
+from OpenOrchestrator.database import async_db_util
+
+# The time in seconds an input must be unchanged before a query is run.
+DEBOUNCE_DELAY = 0.3
+
+
+class QueryRunner():
+    """A QueryRunner runs queries in a thread pool off the event loop.
+    A query waits for the debounce delay before it's run, and each new query supersedes
+    the previous one. Superseded queries that haven't started are cancelled and the results
+    of superseded queries that have started are discarded.
+    """
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._generation = 0
+
+    def submit(self, query: Callable[[], Any], on_result: Callable[[Any], None], delay: float = DEBOUNCE_DELAY) -> None:
+        """Run a query and handle its result unless it's superseded.
+
+        Args:
+            query: A function running the query. It's called in a worker thread, so it shouldn't touch the ui.
+            on_result: A function handling the result of the query. It's called on the event loop.
+            delay: The time in seconds to wait before running the query.
+        """
+        self.cancel()
+        self._task = background_tasks.create(self._run(self._generation, query, on_result, delay), name="QueryRunner")
+
+    def cancel(self) -> None:
+        """Cancel any pending query and discard the result of any running query."""
+        self._generation += 1
+
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+        self._task = None
+
+    async def _run(self, generation: int, query: Callable[[], Any], on_result: Callable[[Any], None], delay: float) -> None:
+        """Wait for the delay, run the query and handle the result if it hasn't been superseded.
+
+        Args:
+            generation: The generation of the query.
+            query: The function running the query.
+            on_result: The function handling the result.
+            delay: The time in seconds to wait before running the query.
+        """
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        result = await async_db_util.run(query)
+
+        # The query may have been superseded just as it finished
+        if generation == self._generation:
+            self._task = None
+            on_result(result)
@@ -0,0 +1,38 @@
+"""This module contains a single class called TableCache which is used
+by the tabs in Orchestrator to skip table updates when the data hasn't changed."""
+
+import hashlib
+import json
+
+from nicegui import ui
+
+
+# pylint: disable-next=too-few-public-methods
+class TableCache():
+    """A TableCache remembers what was last sent to a table.
+    Rows are only sent to the browser when their hash differs from the last rows sent.
+    """
+    def __init__(self, table: ui.table):
+        """
+        Args:
+            table: The table to update.
+        """
+        self.table = table
+        self._rows_hash: str | None = None
+
+    def update(self, rows: list[dict]) -> bool:
+        """Update the table if the rows differ from the rows it shows.
+
+        Args:
+            rows: The new rows of the table.
+
+        Returns:
+            True if the rows were sent to the table.
+        """
+        rows_hash = hashlib.sha256(json.dumps(rows, sort_keys=True, default=str).encode()).hexdigest()
+        if rows_hash == self._rows_hash:
+            return False
+
+        self._rows_hash = rows_hash
+        self.table.update_rows(rows)
+        return True
@@ -3,10 +3,11 @@ in Orchestrator."""
 
 from nicegui import ui
 
-from OpenOrchestrator.database import db_util
+from OpenOrchestrator.database import async_db_util
 from OpenOrchestrator.orchestrator.popups.constant_popup import ConstantPopup
 from OpenOrchestrator.orchestrator.popups.credential_popup import CredentialPopup
-from OpenOrchestrator.orchestrator import test_helper
+from OpenOrchestrator.orchestrator import data_cache, test_helper
+from OpenOrchestrator.orchestrator.table_cache import TableCache
 
 CONSTANT_COLUMNS = ("Constant Name", "Value", "Last Changed")
 CREDENTIAL_COLUMNS = ("Credential Name", "Username", "Password", "Last Changed")
@@ -23,33 +24,33 @@ class ConstantTab():
             columns = [{'name': label, 'label': label, 'field': label, 'align': 'left', 'sortable': True} for label in CONSTANT_COLUMNS]
             self.constants_table = ui.table(title="Constants", columns=columns, rows=[], row_key='Constant Name', pagination=10).classes("w-full")
             self.constants_table.on('rowClick', self.row_click_constant)
+            self.constants_cache = TableCache(self.constants_table)
 
             columns = [{'name': label, 'label': label, 'field': label, 'align': 'left', 'sortable': True} for label in CREDENTIAL_COLUMNS]
             self.credentials_table = ui.table(title="Credentials", columns=columns, rows=[], row_key='Credential Name', pagination=10).classes("w-full")
             self.credentials_table.on('rowClick', self.row_click_credential)
+            self.credentials_cache = TableCache(self.credentials_table)
 
         test_helper.set_automation_ids(self, "constants_tab")
 
-    def row_click_constant(self, event):
+    async def row_click_constant(self, event):
         """Callback for when a row is clicked in the table."""
         row = event.args[1]
         name = row['Constant Name']
-        constant = db_util.get_constant(name)
+        constant = await async_db_util.get_constant(name)
         ConstantPopup(self, constant)
 
-    def row_click_credential(self, event):
+    async def row_click_credential(self, event):
         """Callback for when a row is clicked in the table."""
         row = event.args[1]
         name = row['Credential Name']
-        credential = db_util.get_credential(name, False)
+        credential = await async_db_util.get_credential(name, False)
         CredentialPopup(self, credential)
 
-    def update(self):
+    async def update(self):
         """Updates the tables on the tab."""
-        constants = db_util.get_constants()
-        self.constants_table.rows = [c.to_row_dict() for c in constants]
-        self.constants_table.update()
+        constants = await async_db_util.run(data_cache.get_constants)
+        self.constants_cache.update([c.to_row_dict() for c in constants])
 
-        credentials = db_util.get_credentials()
-        self.credentials_table.rows = [c.to_row_dict() for c in credentials]
-        self.credentials_table.update()
+        credentials = await async_db_util.run(data_cache.get_credentials)
+        self.credentials_cache.update([c.to_row_dict() for c in credentials])
@@ -3,10 +3,12 @@ in Orchestrator."""
 
 from nicegui import ui
 
-from OpenOrchestrator.database import db_util
+from OpenOrchestrator.database import async_db_util, db_util
 from OpenOrchestrator.database.logs import LogLevel
 from OpenOrchestrator.orchestrator.datetime_input import DatetimeInput
-from OpenOrchestrator.orchestrator import test_helper
+from OpenOrchestrator.orchestrator import data_cache, test_helper
+from OpenOrchestrator.orchestrator.query_runner import DEBOUNCE_DELAY, QueryRunner
+from OpenOrchestrator.orchestrator.table_cache import TableCache
 
 
 COLUMNS = [
@@ -24,39 +26,85 @@ class LoggingTab():
     def __init__(self, tab_name: str) -> None:
         with ui.tab_panel(tab_name):
             with ui.row():
-                self.from_input = DatetimeInput("From Date", on_change=self.update, allow_empty=True)
-                self.to_input = DatetimeInput("To Date", on_change=self.update, allow_empty=True)
-                self.process_input = ui.select(["All"], label="Process Name", value="All", on_change=self.update).classes("w-48")
-                self.level_input = ui.select(["All", "Trace", "Info", "Error"], value="All", label="Level", on_change=self.update).classes("w-48")
-                self.limit_input = ui.select([100, 200, 500, 1000], value=100, label="Limit", on_change=self.update).classes("w-24")
+                self.from_input = DatetimeInput("From Date", on_change=self._filters_changed, allow_empty=True)
+                self.to_input = DatetimeInput("To Date", on_change=self._filters_changed, allow_empty=True)
+                self.process_input = ui.select(["All"], label="Process Name", value="All", on_change=self._filter_selected).classes("w-48")
+                self.level_input = ui.select(["All", "Trace", "Info", "Error"], value="All", label="Level", on_change=self._filter_selected).classes("w-48")
+                self.limit_input = ui.select([100, 200, 500, 1000], value=100, label="Limit", on_change=self._filter_selected).classes("w-24")
 
             self.logs_table = ui.table(title="Logs", columns=COLUMNS, rows=[], row_key='ID', pagination=50).classes("w-full")
             self.logs_table.on("rowClick", self._row_click)
+            self.logs_cache = TableCache(self.logs_table)
+            self.query_runner = QueryRunner()
 
         test_helper.set_automation_ids(self, "logs_tab")
 
-    def update(self):
-        """Update the logs table and Process input list"""
-        self._update_table()
-        self._update_process_input()
+    async def update(self):
+        """Update the logs table and Process input list."""
+        filters = self._get_filters()
+        result = await async_db_util.run(self._load_logs, filters)
 
-    def _update_table(self):
-        """Update the table with logs from the database applying the filters."""
+        # Filter changes made while the logs were loaded are handled by the query runner
+        if filters == self._get_filters():
+            self._show_logs(result)
+
+    def _filters_changed(self, delay: float = DEBOUNCE_DELAY):
+        """Update the tab in the background when a filter has changed.
+
+        Args:
+            delay: The time in seconds to wait for further changes before querying the database.
+        """
+        filters = self._get_filters()
+        self.query_runner.submit(lambda: self._load_logs(filters), self._show_logs, delay=delay)
+
+    def _filter_selected(self):
+        """Update the tab in the background right away when a filter has been selected."""
+        self._filters_changed(delay=0)
+
+    def _get_filters(self) -> tuple:
+        """Get the values of the filter inputs.
+
+        Returns:
+            A tuple of the from date, to date, process name, log level and limit.
+        """
         from_date = self.from_input.get_datetime()
         to_date = self.to_input.get_datetime()
         process_name = self.process_input.value if self.process_input.value != 'All' else None
         level = LogLevel(self.level_input.value) if self.level_input.value != "All" else None
         limit = self.limit_input.value
+        return from_date, to_date, process_name, level, limit
+
+    def _load_logs(self, filters: tuple) -> tuple:
+        """Get the logs and process names from the database.
+        Doesn't touch the ui, so it can be run in a worker thread.
+
+        Args:
+            filters: The values of the filter inputs from _get_filters.
+
+        Returns:
+            A tuple of the rows of the logs table and the process names.
+        """
+        from_date, to_date, process_name, level, limit = filters
 
         logs = db_util.get_logs(0, limit=limit, from_date=from_date, to_date=to_date, log_level=level, process_name=process_name)
-        self.logs_table.rows = [log.to_row_dict() for log in logs]
-
-    def _update_process_input(self):
-        """Update the process input with names from the database."""
-        process_names = list(db_util.get_unique_log_process_names())
-        process_names.insert(0, "All")
-        self.process_input.options = process_names
-        self.process_input.update()
+        rows = [log.to_row_dict() for log in logs]
+        process_names = ["All", *data_cache.get_unique_log_process_names()]
+
+        return rows, process_names
+
+    def _show_logs(self, result: tuple):
+        """Show the result of _load_logs in the logs table and Process input list.
+
+        Args:
+            result: The result of _load_logs.
+        """
+        rows, process_names = result
+
+        self.logs_cache.update(rows)
+
+        if process_names != self.process_input.options:
+            self.process_input.options = process_names
+            self.process_input.update()
 
     def _row_click(self, event):
         """Display a dialog with info on the clicked log."""
@@ -2,10 +2,12 @@
 in Orchestrator."""
 from nicegui import ui
 
-from OpenOrchestrator.database import db_util
+from OpenOrchestrator.database import async_db_util, db_util
 from OpenOrchestrator.database.queues import QueueStatus
 from OpenOrchestrator.orchestrator.datetime_input import DatetimeInput
-from OpenOrchestrator.orchestrator import test_helper
+from OpenOrchestrator.orchestrator import data_cache, test_helper
+from OpenOrchestrator.orchestrator.query_runner import DEBOUNCE_DELAY, QueryRunner
+from OpenOrchestrator.orchestrator.table_cache import TableCache
 from OpenOrchestrator.orchestrator.popups.queue_element_popup import QueueElementPopup
 
 
@@ -38,11 +40,12 @@ class QueueTab():
         with ui.tab_panel(tab_name):
             self.queue_table = ui.table(title="Queues", columns=QUEUE_COLUMNS, rows=[], row_key='Queue Name', pagination={'rowsPerPage': 50, 'sortBy': 'Queue Name'}).classes("w-full")
             self.queue_table.on("rowClick", self._row_click)
+            self.queue_cache = TableCache(self.queue_table)
         test_helper.set_automation_ids(self, "queues_tab")
 
-    def update(self):
+    async def update(self):
         """Update the queue table with data from the database."""
-        queue_count = db_util.get_queue_count()
+        queue_count = await async_db_util.run(data_cache.get_queue_count)
 
         # Convert queue count to row elements
         rows = []
@@ -57,7 +60,7 @@ class QueueTab():
             }
             rows.append(row)
 
-        self.queue_table.update_rows(rows)
+        self.queue_cache.update(rows)
 
     def _row_click(self, event):
         row = event.args[1]
@@ -76,22 +79,30 @@ class QueuePopup():
         self.rows_per_page = 25
         self.queue_count = 100
 
+        # Cursors pointing at the last element of each visited page and the filters they were made with
+        self._cursors: dict[int, tuple] = {}
+        self._cursor_key: tuple | None = None
+
+        # The filters the current count was made with
+        self._count_key: tuple | None = None
+        self.query_runner = QueryRunner()
+
         with ui.dialog(value=True).props('full-width full-height') as dialog, ui.card():
             with ui.row().classes("w-full"):
-                self.search_input = ui.input(label='Search', placeholder="Ref, message or data", on_change=self._update).style('margin-left: 1rem')
+                self.search_input = ui.input(label='Search', placeholder="Ref, message or data", on_change=self._filters_changed).style('margin-left: 1rem')
                 self.status_select = ui.select(
                     options= {'All': 'All'} | {status.name: status.value for status in QueueStatus},
                     label="Status",
                     value="All",
                     on_change=self._update).classes("w-24")
-                self.from_input = DatetimeInput("From Date", on_change=self._update, allow_empty=True)
-                self.to_input = DatetimeInput("To Date", on_change=self._update, allow_empty=True)
+                self.from_input = DatetimeInput("From Date", on_change=self._filters_changed, allow_empty=True)
+                self.to_input = DatetimeInput("To Date", on_change=self._filters_changed, allow_empty=True)
 
                 ui.space()
 
                 ui.switch("Dense", on_change=lambda e: self._dense_table(e.value))
                 self._create_column_filter()
-                ui.button(icon='refresh', on_click=self._update)
+                ui.button(icon='refresh', on_click=self._refresh)
                 self.close_button = ui.button(icon="close", on_click=dialog.close)
             with ui.scroll_area().classes("h-full"):
                 self.table = ui.table(columns=ELEMENT_COLUMNS, rows=[], row_key='ID', title=queue_name, pagination={'rowsPerPage': self.rows_per_page, 'rowsNumber': self.queue_count}).classes("w-full sticky-header h-[calc(100vh-200px)] overflow-auto")
@@ -120,8 +131,23 @@ class QueuePopup():
                 for column in ELEMENT_COLUMNS:
                     ui.switch(column['label'], value=True, on_change=lambda e, column=column: toggle(column, e.value))
 
-    def _update(self):
-        """Update the table with values from the database."""
+    def _refresh(self):
+        """Update the table and recount the elements."""
+        self._count_key = None
+        self._update()
+
+    def _filters_changed(self):
+        """Update the table in the background when a filter has changed."""
+        self._update(delay=DEBOUNCE_DELAY)
+
+    def _update(self, delay: float = 0):
+        """Update the table with values from the database.
+        Pages following a visited page are found with a cursor instead of an offset,
+        and the element count is only recounted when the filters change.
+
+        Args:
+            delay: The time in seconds to wait before querying the database.
+        """
         search_input = self.search_input.value.strip()
         if len(search_input) == 0:
             search_input = None
@@ -132,10 +158,38 @@ class QueuePopup():
         offset = (self.page - 1) * self.rows_per_page
         order_by = str(self.order_by).lower().replace(" ", "_")
 
-        queue_elements, queue_count = db_util.get_queue_elements(self.queue_name, status=status, limit=self.rows_per_page, from_date=from_date, to_date=to_date, order_by=order_by, order_desc=self.order_descending, offset=offset, search_term=search_input, include_count=True)
-        self._update_pagination(queue_count)
-        rows = [element.to_row_dict() for element in queue_elements]
-        self.table.update_rows(rows)
+        count_key = (search_input, status, from_date, to_date)
+        cursor_key = (count_key, order_by, self.order_descending, self.rows_per_page)
+        if cursor_key != self._cursor_key:
+            self._cursors.clear()
+            self._cursor_key = cursor_key
+
+        after = self._cursors.get(self.page - 1)
+        if after is not None:
+            offset = 0
+
+        include_count = count_key != self._count_key
+
+        def load() -> tuple[list[dict], int | None, tuple | None]:
+            result = db_util.get_queue_elements(self.queue_name, status=status, limit=self.rows_per_page, from_date=from_date, to_date=to_date, order_by=order_by, order_desc=self.order_descending, offset=offset, search_term=search_input, include_count=include_count, after=after)
+            queue_elements, queue_count = result if include_count else (result, None)
+            cursor = db_util.get_queue_element_cursor(queue_elements[-1], order_by) if queue_elements else None
+            return [element.to_row_dict() for element in queue_elements], queue_count, cursor
+
+        def show(result: tuple[list[dict], int | None, tuple | None]):
+            rows, queue_count, cursor = result
+            if queue_count is not None:
+                self._count_key = count_key
+            else:
+                queue_count = self.queue_count
+
+            if cursor is not None:
+                self._cursors[self.page] = cursor
+
+            self._update_pagination(queue_count)
+            self.table.update_rows(rows)
+
+        self.query_runner.submit(load, show, delay=delay)
 
     def _on_table_request(self, e):
         """Called when updating table pagination and sorting, to handle these manually and allow for server side pagination.
@@ -3,8 +3,9 @@ in Orchestrator."""
 
 from nicegui import ui
 
-from OpenOrchestrator.database import db_util
-from OpenOrchestrator.orchestrator import test_helper
+from OpenOrchestrator.database import async_db_util
+from OpenOrchestrator.orchestrator import data_cache, test_helper
+from OpenOrchestrator.orchestrator.table_cache import TableCache
 
 COLUMNS = [
     {'name': "machine_name", 'label': "Machine Name", 'field': "Machine Name", 'align': 'left', 'sortable': True},
@@ -19,14 +20,14 @@ class SchedulerTab():
     def __init__(self, tab_name: str) -> None:
         with ui.tab_panel(tab_name):
             self.schedulers_table = ui.table(title="Schedulers", columns=COLUMNS, rows=[], row_key='Machine Name', pagination=50).classes("w-full")
+            self.schedulers_cache = TableCache(self.schedulers_table)
             self.add_column_colors()
         test_helper.set_automation_ids(self, "schedulers_tab")
 
-    def update(self):
+    async def update(self):
         """Updates the tables on the tab."""
-        schedulers = db_util.get_schedulers()
-        self.schedulers_table.rows = [s.to_row_dict() for s in schedulers]
-        self.schedulers_table.update()
+        schedulers = await async_db_util.run(data_cache.get_schedulers)
+        self.schedulers_cache.update([s.to_row_dict() for s in schedulers])
 
     def add_column_colors(self):
         """Add red coloring to the scheduler if more than a minute has passed since last ping."""
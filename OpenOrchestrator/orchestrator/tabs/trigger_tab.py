@@ -3,10 +3,11 @@ in Orchestrator."""
 
 from nicegui import ui
 
-from OpenOrchestrator.database import db_util
+from OpenOrchestrator.database import async_db_util
 from OpenOrchestrator.database.triggers import SingleTrigger, ScheduledTrigger, QueueTrigger, TriggerType
 from OpenOrchestrator.orchestrator.popups.trigger_popup import TriggerPopup
-from OpenOrchestrator.orchestrator import test_helper
+from OpenOrchestrator.orchestrator import data_cache, test_helper
+from OpenOrchestrator.orchestrator.table_cache import TableCache
 
 COLUMNS = [
     {'name': "Trigger Name", 'label': "Trigger Name", 'field': "Trigger Name", 'align': 'left', 'sortable': True},
@@ -32,15 +33,16 @@ class TriggerTab():
 
             self.trigger_table = ui.table(columns=COLUMNS, rows=[], title="Triggers", pagination={'rowsPerPage': 50, 'sortBy': 'Trigger Name'}, row_key='ID').classes("w-full")
             self.trigger_table.on('rowClick', self._row_click)
+            self.trigger_cache = TableCache(self.trigger_table)
             self.add_column_colors()
 
         test_helper.set_automation_ids(self, "trigger_tab")
 
-    def _row_click(self, event):
+    async def _row_click(self, event):
         """Callback for when a row is clicked in the table."""
         row = event.args[1]
         trigger_id = row["ID"]
-        trigger = db_util.get_trigger(trigger_id)
+        trigger = await async_db_util.get_trigger(trigger_id)
 
         if isinstance(trigger, SingleTrigger):
             TriggerPopup(self, TriggerType.SINGLE, trigger)
@@ -49,11 +51,10 @@ class TriggerTab():
         elif isinstance(trigger, QueueTrigger):
             TriggerPopup(self, TriggerType.QUEUE, trigger)
 
-    def update(self):
+    async def update(self):
         """Updates the tab and it's data."""
-        triggers = db_util.get_all_triggers()
-        self.trigger_table.rows = [t.to_row_dict() for t in triggers]
-        self.trigger_table.update()
+        triggers = await async_db_util.run(data_cache.get_all_triggers)
+        self.trigger_cache.update([t.to_row_dict() for t in triggers])
 
     def add_column_colors(self):
         """Add custom coloring to the trigger table."""
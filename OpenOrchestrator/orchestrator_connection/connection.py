@@ -11,6 +11,7 @@ from OpenOrchestrator.database.queues import QueueElement, QueueStatus
 from OpenOrchestrator.database.logs import LogLevel
 from OpenOrchestrator.database.constants import Constant, Credential
 from OpenOrchestrator.database.triggers import TriggerStatus
+from OpenOrchestrator.orchestrator_connection.log_buffer import LogBuffer
 
 
 class OrchestratorConnection:
@@ -20,7 +21,8 @@ class OrchestratorConnection:
     to instead of initializing the object manually.
     """
 
-    def __init__(self, process_name: str, connection_string: str, crypto_key: str, process_arguments: str, trigger_id: str):
+    def __init__(self, process_name: str, connection_string: str, crypto_key: str, process_arguments: str, trigger_id: str,
+                 buffer_logs: bool = False):
         """
         Args:
             process_name: A human friendly tag to identify the process.
@@ -28,12 +30,15 @@ class OrchestratorConnection:
             crypto_key: Secret key for decrypting database content.
             process_arguments (optional): Arguments for the controlling how the process should run.
             trigger_id: ID of trigger used to start this process.
+            buffer_logs (optional): If true trace and info logs are written to the database in batches
+                on a background thread. Error logs are always written immediately.
         """
         self.process_name = process_name
         self.process_arguments = process_arguments
         self.trigger_id = trigger_id
         crypto_util.set_key(crypto_key)
         db_util.connect(connection_string)
+        self._log_buffer = LogBuffer() if buffer_logs else None
 
     def __repr__(self):
         return f"OrchestratorConnection - Process name: {self.process_name}"
@@ -44,7 +49,7 @@ class OrchestratorConnection:
         Args:
             message: Message to be logged.
         """
-        db_util.create_log(self.process_name, LogLevel.TRACE, message)
+        self._log(LogLevel.TRACE, message)
 
     def log_info(self, message: str) -> None:
         """Create a message in the Orchestrator log with a level of 'info'.
@@ -52,7 +57,7 @@ class OrchestratorConnection:
         Args:
             message: Message to be logged.
         """
-        db_util.create_log(self.process_name, LogLevel.INFO, message)
+        self._log(LogLevel.INFO, message)
 
     def log_error(self, message: str) -> None:
         """Create a message in the Orchestrator log with a level of 'error'.
@@ -60,7 +65,26 @@ class OrchestratorConnection:
         Args:
             message: Message to be logged.
         """
-        db_util.create_log(self.process_name, LogLevel.ERROR, message)
+        self._log(LogLevel.ERROR, message)
+
+    def flush_logs(self) -> None:
+        """Write any buffered logs to the database.
+        This does nothing if the connection doesn't buffer logs.
+        """
+        if self._log_buffer:
+            self._log_buffer.flush()
+
+    def _log(self, level: LogLevel, message: str) -> None:
+        """Create a log either directly or through the log buffer.
+
+        Args:
+            level: The level of the log.
+            message: Message to be logged.
+        """
+        if self._log_buffer:
+            self._log_buffer.add(self.process_name, level, message)
+        else:
+            db_util.create_log(self.process_name, level, message)
 
     def get_constant(self, constant_name: str) -> Constant:
         """Get a constant from the database.
@@ -155,6 +179,23 @@ class OrchestratorConnection:
         """
         return db_util.get_next_queue_element(queue_name, reference, set_status)
 
+    def get_next_queue_elements(self, queue_name: str, n: int, reference: str | None = None) -> tuple[QueueElement, ...]:
+        """Claim up to n queue elements with the status 'new' from the given queue.
+        The elements' statuses are set to 'in progress' and their start times are noted.
+
+        Args:
+            queue_name: The name of the queue to retrieve from.
+            n: The maximum number of queue elements to claim.
+            reference (optional): The reference to filter on. If None the filter is disabled.
+
+        Returns:
+            tuple[QueueElement]: The claimed queue elements ordered by created_date.
+
+        Raises:
+            ValueError: If n is less than 1.
+        """
+        return db_util.get_next_queue_elements(queue_name, n, reference)
+
     def get_queue_elements(self, queue_name: str, reference: str | None = None, status: QueueStatus | None = None,
                            offset: int = 0, limit: int = 100, from_date: datetime | None = None, to_date: datetime | None = None) -> tuple[QueueElement, ...]:
         """Get multiple queue elements from a queue. The elements are ordered by created_date.
@@ -183,6 +224,18 @@ class OrchestratorConnection:
         """
         db_util.set_queue_element_status(element_id, status, message)
 
+    def bulk_set_queue_element_status(self, updates: list[tuple[str, QueueStatus, str | None]]) -> None:
+        """Set the status of multiple queue elements in a single transaction.
+        The start date and end date are noted the same way as in set_queue_element_status.
+
+        Args:
+            updates: A list of (element_id, status, message) tuples. A message of None leaves any existing message untouched.
+
+        Raises:
+            ValueError: If any of the queue elements doesn't exist. No elements are updated in this case.
+        """
+        db_util.bulk_set_queue_element_status(updates)
+
     def delete_queue_element(self, element_id: str) -> None:
         """Delete a queue element from the database.
 
@@ -205,12 +258,16 @@ class OrchestratorConnection:
         db_util.set_trigger_status(self.trigger_id, TriggerStatus.PAUSING)
 
     @classmethod
-    def create_connection_from_args(cls):
+    def create_connection_from_args(cls, buffer_logs: bool = False):
         """Create a Connection object using the arguments passed to sys.argv.
-        This function is the preferred way to create a connection with OpenOrchestrator's Scheduler"""
+        This function is the preferred way to create a connection with OpenOrchestrator's Scheduler
+
+        Args:
+            buffer_logs (optional): If true trace and info logs are written to the database in batches.
+        """
         process_name = sys.argv[1]
         connection_string = sys.argv[2]
         crypto_key = sys.argv[3]
         process_arguments = sys.argv[4]
         trigger_id = sys.argv[5]
-        return OrchestratorConnection(process_name, connection_string, crypto_key, process_arguments, trigger_id)
+        return OrchestratorConnection(process_name, connection_string, crypto_key, process_arguments, trigger_id, buffer_logs=buffer_logs)
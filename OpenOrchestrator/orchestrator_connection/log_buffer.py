@@ -0,0 +1,100 @@
+"""This module contains a single class called LogBuffer which is used
+by OrchestratorConnection to write logs to the database in batches."""
+
+import atexit
+from datetime import datetime
+import sys
+import threading
+
+from OpenOrchestrator.database import db_util
+from OpenOrchestrator.database.logs import LogLevel
+
+
+# pylint: disable-next=too-many-instance-attributes
+class LogBuffer:
+    """A LogBuffer collects logs in memory and writes them to the database
+    in batches on a background thread. A batch is written when the flush interval
+    has passed or when max_records logs are waiting, whichever comes first.
+    Error logs are written immediately together with any waiting logs.
+    Remaining logs are written when the buffer is closed or the interpreter exits.
+    """
+
+    def __init__(self, flush_interval: float = 0.5, max_records: int = 100):
+        """
+        Args:
+            flush_interval: The maximum number of seconds a log waits before being written.
+            max_records: The number of waiting logs that triggers a write.
+        """
+        self.flush_interval = flush_interval
+        self.max_records = max_records
+
+        self._records: list[tuple[str, LogLevel, str, datetime]] = []
+        self._records_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="OpenOrchestrator-LogBuffer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, process_name: str, level: LogLevel, message: str) -> None:
+        """Add a log to the buffer. The log time is noted immediately.
+
+        Args:
+            process_name: The name of the process generating the log.
+            level: The level of the log.
+            message: The message of the log.
+
+        Raises:
+            RuntimeError: If the buffer has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("Can't add logs to a closed log buffer.")
+
+        with self._records_lock:
+            self._records.append((process_name, level, message, datetime.now()))
+            is_full = len(self._records) >= self.max_records
+
+        if level == LogLevel.ERROR:
+            self.flush()
+        elif is_full:
+            self._wake_event.set()
+
+    def flush(self) -> None:
+        """Write all waiting logs to the database.
+        If the write fails the logs are kept in the buffer and the error is raised.
+        """
+        with self._flush_lock:
+            with self._records_lock:
+                records, self._records = self._records, []
+
+            try:
+                db_util.bulk_create_logs(records)
+            except Exception:
+                with self._records_lock:
+                    self._records[:0] = records
+                raise
+
+    def close(self) -> None:
+        """Stop the background thread and write all waiting logs to the database."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._wake_event.set()
+        self._thread.join()
+        atexit.unregister(self.close)
+        self.flush()
+
+    def _run(self) -> None:
+        """The loop of the background thread."""
+        while not self._closed:
+            self._wake_event.wait(self.flush_interval)
+            self._wake_event.clear()
+
+            # Keep the thread alive and retry on the next flush
+            try:
+                self.flush()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                print(f"Couldn't write logs to the database: {exc}", file=sys.stderr)
@@ -1,6 +1,7 @@
 """This module is the entry point for the Scheduler app. It contains a single class
 that when created starts the application."""
 
+import os
 import tkinter
 from tkinter import ttk, messagebox
 
@@ -11,12 +12,21 @@ class Application(tkinter.Tk):
     """The main application object of the Scheduler app.
     Extends the tkinter.Tk object.
     """
-    def __init__(self):
+    def __init__(self, slots: int | None = None):
+        """Create and start the Scheduler application.
+
+        Args:
+            slots: The number of job slots available for running triggers. Defaults to the number of CPUs.
+        """
         # Disable pylint duplicate code error since it
         # mostly reacts to the layout code being similar.
         # pylint: disable=R0801
         self.running_jobs = []
         self.running = False
+        self.loop_after_id: str | None = None
+        self.watch_after_id: str | None = None
+        self.poll_interval = run_tab.MIN_POLL_INTERVAL
+        self.slots = slots or os.cpu_count() or 1
 
         super().__init__()
         self.title("OpenOrchestrator - Scheduler")
@@ -39,6 +49,11 @@ class Application(tkinter.Tk):
 
         self.mainloop()
 
+    @property
+    def is_exclusive(self) -> bool:
+        """Whether the Scheduler should only run triggers that whitelist it."""
+        return self.settings_tab_.whitelist_value.get()
+
     def on_close(self):
         """Checks whether any jobs are still running and prompts the user before closing."""
         if (len(self.running_jobs) == 0
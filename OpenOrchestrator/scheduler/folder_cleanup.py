@@ -0,0 +1,104 @@
+"""This module is responsible for removing folders on a background thread,
+so the Scheduler never waits for the disk when a job ends."""
+
+import queue
+import threading
+import time
+
+from OpenOrchestrator.scheduler import util
+
+# The time in seconds to wait before each retry of a failed removal.
+# Files are often still locked for a moment after a process has exited.
+RETRY_DELAYS = (0.5, 1, 2, 5)
+
+_queue: queue.Queue[str] = queue.Queue()
+_pending: set[str] = set()
+_lock = threading.Lock()
+_thread: threading.Thread | None = None
+
+# Results since the last report
+_reclaimed_bytes = 0
+_failed_folders: list[str] = []
+
+
+def remove_folder_async(folder_path: str) -> None:
+    """Queue a folder to be removed on the background thread.
+    Folders already waiting to be removed are ignored.
+
+    Args:
+        folder_path: The path of the folder to remove.
+    """
+    global _thread  # pylint: disable=global-statement
+
+    with _lock:
+        if folder_path in _pending:
+            return
+
+        _pending.add(folder_path)
+
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_work, daemon=True, name="FolderCleanup")
+            _thread.start()
+
+    _queue.put(folder_path)
+
+
+def wait_for_cleanup() -> None:
+    """Block until all queued folders have been handled."""
+    _queue.join()
+
+
+def pop_report() -> tuple[int, list[str]]:
+    """Get the results of the removals since the last report.
+
+    Returns:
+        The number of bytes reclaimed and the folders that couldn't be removed.
+    """
+    global _reclaimed_bytes, _failed_folders  # pylint: disable=global-statement
+
+    with _lock:
+        report = (_reclaimed_bytes, _failed_folders)
+        _reclaimed_bytes = 0
+        _failed_folders = []
+
+    return report
+
+
+def _work() -> None:
+    """Remove queued folders forever."""
+    while True:
+        folder_path = _queue.get()
+
+        try:
+            _remove_with_retries(folder_path)
+        finally:
+            with _lock:
+                _pending.discard(folder_path)
+            _queue.task_done()
+
+
+def _remove_with_retries(folder_path: str) -> None:
+    """Remove a folder and note the result.
+    If the removal fails it is retried after each of the retry delays.
+
+    Args:
+        folder_path: The path of the folder to remove.
+    """
+    global _reclaimed_bytes  # pylint: disable=global-statement
+
+    size = util.get_folder_size(folder_path)
+
+    for delay in (*RETRY_DELAYS, None):
+        try:
+            util.remove_folder(folder_path)
+        except OSError:
+            if delay is not None:
+                time.sleep(delay)
+            continue
+
+        with _lock:
+            _reclaimed_bytes += size
+        return
+
+    with _lock:
+        _failed_folders.append(folder_path)
@@ -0,0 +1,99 @@
+"""This module is responsible for keeping a local cache of bare mirrors of git repos,
+so cloning a repo for a process only needs an incremental fetch over the network."""
+
+import hashlib
+import os
+import subprocess
+import time
+import uuid
+
+from OpenOrchestrator.scheduler import util
+
+# The limits of the cache. Mirrors are evicted when they haven't been used
+# for longer than the max age or when the cache grows above the max size.
+CACHE_MAX_BYTES = 5_000_000_000
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+# The minimum time in seconds between checks for mirrors to evict.
+EVICTION_INTERVAL = 60 * 60
+
+_last_eviction = 0.0
+
+
+def get_cache_folder_path() -> str:
+    """Gets the path to the folder where git mirrors are cached.
+
+    Returns:
+        str: The absolute path to the cache folder.
+    """
+    user_path = os.path.expanduser("~")
+    return os.path.join(user_path, "Desktop", "Scheduler_Repo_Cache")
+
+
+def get_mirror_path(repo_url: str) -> str:
+    """Get the path of the cached mirror of the given repo.
+
+    Args:
+        repo_url: The URL of the git repo.
+
+    Returns:
+        The absolute path to the mirror.
+    """
+    url_hash = hashlib.sha256(repo_url.encode()).hexdigest()[:16]
+    return os.path.join(get_cache_folder_path(), f"{url_hash}.git")
+
+
+def update_mirror(repo_url: str) -> str:
+    """Create or update the cached mirror of the given repo.
+    A new mirror is cloned in full, an existing one is updated with an incremental fetch.
+
+    Args:
+        repo_url: The URL of the git repo.
+
+    Returns:
+        The absolute path to the up to date mirror.
+
+    Raises:
+        subprocess.CalledProcessError: If git failed to clone or fetch the repo.
+    """
+    mirror_path = get_mirror_path(repo_url)
+
+    if os.path.isdir(mirror_path):
+        subprocess.run(['git', '--git-dir', mirror_path, 'fetch', '--prune', '--quiet', 'origin'], check=True)
+    else:
+        # Clone to a temporary folder so a failed clone never leaves a broken mirror
+        os.makedirs(get_cache_folder_path(), exist_ok=True)
+        temp_path = f"{mirror_path}.{uuid.uuid4()}.tmp"
+
+        try:
+            subprocess.run(['git', 'clone', '--mirror', '--quiet', repo_url, temp_path], check=True)
+        except subprocess.CalledProcessError:
+            util.remove_folder(temp_path)
+            raise
+
+        os.rename(temp_path, mirror_path)
+
+    # Mark the mirror as recently used
+    os.utime(mirror_path)
+    return mirror_path
+
+
+def evict_mirrors(max_bytes: int = CACHE_MAX_BYTES, max_age: float = CACHE_MAX_AGE, force: bool = False) -> None:
+    """Remove mirrors that haven't been used within the max age and then remove the
+    least recently used mirrors until the cache is below the max size.
+    Should only be called when no processes are being cloned.
+
+    Args:
+        max_bytes: The maximum total size of the cache in bytes.
+        max_age: The maximum time in seconds since a mirror was last used.
+        force: Whether to check the cache even if it was checked within the eviction interval.
+    """
+    global _last_eviction  # pylint: disable=global-statement
+
+    if not force and time.time() - _last_eviction < EVICTION_INTERVAL:
+        return
+
+    _last_eviction = time.time()
+
+    # Leftover temporary folders from failed clones are always removed
+    util.evict_least_recently_used(get_cache_folder_path(), max_bytes, max_age, lambda path: not path.endswith(".tmp"))
@@ -0,0 +1,187 @@
+"""This module runs the Scheduler without a graphical interface.
+The Scheduler loop from the run tab is driven by a small event loop
+and all output is written to a log instead of a text widget."""
+
+from contextlib import redirect_stdout
+import heapq
+import io
+import itertools
+import logging
+from logging.handlers import RotatingFileHandler
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable
+
+from OpenOrchestrator.common import crypto_util
+from OpenOrchestrator.database import db_util
+from OpenOrchestrator.scheduler import run_tab, util, warm_worker
+
+
+logger = logging.getLogger("OpenOrchestrator.scheduler")
+
+
+# pylint: disable-next=too-many-instance-attributes
+class HeadlessApplication():
+    """A replacement for the Scheduler Application object without tkinter.
+    Implements the parts of the tkinter event loop used by the Scheduler loop.
+    """
+    def __init__(self, is_exclusive: bool = False, slots: int | None = None):
+        self.running_jobs = []
+        self.running = False
+        self.loop_after_id: str | None = None
+        self.watch_after_id: str | None = None
+        self.poll_interval = run_tab.MIN_POLL_INTERVAL
+        self.is_exclusive = is_exclusive
+        self.slots = slots or os.cpu_count() or 1
+
+        self._events: list[tuple[float, int, str]] = []
+        self._callbacks: dict[str, tuple[Callable, tuple[Any, ...]]] = {}
+        self._counter = itertools.count()
+        self._wake_event = threading.Event()
+        self._stop_requested = False
+
+    def after(self, ms: int, func: Callable, *args) -> str:
+        """Schedule a function to be called after the given time.
+
+        Args:
+            ms: The time to wait in milliseconds.
+            func: The function to call.
+            args: The arguments to call the function with.
+
+        Returns:
+            An id that can be used to cancel the call.
+        """
+        number = next(self._counter)
+        after_id = f"after#{number}"
+        heapq.heappush(self._events, (time.monotonic() + ms / 1000, number, after_id))
+        self._callbacks[after_id] = (func, args)
+        return after_id
+
+    def after_cancel(self, after_id: str) -> None:
+        """Cancel a call scheduled with 'after'.
+
+        Args:
+            after_id: The id returned by 'after'.
+        """
+        self._callbacks.pop(after_id, None)
+
+    def start(self) -> None:
+        """Start the Scheduler loop."""
+        print("Running...")
+        self.running = True
+        run_tab.schedule_loop(self, 0)
+
+    def request_stop(self, *_) -> None:
+        """Ask the Scheduler to stop. Running processes are allowed to finish first.
+        Safe to call from a signal handler.
+        """
+        self._stop_requested = True
+        self._wake_event.set()
+
+    def mainloop(self) -> None:
+        """Run scheduled calls until there are none left."""
+        while self._callbacks:
+            if self._stop_requested:
+                self._stop_requested = False
+                if self.running:
+                    print("Stopping... Waiting for all processes to stop.")
+                    self.running = False
+                    run_tab.schedule_loop(self, 0)
+
+            due_time, _, after_id = self._events[0]
+
+            if after_id not in self._callbacks:
+                heapq.heappop(self._events)
+                continue
+
+            delay = due_time - time.monotonic()
+            if delay > 0:
+                self._wake_event.wait(delay)
+                self._wake_event.clear()
+                continue
+
+            heapq.heappop(self._events)
+            func, args = self._callbacks.pop(after_id)
+            func(*args)
+
+
+class _LogStream(io.TextIOBase):
+    """A text stream that writes each line to a logger."""
+    def __init__(self, target: logging.Logger):
+        self._target = target
+        self._buffer = ""
+
+    def write(self, s: str) -> int:
+        self._buffer += s
+        *lines, self._buffer = self._buffer.split("\n")
+
+        for line in lines:
+            if line.strip():
+                self._target.info(line.strip())
+
+        return len(s)
+
+
+def setup_logging(log_file: str | None, max_bytes: int, backup_count: int) -> None:
+    """Configure the Scheduler logger.
+
+    Args:
+        log_file: The path of the log file. If None the log is written to stderr.
+        max_bytes: The size in bytes at which the log file is rotated.
+        backup_count: The number of rotated log files to keep.
+    """
+    if log_file:
+        handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    else:
+        handler = logging.StreamHandler()
+
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def run(conn_string: str | None, is_exclusive: bool, slots: int | None = None) -> None:
+    """Connect to the database and run the Scheduler until it's stopped by SIGINT or SIGTERM.
+    The encryption key is read from the environment variable 'OpenOrchestratorKey'.
+
+    Args:
+        conn_string: The connection string to the database.
+            If None the environment variable 'OpenOrchestratorConnString' is used.
+        is_exclusive: Whether only triggers that whitelist this Scheduler should be run.
+        slots: The number of job slots available for running triggers. Defaults to the number of CPUs.
+
+    Raises:
+        ValueError: If the connection string or encryption key is missing or invalid.
+    """
+    conn_string = conn_string or os.environ.get('OpenOrchestratorConnString', None)
+    crypto_key = os.environ.get('OpenOrchestratorKey', None)
+
+    if not conn_string:
+        raise ValueError("No connection string given. Use the argument or the environment variable 'OpenOrchestratorConnString'.")
+
+    if not crypto_key or not crypto_util.validate_key(crypto_key):
+        raise ValueError("The environment variable 'OpenOrchestratorKey' doesn't contain a valid encryption key.")
+
+    if not db_util.connect(conn_string):
+        raise ValueError("Couldn't connect to the database.")
+
+    crypto_util.set_key(crypto_key)
+    warm_worker.fill_pool()
+
+    app = HeadlessApplication(is_exclusive, slots)
+
+    signal.signal(signal.SIGINT, app.request_stop)
+    signal.signal(signal.SIGTERM, app.request_stop)
+
+    with redirect_stdout(_LogStream(logger)):
+        print(f"Scheduler '{util.get_scheduler_name()}' started in headless mode.")
+
+        if not db_util.check_database_revision():
+            logger.warning("This version of Scheduler doesn't match the version of the connected database. Unexpected errors might occur.")
+
+        app.start()
+        app.mainloop()
+
+        print("Scheduler stopped.")
@@ -0,0 +1,149 @@
+"""This module is responsible for reading the output of running processes.
+Each output pipe is read by its own thread, so a process never blocks on a full pipe,
+and only the tail of the output is kept in memory."""
+
+from collections import deque
+import subprocess
+import threading
+from typing import IO
+
+from OpenOrchestrator.database.logs import LogLevel
+from OpenOrchestrator.orchestrator_connection.log_buffer import LogBuffer
+
+# The maximum number of characters read from a pipe at a time.
+CHUNK_SIZE = 8192
+
+# The maximum number of characters kept of each output stream.
+TAIL_MAX_CHARS = 64_000
+
+# The time in seconds to wait for the output to be read after a process has ended.
+# Child processes of the process can keep the pipes open after it has ended.
+READ_TIMEOUT = 1
+
+_forward_logs = False
+
+
+def set_log_forwarding(enabled: bool) -> None:
+    """Set whether the output of processes should be written to the Logs table.
+    Should be set before any processes or warm workers are started.
+
+    Args:
+        enabled: Whether to forward the output.
+    """
+    global _forward_logs  # pylint: disable=global-statement
+    _forward_logs = enabled
+
+
+def is_forwarding_logs() -> bool:
+    """Check whether the output of processes is written to the Logs table.
+    When it is, stdout of processes is captured as well as stderr.
+
+    Returns:
+        Whether the output is forwarded.
+    """
+    return _forward_logs
+
+
+class _Tail:
+    """A ring buffer keeping the last characters written to it."""
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.is_truncated = False
+        self._chunks: deque[str] = deque()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def add(self, text: str) -> None:
+        """Add text to the end of the buffer and drop text from the start if it's full.
+
+        Args:
+            text: The text to add.
+        """
+        with self._lock:
+            if len(text) > self.max_chars:
+                text = text[-self.max_chars:]
+                self.is_truncated = True
+
+            self._chunks.append(text)
+            self._size += len(text)
+
+            while self._size > self.max_chars:
+                self._size -= len(self._chunks.popleft())
+                self.is_truncated = True
+
+    def get(self) -> str:
+        """Get the content of the buffer.
+
+        Returns:
+            The text in the buffer.
+        """
+        with self._lock:
+            return "".join(self._chunks)
+
+
+class OutputCapture:
+    """Reads stdout and stderr of a process on background threads.
+    The tail of each stream is kept and the lines can be forwarded to the Logs table in batches.
+    """
+    def __init__(self, process: subprocess.Popen, process_name: str, forward_logs: bool | None = None, max_chars: int = TAIL_MAX_CHARS):
+        """
+        Args:
+            process: The process to read the output of. Streams that aren't pipes are ignored.
+            process_name: The name of the process used for forwarded logs.
+            forward_logs: Whether to forward the output to the Logs table. Defaults to the module setting.
+            max_chars: The maximum number of characters kept of each stream.
+        """
+        self.process_name = process_name
+        self.stdout_tail = _Tail(max_chars)
+        self.stderr_tail = _Tail(max_chars)
+
+        if forward_logs is None:
+            forward_logs = _forward_logs
+        self._log_buffer = LogBuffer() if forward_logs else None
+
+        self._threads: list[threading.Thread] = []
+        for pipe, tail in ((process.stdout, self.stdout_tail), (process.stderr, self.stderr_tail)):
+            if pipe is not None:
+                thread = threading.Thread(target=self._read, args=(pipe, tail), daemon=True, name="OutputCapture")
+                thread.start()
+                self._threads.append(thread)
+
+    def close(self, timeout: float = READ_TIMEOUT) -> None:
+        """Wait for the output to be read and write any forwarded logs.
+
+        Args:
+            timeout: The maximum time in seconds to wait for each stream.
+        """
+        for thread in self._threads:
+            thread.join(timeout)
+
+        if self._log_buffer:
+            self._log_buffer.close()
+
+    def get_error(self) -> str:
+        """Get the tail of the process's stderr.
+
+        Returns:
+            The last output on stderr, starting with '...' if older output has been dropped.
+        """
+        error = self.stderr_tail.get()
+        return f"...{error}" if self.stderr_tail.is_truncated else error
+
+    def _read(self, pipe: IO[str], tail: _Tail) -> None:
+        """Read a pipe in chunks until it's closed.
+
+        Args:
+            pipe: The pipe to read.
+            tail: The buffer to keep the output in.
+        """
+        with pipe:
+            for chunk in iter(lambda: pipe.readline(CHUNK_SIZE), ""):
+                tail.add(chunk)
+
+                line = chunk.rstrip()
+                if self._log_buffer and line:
+                    try:
+                        self._log_buffer.add(self.process_name, LogLevel.TRACE, line)
+                    except RuntimeError:
+                        # The capture was closed before the process's children stopped writing
+                        pass
@@ -0,0 +1,109 @@
+"""This module runs a retention policy from the Scheduler on a background thread,
+so deleting old logs and queue elements never delays starting triggers."""
+
+import threading
+import time
+
+from OpenOrchestrator.database import retention
+
+# The default time in seconds between runs of the retention policy.
+DEFAULT_INTERVAL = 24 * 60 * 60
+
+_policy_path: str | None = None
+_interval = DEFAULT_INTERVAL
+_last_run: float | None = None
+_thread: threading.Thread | None = None
+_lock = threading.Lock()
+
+# Messages since the last report
+_messages: list[str] = []
+
+
+def set_policy(policy_path: str | None, interval: float = DEFAULT_INTERVAL) -> None:
+    """Set the retention policy run by the Scheduler.
+    The policy file is read on every run, so changes apply without restarting the Scheduler.
+
+    Args:
+        policy_path: The path of the json policy file. If None retention is disabled.
+        interval: The time in seconds between runs.
+
+    Raises:
+        ValueError: If the policy file isn't a valid policy.
+    """
+    global _policy_path, _interval, _last_run  # pylint: disable=global-statement
+
+    if policy_path:
+        # Fail early on a broken policy
+        retention.load_policy(policy_path)
+
+    _policy_path = policy_path
+    _interval = interval
+    _last_run = None
+
+
+def run_if_due() -> bool:
+    """Start a run of the retention policy on a background thread
+    if the interval has passed since the last run and no run is in progress.
+
+    Returns:
+        True if a run was started.
+    """
+    global _thread, _last_run  # pylint: disable=global-statement
+
+    if not _policy_path:
+        return False
+
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return False
+
+        if _last_run is not None and time.monotonic() - _last_run < _interval:
+            return False
+
+        _last_run = time.monotonic()
+        _thread = threading.Thread(target=_run, args=(_policy_path,), daemon=True, name="Retention")
+        _thread.start()
+
+    return True
+
+
+def wait_for_run(timeout: float | None = None) -> None:
+    """Block until the current run has finished.
+
+    Args:
+        timeout: The maximum time in seconds to wait.
+    """
+    thread = _thread
+    if thread is not None:
+        thread.join(timeout)
+
+
+def pop_report() -> list[str]:
+    """Get the messages of the runs since the last report.
+
+    Returns:
+        A list of messages.
+    """
+    global _messages  # pylint: disable=global-statement
+
+    with _lock:
+        messages = _messages
+        _messages = []
+
+    return messages
+
+
+def _run(policy_path: str) -> None:
+    """Apply the retention policy and note the result.
+
+    Args:
+        policy_path: The path of the json policy file.
+    """
+    try:
+        policy = retention.load_policy(policy_path)
+        message = retention.apply_policy(policy).summary()
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        message = f"Retention failed: {exc}"
+
+    with _lock:
+        _messages.append(message)
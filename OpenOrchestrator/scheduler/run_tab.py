@@ -4,6 +4,7 @@ in Scheduler."""
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+from datetime import datetime
 import tkinter
 from tkinter import ttk
 import sys
@@ -12,13 +13,24 @@ from sqlalchemy import exc as alc_exc
 
 from OpenOrchestrator.common import crypto_util
 from OpenOrchestrator.database import db_util
-from OpenOrchestrator.scheduler import runner, util
+from OpenOrchestrator.scheduler import folder_cleanup, git_cache, retention_job, runner, util, venv_cache
 from OpenOrchestrator.database.triggers import TriggerStatus
 
 if TYPE_CHECKING:
     from OpenOrchestrator.scheduler.application import Application
 
 
+# The bounds in ms of the time between loops when nothing happens.
+MIN_POLL_INTERVAL = 1_000
+MAX_POLL_INTERVAL = 30_000
+
+# The longest time in ms between loops when jobs are running.
+RUNNING_POLL_INTERVAL = 6_000
+
+# The time in ms between checks for exited processes.
+PROCESS_WATCH_INTERVAL = 200
+
+
 # pylint: disable-next=too-many-ancestors
 class RunTab(ttk.Frame):
     """A ttk.frame object containing the functionality of the run tab in Scheduler."""
@@ -79,9 +91,9 @@ class RunTab(ttk.Frame):
         print('Running...\n')
         self.app.running = True
 
-        # Only start a new loop if it's not already running
-        if self.app.tk.call('after', 'info') == '':
-            self.app.after(0, loop, self.app)
+        # Start a new loop or move the waiting one forward
+        self.app.poll_interval = MIN_POLL_INTERVAL
+        schedule_loop(self.app, 0)
 
     def print_text(self, text: str) -> None:
         """Appends text to the text area.
@@ -111,38 +123,133 @@ def loop(app: Application) -> None:
     Args:
         app: The Scheduler Application object.
     """
+    app.loop_after_id = None
+    job_started = False
+    next_run = None
+
     try:
         send_ping_to_orchestrator()
 
-        check_heartbeats(app)
+        jobs_ended = check_heartbeats(app)
 
         if app.running:
-            check_triggers(app)
+            job_started = check_triggers(app)
+            next_run = db_util.get_next_trigger_run()
 
     except (alc_exc.OperationalError, alc_exc.ProgrammingError) as e:
         print(f"Couldn't connect to database. {e}")
+        jobs_ended = False
 
     if len(app.running_jobs) == 0:
         print("Doing cleanup...")
         runner.clear_repo_folder()
+        git_cache.evict_mirrors()
+        venv_cache.evict_venvs()
+
+    reclaimed_bytes, failed_folders = folder_cleanup.pop_report()
+    if reclaimed_bytes:
+        print(f"Cleanup reclaimed {reclaimed_bytes / 1_000_000:.1f} MB.")
+    for folder_path in failed_folders:
+        print(f"Couldn't remove folder: {folder_path}")
+
+    if app.running:
+        retention_job.run_if_due()
+    for message in retention_job.pop_report():
+        print(message)
+
+    if not app.running and len(app.running_jobs) == 0:
+        print("Scheduler is paused and no more processes are running.")
+        return
 
     # Schedule next loop
-    if app.running or len(app.running_jobs) > 0:
-        print('Waiting 6 seconds...\n')
-        app.after(6_000, loop, app)
+    if job_started or jobs_ended:
+        app.poll_interval = MIN_POLL_INTERVAL
     else:
-        print("Scheduler is paused and no more processes are running.")
+        app.poll_interval = min(app.poll_interval * 2, MAX_POLL_INTERVAL)
+
+    delay = get_next_delay(app.poll_interval, len(app.running_jobs) > 0, next_run)
+
+    print(f'Waiting {delay / 1000:.1f} seconds...\n')
+    schedule_loop(app, delay)
+
+    if app.running_jobs and app.watch_after_id is None:
+        app.watch_after_id = app.after(PROCESS_WATCH_INTERVAL, watch_processes, app)
 
 
-def check_heartbeats(app: Application) -> None:
+def get_next_delay(poll_interval: int, has_running_jobs: bool, next_run: datetime | None) -> int:
+    """Calculate the time to wait before the next loop.
+
+    Args:
+        poll_interval: The current poll interval in ms.
+        has_running_jobs: Whether any jobs are running.
+        next_run: The earliest next run of any trigger if any.
+
+    Returns:
+        The time to wait in ms.
+    """
+    delay = poll_interval
+
+    if has_running_jobs:
+        delay = min(delay, RUNNING_POLL_INTERVAL)
+
+    # Wake up when the next trigger is due. Overdue triggers that couldn't
+    # be claimed are left to the normal poll interval.
+    if next_run is not None:
+        time_until = (next_run - datetime.now()).total_seconds() * 1000
+        if time_until > 0:
+            delay = min(delay, int(time_until) + 1)
+
+    return delay
+
+
+def schedule_loop(app: Application, delay: int) -> None:
+    """Schedule the next loop, replacing any already scheduled loop.
+
+    Args:
+        app: The Scheduler Application object.
+        delay: The time to wait in ms.
+    """
+    if app.loop_after_id is not None:
+        app.after_cancel(app.loop_after_id)
+
+    app.loop_after_id = app.after(delay, loop, app)
+
+
+def watch_processes(app: Application) -> None:
+    """Check if any running process has exited or any virtual environment is ready without touching the database.
+    If so the next loop is run right away, else the check is repeated.
+
+    Args:
+        app: The Scheduler Application object.
+    """
+    app.watch_after_id = None
+
+    if not app.running_jobs:
+        return
+
+    if any(runner.needs_check(job) for job in app.running_jobs):
+        schedule_loop(app, 0)
+    else:
+        app.watch_after_id = app.after(PROCESS_WATCH_INTERVAL, watch_processes, app)
+
+
+def check_heartbeats(app: Application) -> bool:
     """Check if any running jobs are still running, failed or done.
 
     Args:
         app: The Scheduler Application object.
+
+    Returns:
+        True if any job has ended.
     """
     print('Checking heartbeats...')
-    for job in app.running_jobs:
-        if job.process.poll() is not None:
+    jobs_ended = False
+    for job in list(app.running_jobs):
+        if job.process is None and job.python_future.done() and not runner.start_waiting_job(job):
+            app.running_jobs.remove(job)
+            jobs_ended = True
+
+        elif job.process is not None and job.process.poll() is not None:
             if job.process.returncode == 0:
                 print(f"Process '{job.trigger.process_name}' is done")
                 runner.end_job(job)
@@ -151,40 +258,60 @@ def check_heartbeats(app: Application) -> None:
                 runner.fail_job(job)
 
             app.running_jobs.remove(job)
+            jobs_ended = True
 
         elif db_util.get_trigger(job.trigger.id).process_status == TriggerStatus.KILLING:
             runner.kill_job(job)
             print(f"Process '{job.trigger.process_name}' has been killed.")
             app.running_jobs.remove(job)
+            jobs_ended = True
+
+        elif job.process is None:
+            print(f"Process '{job.trigger.process_name}' is waiting for its virtual environment")
 
         else:
             print(f"Process '{job.trigger.process_name}' is still running")
 
+    return jobs_ended
 
-def check_triggers(app: Application) -> None:
+
+def check_triggers(app: Application) -> bool:
     """Checks any process is blocking
-    and if not checks if any trigger should be run.
+    and if not starts triggers until all job slots are filled.
 
     Args:
         app: The Scheduler Application object.
+
+    Returns:
+        True if any job was started.
     """
     # Check if process is blocking
-    blocking = False
     for job in app.running_jobs:
         if job.trigger.is_blocking:
             print(f"Process '{job.trigger.process_name}' is blocking\n")
-            blocking = True
+            return False
 
     # Check triggers
-    if not blocking:
-        print('Checking triggers...')
-        trigger = runner.poll_triggers(app)
+    print('Checking triggers...')
+    job_started = False
+
+    while not app.running_jobs or runner.get_free_slots(app) > 0:
+        trigger = runner.claim_trigger(app)
+
+        if not trigger:
+            break
+
+        print('Running trigger: ', trigger.trigger_name)
+        job = runner.run_process(trigger)
+
+        if job:
+            app.running_jobs.append(job)
+            job_started = True
 
-        if trigger:
-            job = runner.run_trigger(trigger)
+            if trigger.is_blocking:
+                break
 
-            if job:
-                app.running_jobs.append(job)
+    return job_started
 
 
 def send_ping_to_orchestrator():
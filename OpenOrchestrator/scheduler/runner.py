@@ -1,6 +1,7 @@
 """This module is responsible for checking triggers and running processes."""
 
 from __future__ import annotations
+from concurrent.futures import Future
 from typing import TYPE_CHECKING
 import os
 import shutil
@@ -12,7 +13,7 @@ from OpenOrchestrator.common import crypto_util
 from OpenOrchestrator.database import db_util
 from OpenOrchestrator.database.triggers import Trigger, SingleTrigger, ScheduledTrigger, QueueTrigger, TriggerStatus
 from OpenOrchestrator.database.logs import LogLevel
-from OpenOrchestrator.scheduler import util
+from OpenOrchestrator.scheduler import folder_cleanup, git_cache, output_capture, util, venv_cache, warm_worker
 
 if TYPE_CHECKING:
     from OpenOrchestrator.scheduler.application import Application
@@ -20,76 +21,54 @@ if TYPE_CHECKING:
 
 @dataclass
 class Job():
-    """An object that holds information about a running job."""
-    process: subprocess.Popen
+    """An object that holds information about a running job.
+    A job waiting for its virtual environment to be built has no process yet.
+    """
+    process: subprocess.Popen | None
     trigger: Trigger
     process_folder: str | None
+    output: output_capture.OutputCapture | None = None
+    python_future: Future[str] | None = None
+    process_path: str | None = None
 
 
-def poll_triggers(app: Application) -> Trigger | None:
-    """Checks for pending triggers and returns the first viable one.
-    This takes priority and whitelist of the triggers into account.
+def claim_trigger(app: Application) -> Trigger | None:
+    """Claims the first viable trigger and marks it as running in the database.
+    This takes priority, whitelist and weight of the triggers into account.
 
     Args:
         app: The Application object of the Scheduler app.
 
     Returns:
-        The first viable trigger to run if any.
+        The claimed trigger if any.
     """
-    # Get all pending triggers
-    trigger_list = (
-        db_util.get_pending_single_triggers() +
-        db_util.get_pending_scheduled_triggers() +
-        db_util.get_pending_queue_triggers()
+    # Blocking triggers can only run when no other jobs are running.
+    # A trigger of any weight may run alone, else it must fit in the free slots.
+    has_running_jobs = len(app.running_jobs) > 0
+    return db_util.claim_next_trigger(
+        scheduler_name=util.get_scheduler_name(),
+        exclusive=app.is_exclusive,
+        allow_blocking=not has_running_jobs,
+        max_weight=get_free_slots(app) if has_running_jobs else None
     )
 
-    # Sort by priority and type
-    # Single > Scheduled > Queue
-    trigger_order = {SingleTrigger: 0, ScheduledTrigger: 1, QueueTrigger: 2}
-    trigger_list.sort(key=lambda t: (-t.priority, trigger_order[type(t)]))
-
-    # Run the first eligible trigger
-    other_jobs_running = len(app.running_jobs) > 0
-    scheduler_name = util.get_scheduler_name()
-    is_exclusive = app.settings_tab_.whitelist_value.get()
-
-    for trigger in trigger_list:
-        whitelisted = trigger.scheduler_whitelist and scheduler_name in trigger.scheduler_whitelist  # Is the Scheduler in the whitelist
-        unlisted_allowed = not is_exclusive and not trigger.scheduler_whitelist  # Is the scheduler allowed to run non-designated triggers
-
-        if whitelisted or unlisted_allowed:
-            if not (trigger.is_blocking and other_jobs_running):
-                return trigger
-
-    return None
 
-
-def run_trigger(trigger: Trigger) -> Job | None:
-    """Mark a trigger as running in the database
-    and start the process.
+def get_free_slots(app: Application) -> int:
+    """Get the number of job slots not taken up by running jobs.
 
     Args:
-        trigger: The trigger to run.
+        app: The Application object of the Scheduler app.
 
     Returns:
-        A Job object describing the process if successful.
+        The number of free job slots. Can be negative if a heavy job is running alone.
     """
-    print('Running trigger: ', trigger.trigger_name)
-
-    if isinstance(trigger, SingleTrigger) and db_util.begin_single_trigger(trigger.id):
-        return run_process(trigger)
-
-    if isinstance(trigger, ScheduledTrigger) and db_util.begin_scheduled_trigger(trigger.id):
-        return run_process(trigger)
-
-    if isinstance(trigger, QueueTrigger) and db_util.begin_queue_trigger(trigger.id):
-        return run_process(trigger)
-
-    return None
+    return app.slots - sum(job.trigger.weight for job in app.running_jobs)
 
 
 def clone_git_repo(repo_url: str, branch: str) -> str:
     """Clone the git repo at the path to %USER%\\desktop\\Scheduler_Repos\\%UUID%.
+    The repo is cloned from a cached mirror that is updated with an incremental fetch first.
+    If the mirror can't be updated the repo is cloned directly from the URL.
 
     Args:
         repo_url: URL to the git repo to clone.
@@ -107,13 +86,23 @@ def clone_git_repo(repo_url: str, branch: str) -> str:
     if shutil.which('git') is None:
         raise RuntimeError('git is not installed or not found in the system PATH.')
 
+    try:
+        source = git_cache.update_mirror(repo_url)
+    except (subprocess.CalledProcessError, OSError):
+        print(f"Couldn't update the cached mirror of '{repo_url}'. Cloning directly.")
+        source = repo_url
+
     args = ['git', 'clone']
     if branch.strip():
         args.extend(["-b", branch.strip()])
-    args.extend([repo_url, repo_path])
+    args.extend([source, repo_path])
 
     try:
         subprocess.run(args, check=True)
+
+        # Point the clone at the real remote instead of the mirror
+        if source != repo_url:
+            subprocess.run(['git', '-C', repo_path, 'remote', 'set-url', 'origin', repo_url], check=True)
     except subprocess.CalledProcessError as exc:
         raise ValueError(f"Failed to clone git branch '{branch if branch else 'DEFAULT'}' at '{repo_url}'.") from exc
 
@@ -121,9 +110,15 @@ def clone_git_repo(repo_url: str, branch: str) -> str:
 
 
 def clear_repo_folder() -> None:
-    """Completely remove the repos folder."""
+    """Queue all folders in the repos folder for removal."""
     repo_folder = get_repo_folder_path()
-    clear_folder(repo_folder)
+
+    if not os.path.isdir(repo_folder):
+        return
+
+    for entry in os.scandir(repo_folder):
+        if entry.is_dir(follow_symlinks=False):
+            clear_folder(entry.path)
 
 
 def get_repo_folder_path() -> str:
@@ -138,12 +133,12 @@ def get_repo_folder_path() -> str:
 
 
 def clear_folder(folder_path: str) -> None:
-    """Clear a folder on the system.
+    """Queue a folder for removal on the background cleanup thread.
 
     Args:
         folder_path: The folder to remove.
     """
-    subprocess.run(['rmdir', '/s', '/q', folder_path], check=False, shell=True, capture_output=True)
+    folder_cleanup.remove_folder_async(folder_path)
 
 
 def find_main_file(folder_path: str) -> str:
@@ -184,6 +179,9 @@ def end_job(job: Job) -> None:
         elif current_status == TriggerStatus.RUNNING:
             db_util.set_trigger_status(job.trigger.id, TriggerStatus.IDLE)
 
+    if job.output:
+        job.output.close()
+
     if job.process_folder:
         clear_folder(job.process_folder)
 
@@ -195,7 +193,13 @@ def fail_job(job: Job) -> None:
         job: The job whose trigger to mark as failed.
     """
     db_util.set_trigger_status(job.trigger.id, TriggerStatus.FAILED)
-    _, error = job.process.communicate()
+
+    if job.output:
+        job.output.close()
+        error = job.output.get_error()
+    else:
+        _, error = job.process.communicate()
+
     error_msg = f"An uncaught error ocurred during the process:\n{error}"
     db_util.create_log(job.trigger.process_name, LogLevel.ERROR, error_msg)
 
@@ -209,9 +213,13 @@ def kill_job(job: Job) -> None:
     Args:
         job: The job whose process to kill.
     """
-    job.process.kill()
+    if job.process:
+        job.process.kill()
     db_util.set_trigger_status(job.trigger.id, TriggerStatus.KILLED)
 
+    if job.output:
+        job.output.close()
+
     if job.process_folder:
         clear_folder(job.process_folder)
 
@@ -225,6 +233,9 @@ def run_process(trigger: Trigger) -> Job | None:
 
     If the trigger's process_path is pointing to a git repo the repo is cloned
     and the main.py file in the repo is found and run.
+    If the repo has any requirements the process is run in a cached virtual environment
+    with the requirements installed. If the environment needs to be built first the returned
+    job waits for it, and the process is started by start_waiting_job when it's ready.
 
     Supports only .py files.
 
@@ -238,6 +249,7 @@ def run_process(trigger: Trigger) -> Job | None:
     """
     process_path = trigger.process_path
     folder_path = None
+    python_path = 'python'
 
     try:
         if trigger.is_git_repo:
@@ -250,24 +262,108 @@ def run_process(trigger: Trigger) -> Job | None:
         if not process_path.endswith(".py"):
             raise ValueError(f"The process path didn't point to a valid file. Supported files are [.py]. Path: '{process_path}'")
 
-        conn_string = db_util.get_conn_string()
-        crypto_key = crypto_util.get_key()
+        if folder_path:
+            python_future = venv_cache.get_python_future(trigger.process_path, folder_path, process_path)
 
-        command_args = ['python', process_path, trigger.process_name, conn_string, crypto_key, trigger.process_args, str(trigger.id)]
+            if not python_future.done():
+                print(f"Process '{trigger.process_name}' will start when its virtual environment is ready.")
+                return Job(None, trigger, folder_path, python_future=python_future, process_path=process_path)
 
-        process = subprocess.Popen(command_args, stderr=subprocess.PIPE, text=True)  # pylint: disable=consider-using-with
+            python_path = python_future.result()
 
-        machine_name = util.get_scheduler_name()
-        db_util.start_trigger_from_machine(machine_name, str(trigger.trigger_name))
-
-        return Job(process, trigger, folder_path)
+        return _start_process(trigger, python_path, process_path, folder_path)
 
     # We actually want to catch any exception here
     # pylint: disable=broad-exception-caught
     except Exception as exc:
-        db_util.set_trigger_status(trigger.id, TriggerStatus.FAILED)
-        error_msg = f"Scheduler couldn't launch the process:\n{exc.__class__.__name__}:\n{exc}"
-        db_util.create_log(trigger.process_name, LogLevel.ERROR, error_msg)
-        print(error_msg)
+        _fail_launch(trigger, exc)
 
     return None
+
+
+def start_waiting_job(job: Job) -> bool:
+    """Start the process of a job whose virtual environment is ready.
+    If the environment couldn't be built the job is failed.
+
+    Args:
+        job: The job waiting for its virtual environment.
+
+    Returns:
+        True if the process was started.
+    """
+    try:
+        python_path = job.python_future.result()
+        started_job = _start_process(job.trigger, python_path, job.process_path, job.process_folder)
+
+    # We actually want to catch any exception here
+    # pylint: disable=broad-exception-caught
+    except Exception as exc:
+        _fail_launch(job.trigger, exc)
+
+        if job.process_folder:
+            clear_folder(job.process_folder)
+
+        return False
+
+    job.process = started_job.process
+    job.output = started_job.output
+    job.python_future = None
+    return True
+
+
+def needs_check(job: Job) -> bool:
+    """Check if a job needs to be handled by the Scheduler without touching the database.
+
+    Args:
+        job: The job to check.
+
+    Returns:
+        True if the job's process has exited or its virtual environment is ready.
+    """
+    if job.process is None:
+        return job.python_future.done()
+
+    return job.process.poll() is not None
+
+
+def _start_process(trigger: Trigger, python_path: str, process_path: str, folder_path: str | None) -> Job:
+    """Start the process of a trigger and note it in the schedulers table.
+
+    Args:
+        trigger: The trigger whose process to start.
+        python_path: The Python executable to run the process with.
+        process_path: The path to the main file of the process.
+        folder_path: The folder of the cloned repo if any.
+
+    Returns:
+        A Job object referencing the process.
+    """
+    conn_string = db_util.get_conn_string()
+    crypto_key = crypto_util.get_key()
+
+    command_args = [python_path, process_path, trigger.process_name, conn_string, crypto_key, trigger.process_args, str(trigger.id)]
+
+    # Processes using the Scheduler's Python can run in a warm worker if one is ready
+    process = warm_worker.run_in_worker(command_args[1:]) if python_path == 'python' else None
+
+    if process is None:
+        stdout = subprocess.PIPE if output_capture.is_forwarding_logs() else None
+        process = subprocess.Popen(command_args, stdout=stdout, stderr=subprocess.PIPE, text=True, errors="replace")  # pylint: disable=consider-using-with
+
+    machine_name = util.get_scheduler_name()
+    db_util.start_trigger_from_machine(machine_name, str(trigger.trigger_name))
+
+    return Job(process, trigger, folder_path, output_capture.OutputCapture(process, trigger.process_name))
+
+
+def _fail_launch(trigger: Trigger, exc: Exception) -> None:
+    """Mark a trigger as failed and log why its process couldn't be launched.
+
+    Args:
+        trigger: The trigger whose process couldn't be launched.
+        exc: The exception raised during launch.
+    """
+    db_util.set_trigger_status(trigger.id, TriggerStatus.FAILED)
+    error_msg = f"Scheduler couldn't launch the process:\n{exc.__class__.__name__}:\n{exc}"
+    db_util.create_log(trigger.process_name, LogLevel.ERROR, error_msg)
+    print(error_msg)
@@ -7,7 +7,7 @@ from tkinter import ttk, messagebox
 
 from OpenOrchestrator.common import crypto_util
 from OpenOrchestrator.database import db_util
-from OpenOrchestrator.scheduler import util
+from OpenOrchestrator.scheduler import util, warm_worker
 
 
 # pylint: disable=too-many-ancestors
@@ -57,10 +57,12 @@ class SettingsTab(ttk.Frame):
         if db_util.connect(conn_string):
             crypto_util.set_key(crypto_key)
             self._set_state(True)
+            warm_worker.fill_pool()
             if not db_util.check_database_revision():
                 messagebox.showerror("Warning", "This version of Scheduler doesn't match the version of the connected database. Unexpected errors might occur.")
 
     def _disconnect(self) -> None:
+        warm_worker.drain_pool()
         db_util.disconnect()
         crypto_util.set_key(None)
         self._set_state(False)
@@ -1,8 +1,78 @@
 """This module contains miscellaneous utility functions."""
 
+import os
 import platform
+import shutil
+import stat
+import time
+from typing import Callable
 
 
 def get_scheduler_name():
     """Get the name of the Scheduler application."""
     return platform.node()
+
+
+def get_folder_size(folder_path: str) -> int:
+    """Get the total size of the files in a folder and its subfolders.
+
+    Args:
+        folder_path: The path of the folder.
+
+    Returns:
+        The size in bytes.
+    """
+    size = 0
+    for dir_path, _, file_names in os.walk(folder_path):
+        for file_name in file_names:
+            try:
+                size += os.path.getsize(os.path.join(dir_path, file_name))
+            except OSError:
+                pass
+
+    return size
+
+
+def remove_folder(folder_path: str) -> None:
+    """Remove a folder and its content if it exists.
+    Read-only files, like git objects, are made writable before retrying.
+
+    Args:
+        folder_path: The path of the folder.
+    """
+    def make_writable(func, path, _):
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+
+    if os.path.isdir(folder_path):
+        shutil.rmtree(folder_path, onerror=make_writable)  # pylint: disable=deprecated-argument
+
+
+def evict_least_recently_used(cache_folder: str, max_bytes: int, max_age: float, is_valid: Callable[[str], bool] = lambda _: True) -> None:
+    """Remove the subfolders of a cache folder that are invalid or haven't been used within the max age.
+    Then remove the least recently used subfolders until the cache is below the max size.
+    A subfolder's last use is its modification time.
+
+    Args:
+        cache_folder: The path of the cache folder.
+        max_bytes: The maximum total size of the cache in bytes.
+        max_age: The maximum time in seconds since a subfolder was last used.
+        is_valid: A function telling if a subfolder is valid. Invalid subfolders are always removed.
+    """
+    if not os.path.isdir(cache_folder):
+        return
+
+    entries = []
+    for entry in os.scandir(cache_folder):
+        if entry.is_dir():
+            entries.append((entry.stat().st_mtime, get_folder_size(entry.path), entry.path))
+
+    # Least recently used first
+    entries.sort()
+    total_size = sum(size for _, size, _ in entries)
+    now = time.time()
+
+    for last_used, size, path in entries:
+        if now - last_used > max_age or total_size > max_bytes or not is_valid(path):
+            remove_folder(path)
+            total_size -= size
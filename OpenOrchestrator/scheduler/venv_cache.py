@@ -0,0 +1,255 @@
+"""This module is responsible for keeping a local cache of virtual environments for git processes,
+so their dependencies are only installed when their requirements change.
+Environments are built on a background thread, so a slow pip install doesn't block the Scheduler."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+import time
+import tomllib
+
+from OpenOrchestrator.scheduler import util
+
+# The limits of the cache. Environments are evicted when they haven't been used
+# for longer than the max age or when the cache grows above the max size.
+CACHE_MAX_BYTES = 10_000_000_000
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+# The minimum time in seconds between checks for environments to evict.
+EVICTION_INTERVAL = 60 * 60
+
+# A file written to an environment when it has been completely built.
+COMPLETE_MARKER = "openorchestrator_complete"
+
+_last_eviction = 0.0
+
+_build_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="venv_cache")
+
+# The environments being built by their path
+_builds: dict[str, Future[str]] = {}
+_builds_lock = threading.Lock()
+
+
+def get_cache_folder_path() -> str:
+    """Gets the path to the folder where virtual environments are cached.
+
+    Returns:
+        str: The absolute path to the cache folder.
+    """
+    user_path = os.path.expanduser("~")
+    return os.path.join(user_path, "Desktop", "Scheduler_Venv_Cache")
+
+
+def find_requirements(repo_path: str, main_file_path: str) -> tuple[str, list[str]] | None:
+    """Find the requirements of a process.
+    The folder of the main file and its parent folders up to the repo folder are searched
+    for a 'requirements.txt' or a 'pyproject.toml' with a list of dependencies.
+
+    Args:
+        repo_path: The path to the root of the repo.
+        main_file_path: The path to the main file of the process.
+
+    Returns:
+        The path of the requirements file and the pip arguments to install the requirements if any.
+    """
+    repo_path = os.path.abspath(repo_path)
+    folder_path = os.path.dirname(os.path.abspath(main_file_path))
+
+    while True:
+        requirements_path = os.path.join(folder_path, "requirements.txt")
+        if os.path.isfile(requirements_path):
+            return requirements_path, ["-r", requirements_path]
+
+        pyproject_path = os.path.join(folder_path, "pyproject.toml")
+        if os.path.isfile(pyproject_path):
+            with open(pyproject_path, "rb") as file:
+                dependencies = tomllib.load(file).get("project", {}).get("dependencies", [])
+            if dependencies:
+                return pyproject_path, list(dependencies)
+
+        if folder_path == repo_path or os.path.dirname(folder_path) == folder_path:
+            return None
+
+        folder_path = os.path.dirname(folder_path)
+
+
+def get_venv_path(repo_url: str, requirements_path: str) -> str:
+    """Get the path of the cached environment of the given repo and requirements.
+    The path depends on the content of the requirements file and the version of Python.
+
+    Args:
+        repo_url: The URL of the git repo.
+        requirements_path: The path to the requirements file.
+
+    Returns:
+        The absolute path to the environment.
+    """
+    with open(requirements_path, "rb") as file:
+        content = file.read()
+
+    key = hashlib.sha256()
+    for part in (repo_url.encode(), os.path.basename(requirements_path).encode(), content, sys.version.encode()):
+        key.update(part)
+        key.update(b"\0")
+
+    return os.path.join(get_cache_folder_path(), key.hexdigest()[:16])
+
+
+def get_python_path(venv_path: str) -> str:
+    """Get the path of the Python executable in an environment.
+
+    Args:
+        venv_path: The path to the environment.
+
+    Returns:
+        The path to the Python executable.
+    """
+    if sys.platform == "win32":
+        return os.path.join(venv_path, "Scripts", "python.exe")
+
+    return os.path.join(venv_path, "bin", "python")
+
+
+def get_python(repo_url: str, repo_path: str, main_file_path: str) -> str:
+    """Get the Python executable to run a process with.
+    If the process has any requirements a cached environment with the requirements
+    is used, and it is built first if needed. Otherwise 'python' is returned.
+    Blocks until the environment is built. See get_python_future.
+
+    Args:
+        repo_url: The URL of the git repo.
+        repo_path: The path to the root of the cloned repo.
+        main_file_path: The path to the main file of the process.
+
+    Returns:
+        The Python executable.
+
+    Raises:
+        subprocess.CalledProcessError: If the environment couldn't be built.
+    """
+    return get_python_future(repo_url, repo_path, main_file_path).result()
+
+
+def get_python_future(repo_url: str, repo_path: str, main_file_path: str) -> Future[str]:
+    """Get the Python executable to run a process with without blocking.
+    If the environment needs to be built it is built on a background thread
+    and the future is done when the environment is ready.
+    Processes needing the same environment share the build.
+
+    Args:
+        repo_url: The URL of the git repo.
+        repo_path: The path to the root of the cloned repo.
+        main_file_path: The path to the main file of the process.
+
+    Returns:
+        A future of the Python executable. Its result raises subprocess.CalledProcessError
+        if the environment couldn't be built.
+    """
+    requirements = find_requirements(repo_path, main_file_path)
+    if requirements is None:
+        return _done_future("python")
+
+    requirements_path, pip_args = requirements
+    venv_path = get_venv_path(repo_url, requirements_path)
+
+    with _builds_lock:
+        build = _builds.get(venv_path)
+
+        if build is None:
+            if os.path.isfile(os.path.join(venv_path, COMPLETE_MARKER)):
+                # Mark the environment as recently used
+                os.utime(venv_path)
+                return _done_future(get_python_path(venv_path))
+
+            print(f"Building virtual environment for '{repo_url}' in the background...")
+            build = _build_executor.submit(_build, venv_path, pip_args, os.path.dirname(requirements_path))
+            _builds[venv_path] = build
+
+    return build
+
+
+def _build(venv_path: str, pip_args: list[str], working_dir: str) -> str:
+    """Build an environment on the background thread. See build_venv.
+
+    Args:
+        venv_path: The path of the environment.
+        pip_args: The arguments to 'pip install'.
+        working_dir: The folder to run pip from.
+
+    Returns:
+        The path to the Python executable of the environment.
+    """
+    try:
+        build_venv(venv_path, pip_args, working_dir)
+        return get_python_path(venv_path)
+    finally:
+        with _builds_lock:
+            del _builds[venv_path]
+
+
+def _done_future(python_path: str) -> Future[str]:
+    """Create a future that is already done.
+
+    Args:
+        python_path: The result of the future.
+
+    Returns:
+        The done future.
+    """
+    future: Future[str] = Future()
+    future.set_result(python_path)
+    return future
+
+
+def build_venv(venv_path: str, pip_args: list[str], working_dir: str) -> None:
+    """Build a virtual environment and install requirements in it.
+    The environment can see the packages of the Scheduler's Python, so pip from there is
+    used instead of installing pip in each environment.
+    Any incomplete environment at the path is removed first.
+
+    Args:
+        venv_path: The path of the environment.
+        pip_args: The arguments to 'pip install'.
+        working_dir: The folder to run pip from, so relative paths in the requirements work.
+
+    Raises:
+        subprocess.CalledProcessError: If the environment couldn't be built.
+    """
+    util.remove_folder(venv_path)
+
+    try:
+        subprocess.run([sys.executable, "-m", "venv", "--without-pip", "--system-site-packages", venv_path], check=True)
+        subprocess.run([get_python_path(venv_path), "-m", "pip", "install", "--quiet", *pip_args], check=True, cwd=working_dir)
+    except subprocess.CalledProcessError:
+        util.remove_folder(venv_path)
+        raise
+
+    with open(os.path.join(venv_path, COMPLETE_MARKER), "w", encoding="utf-8"):
+        pass
+
+
+def evict_venvs(max_bytes: int = CACHE_MAX_BYTES, max_age: float = CACHE_MAX_AGE, force: bool = False) -> None:
+    """Remove incomplete environments and environments that haven't been used within the max age.
+    Then remove the least recently used environments until the cache is below the max size.
+    Should only be called when no processes are running. Does nothing while an environment is being built.
+
+    Args:
+        max_bytes: The maximum total size of the cache in bytes.
+        max_age: The maximum time in seconds since an environment was last used.
+        force: Whether to check the cache even if it was checked within the eviction interval.
+    """
+    global _last_eviction  # pylint: disable=global-statement
+
+    if not force and time.time() - _last_eviction < EVICTION_INTERVAL:
+        return
+
+    if _builds:
+        return
+
+    _last_eviction = time.time()
+
+    util.evict_least_recently_used(get_cache_folder_path(), max_bytes, max_age,
+                                   lambda path: os.path.isfile(os.path.join(path, COMPLETE_MARKER)))
@@ -0,0 +1,167 @@
+"""This module is responsible for a pool of warm worker processes.
+A warm worker is a Python process that has already imported the heavy modules used by
+OpenOrchestrator and connected to the database, and waits for a process to run.
+
+When run as a script this module is the worker itself. It reads one line of json
+with its settings and then one line of json with the process to run from stdin."""
+
+import atexit
+import json
+import os
+import runpy
+import shutil
+import subprocess
+import sys
+
+from OpenOrchestrator.database import db_util
+from OpenOrchestrator.scheduler import output_capture
+
+_idle_workers: list[subprocess.Popen] = []
+_pool_size = 0
+
+
+def set_pool_size(size: int) -> None:
+    """Set the number of warm workers to keep ready.
+    The workers are started by fill_pool once the Scheduler is connected to the database.
+    A size of 0 disables the pool.
+
+    The pool is disabled if 'python' on the PATH isn't the interpreter running the Scheduler,
+    since processes not run in a worker are run with 'python' and a process should run in
+    the same interpreter either way.
+
+    Args:
+        size: The number of idle workers to keep.
+    """
+    global _pool_size  # pylint: disable=global-statement
+
+    if size > 0 and not _is_path_python():
+        print("Warm workers are disabled since 'python' on the PATH isn't the Python running the Scheduler.")
+        size = 0
+
+    _pool_size = size
+
+
+def stop_pool() -> None:
+    """Stop all idle workers and disable the pool."""
+    global _pool_size  # pylint: disable=global-statement
+    _pool_size = 0
+    drain_pool()
+
+
+def drain_pool() -> None:
+    """Stop all idle workers but keep the pool size, e.g. when disconnecting from the database."""
+    while _idle_workers:
+        worker = _idle_workers.pop()
+        # Closing stdin makes the worker exit without running anything
+        worker.stdin.close()  # type: ignore
+        worker.wait()
+
+
+atexit.register(stop_pool)
+
+
+def run_in_worker(command_args: list[str]) -> subprocess.Popen | None:
+    """Run a Python process in a warm worker if one is ready.
+    The pool is refilled afterwards.
+
+    Args:
+        command_args: The arguments to the Python interpreter. The first is the path of the script to run.
+
+    Returns:
+        The worker process running the script or None if no worker was ready.
+    """
+    worker = None
+    while _idle_workers and worker is None:
+        candidate = _idle_workers.pop(0)
+        if candidate.poll() is None:
+            worker = candidate
+
+    if worker is None:
+        fill_pool()
+        return None
+
+    try:
+        worker.stdin.write(json.dumps({"args": command_args}) + "\n")  # type: ignore
+        worker.stdin.close()  # type: ignore
+    except OSError:
+        worker.kill()
+        worker = None
+
+    # Popen.communicate can't handle a closed stdin, so hand over the process without it
+    if worker:
+        worker.stdin = None
+
+    fill_pool()
+    return worker
+
+
+def fill_pool() -> None:
+    """Start new workers until the pool has the wanted number of idle workers.
+    Does nothing if the Scheduler isn't connected to the database.
+    """
+    try:
+        conn_string = db_util.get_conn_string()
+    except RuntimeError:
+        return
+
+    while len(_idle_workers) < _pool_size:
+        stdout = subprocess.PIPE if output_capture.is_forwarding_logs() else None
+        # pylint: disable-next=consider-using-with
+        worker = subprocess.Popen([sys.executable, "-m", "OpenOrchestrator.scheduler.warm_worker"],
+                                  stdin=subprocess.PIPE, stdout=stdout, stderr=subprocess.PIPE, text=True, errors="replace")
+        worker.stdin.write(json.dumps({"conn_string": conn_string}) + "\n")  # type: ignore
+        worker.stdin.flush()  # type: ignore
+        _idle_workers.append(worker)
+
+
+def _is_path_python() -> bool:
+    """Check if 'python' on the PATH is the interpreter running this process.
+
+    Returns:
+        True if it's the same interpreter.
+    """
+    path_python = shutil.which("python")
+    return path_python is not None and os.path.samefile(path_python, sys.executable)
+
+
+def _warm_up(conn_string: str | None) -> None:
+    """Import the modules used by most processes and connect to the database.
+
+    Args:
+        conn_string: The connection string to connect with if any.
+    """
+    # pylint: disable=import-outside-toplevel, unused-import
+    from OpenOrchestrator.orchestrator_connection.connection import OrchestratorConnection  # noqa: F401
+
+    try:
+        import pyodbc  # noqa: F401
+    except ImportError:
+        pass
+
+    if conn_string:
+        db_util.connect(conn_string)
+
+
+def main() -> None:
+    """Warm up and wait for a process to run.
+    The process is run as the main module with the same sys.argv it would get in its own interpreter.
+    Exceptions are not caught, so the exit code and error output are the same as well.
+    """
+    settings = json.loads(sys.stdin.readline())
+    _warm_up(settings["conn_string"])
+
+    line = sys.stdin.readline()
+    if not line:
+        # The pool was stopped
+        return
+
+    args = json.loads(line)["args"]
+    process_path = args[0]
+
+    sys.argv = args
+    sys.path[0] = os.path.dirname(os.path.abspath(process_path))
+    runpy.run_path(process_path, run_name="__main__")
+
+
+if __name__ == '__main__':
+    main()
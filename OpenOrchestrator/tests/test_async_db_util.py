@@ -0,0 +1,52 @@
+"""This module tests the async facade over db_util."""
+
+import asyncio
+import threading
+import unittest
+
+from OpenOrchestrator.database import async_db_util, db_util
+
+from OpenOrchestrator.tests import db_test_util
+
+
+class TestAsyncDbUtil(unittest.IsolatedAsyncioTestCase):
+    """Test the async facade over db_util."""
+    def setUp(self) -> None:
+        db_test_util.establish_clean_database()
+
+    async def test_constants(self):
+        """Test creating, reading and deleting through the facade."""
+        await async_db_util.create_constant("Constant", "Value")
+
+        constant = await async_db_util.get_constant("Constant")
+        self.assertEqual(constant.value, "Value")
+
+        await async_db_util.delete_constant("Constant")
+        with self.assertRaises(ValueError):
+            await async_db_util.get_constant("Constant")
+
+    async def test_not_blocking(self):
+        """Test that the event loop keeps running while a query runs."""
+        release = threading.Event()
+
+        def slow_query():
+            release.wait(5)
+            return db_util.get_constants()
+
+        task = asyncio.create_task(async_db_util.run(slow_query))
+
+        # The loop must be free to run this while the query waits
+        await asyncio.sleep(0.1)
+        self.assertFalse(task.done())
+
+        release.set()
+        self.assertEqual(await task, ())
+
+    def test_wrapper(self):
+        """Test that the wrappers keep the name and docstring of db_util."""
+        self.assertEqual(async_db_util.get_logs.__name__, "get_logs")
+        self.assertEqual(async_db_util.get_logs.__doc__, db_util.get_logs.__doc__)
+
+
+if __name__ == '__main__':
+    unittest.main()
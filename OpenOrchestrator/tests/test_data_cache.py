@@ -0,0 +1,72 @@
+"""This module tests the OpenOrchestrator.orchestrator.data_cache module."""
+
+import unittest
+from unittest.mock import patch
+import threading
+import time
+
+from OpenOrchestrator.database import db_util
+from OpenOrchestrator.orchestrator import data_cache
+
+from OpenOrchestrator.tests import db_test_util
+
+
+class TestDataCache(unittest.TestCase):
+    """Test the shared data cache of Orchestrator."""
+    def setUp(self) -> None:
+        db_test_util.establish_clean_database()
+        data_cache.clear()
+
+    def test_ttl(self):
+        """Test that results are kept until they expire or are invalidated."""
+        db_util.create_constant("Constant 1", "Value")
+        self.assertEqual(len(data_cache.get_constants()), 1)
+
+        db_util.create_constant("Constant 2", "Value")
+        self.assertEqual(len(data_cache.get_constants()), 1)
+
+        data_cache.invalidate(data_cache.get_constants)
+        self.assertEqual(len(data_cache.get_constants()), 2)
+
+        db_util.create_constant("Constant 3", "Value")
+        with patch("OpenOrchestrator.orchestrator.data_cache.time.monotonic", return_value=time.monotonic() + data_cache.TTL):
+            self.assertEqual(len(data_cache.get_constants()), 3)
+
+        db_util.create_constant("Constant 4", "Value")
+        data_cache.clear()
+        self.assertEqual(len(data_cache.get_constants()), 4)
+
+    def test_single_flight(self):
+        """Test that concurrent calls share a single database query."""
+        calls = []
+
+        def get_queue_count():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"Queue": {}}
+
+        results = []
+        with patch.object(db_util, "get_queue_count", get_queue_count):
+            threads = [threading.Thread(target=lambda: results.append(data_cache.get_queue_count())) for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"Queue": {}}] * 10)
+
+    def test_invalidate_during_fetch(self):
+        """Test that a result fetched while the data was invalidated isn't kept."""
+        def get_schedulers():
+            data_cache.invalidate(data_cache.get_schedulers)
+            return ("Stale",)
+
+        with patch.object(db_util, "get_schedulers", get_schedulers):
+            self.assertEqual(data_cache.get_schedulers(), ("Stale",))
+
+        self.assertEqual(data_cache.get_schedulers(), ())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,22 +1,70 @@
 """This module contains tests of the functionality of db_util."""
 
 import unittest
+from unittest.mock import patch
+import os
 from datetime import datetime, timedelta
 import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import mssql
 
 from OpenOrchestrator.database import db_util
 from OpenOrchestrator.database.logs import LogLevel
-from OpenOrchestrator.database.queues import QueueStatus
+from OpenOrchestrator.database.queues import QueueCount, QueueElement, QueueStatus
 from OpenOrchestrator.database.triggers import TriggerStatus
 
 from OpenOrchestrator.tests import db_test_util
 
 
+# pylint: disable-next=too-many-public-methods
 class TestDBUtil(unittest.TestCase):
     """Test functionality of db_util."""
     def setUp(self) -> None:
         db_test_util.establish_clean_database()
 
+    def test_connection_pool(self):
+        """Test configuration of the connection pool."""
+        conn_string = os.environ["CONN_STRING"]
+        separator = "&" if "?" in conn_string else "?"
+
+        # Defaults
+        engine = db_util._connection_engine  # pylint: disable=protected-access
+        self.assertTrue(engine.pool._pre_ping)  # pylint: disable=protected-access
+        self.assertEqual(engine.pool._recycle, 1800)  # pylint: disable=protected-access
+        self.assertEqual(db_util.get_conn_string(), conn_string)
+
+        # Environment and configure_pool
+        with patch.dict(os.environ, {"OpenOrchestratorPoolRecycle": "60", "OpenOrchestratorPoolPrePing": "false"}):
+            db_util.configure_pool(pool_recycle=120)
+            self.assertTrue(db_util.connect(conn_string))
+            db_util.configure_pool()
+
+        engine = db_util._connection_engine  # pylint: disable=protected-access
+        self.assertFalse(engine.pool._pre_ping)  # pylint: disable=protected-access
+        self.assertEqual(engine.pool._recycle, 120)  # pylint: disable=protected-access
+
+        # Connection string
+        pooled_conn_string = f"{conn_string}{separator}pool_recycle=30&pool_pre_ping=true"
+        self.assertTrue(db_util.connect(pooled_conn_string))
+        engine = db_util._connection_engine  # pylint: disable=protected-access
+        self.assertTrue(engine.pool._pre_ping)  # pylint: disable=protected-access
+        self.assertEqual(engine.pool._recycle, 30)  # pylint: disable=protected-access
+        self.assertNotIn("pool_recycle", engine.url.query)
+        self.assertEqual(db_util.get_conn_string(), pooled_conn_string)
+
+        # The probe connection is returned to the pool
+        self.assertEqual(engine.pool.checkedout(), 0)
+
+        # Connecting again with the same settings reuses the engine
+        self.assertTrue(db_util.connect(pooled_conn_string))
+        self.assertIs(db_util._connection_engine, engine)  # pylint: disable=protected-access
+
+        with self.assertRaises(ValueError):
+            db_util.connect(f"{conn_string}{separator}pool_pre_ping=maybe")
+
     def test_logs(self):
         """Test creation of logs and retrieval by different filters."""
         # Create some logs
@@ -54,6 +102,21 @@ class TestDBUtil(unittest.TestCase):
         logs = db_util.get_logs(0, 100, to_date=creation_time)
         self.assertEqual(len(logs), 0)
 
+    def test_process_names(self):
+        """Test that process names of logs and triggers are registered."""
+        db_util.create_log("Log Process", LogLevel.INFO, "Message")
+        db_util.bulk_create_logs([("Bulk Process", LogLevel.INFO, "Message", datetime.now())] * 2)
+        db_util.create_single_trigger("Trigger", "Trigger Process", datetime.now(), "Path", "Args", False, False, 0)
+
+        self.assertEqual(db_util.get_unique_log_process_names(), ("Bulk Process", "Log Process", "Trigger Process"))
+
+        # Renaming the process of a trigger registers the new name
+        trigger = db_util.get_all_triggers()[0]
+        trigger.process_name = "Renamed Process"
+        db_util.update_trigger(trigger)
+
+        self.assertIn("Renamed Process", db_util.get_unique_log_process_names())
+
     def test_constants(self):
         """Test all things constants."""
         # Create some constants
@@ -188,6 +251,272 @@ class TestDBUtil(unittest.TestCase):
         element = db_util.get_next_queue_element("Empty Queue")
         self.assertIsNone(element)
 
+    def test_next_queue_elements(self):
+        """Test claiming multiple queue elements at once."""
+        refs = tuple(f"Ref{i}" for i in range(10))
+        db_util.bulk_create_queue_elements("Batch", references=refs, data=(None,) * 10)
+
+        with self.assertRaises(ValueError):
+            db_util.get_next_queue_elements("Batch", 0)
+
+        # Claim a batch
+        elements = db_util.get_next_queue_elements("Batch", 4)
+        self.assertEqual(len(elements), 4)
+        self.assertTrue(all(e.status == QueueStatus.IN_PROGRESS for e in elements))
+        self.assertTrue(all(e.start_date is not None for e in elements))
+
+        # Claim with reference
+        elements = db_util.get_next_queue_elements("Batch", 4, reference="Ref9")
+        self.assertEqual(len(elements), 1)
+        self.assertEqual(elements[0].reference, "Ref9")
+
+        # Claim the rest
+        elements = db_util.get_next_queue_elements("Batch", 100)
+        self.assertEqual(len(elements), 5)
+
+        elements = db_util.get_next_queue_elements("Batch", 100)
+        self.assertEqual(len(elements), 0)
+
+    def test_queue_element_pages(self):
+        """Test paging through queue elements with cursors."""
+        refs = tuple(f"Ref{i:02}" for i in range(25))
+        db_util.bulk_create_queue_elements("Pages", references=refs, data=(None,) * 25)
+        db_util.bulk_set_queue_element_status([(e.id, QueueStatus.DONE, None) for e in db_util.get_queue_elements("Pages", limit=10)])
+
+        for order_by, order_desc in (("created_date", False), ("created_date", True), ("status", False), ("status", True)):
+            all_ids = [e.id for e in db_util.get_queue_elements("Pages", limit=None, order_by=order_by, order_desc=order_desc)]
+
+            ids = []
+            cursor = None
+            while True:
+                page = db_util.get_queue_elements("Pages", limit=10, order_by=order_by, order_desc=order_desc, after=cursor)
+                if not page:
+                    break
+                ids.extend(e.id for e in page)
+                cursor = db_util.get_queue_element_cursor(page[-1], order_by)
+
+            self.assertEqual(ids, all_ids)
+
+        # Nullable columns can't be used with cursors
+        element = db_util.get_queue_elements("Pages", limit=1)[0]
+        self.assertIsNone(db_util.get_queue_element_cursor(element, "message"))
+        with self.assertRaises(ValueError):
+            db_util.get_queue_elements("Pages", order_by="message", after=(None, element.id))
+
+        # Counts with and without the Queue_Counts table
+        _, count = db_util.get_queue_elements("Pages", include_count=True)
+        self.assertEqual(count, 25)
+        _, count = db_util.get_queue_elements("Pages", status=QueueStatus.DONE, include_count=True)
+        self.assertEqual(count, 10)
+        _, count = db_util.get_queue_elements("Pages", search_term="Ref1", include_count=True)
+        self.assertEqual(count, 10)
+        _, count = db_util.get_queue_elements("Empty", include_count=True)
+        self.assertEqual(count, 0)
+
+    def test_token_search(self):
+        """Test searching queue elements with the token search backend."""
+        conn_string = os.environ["CONN_STRING"]
+        separator = "&" if "?" in conn_string else "?"
+        token_conn_string = f"{conn_string}{separator}search_backend=token"
+
+        with self.assertRaises(ValueError):
+            db_util.connect(f"{conn_string}{separator}search_backend=magic")
+
+        # Elements created before the backend is enabled need a rebuild of the index
+        db_util.create_queue_element("Search", "Old", "Old element")
+        self.assertTrue(db_util.connect(token_conn_string))
+        self.assertEqual(len(db_util.get_queue_elements("Search", search_term="old")), 0)
+        db_util.rebuild_queue_search_index()
+        self.assertEqual(len(db_util.get_queue_elements("Search", search_term="old")), 1)
+
+        element = db_util.create_queue_element("Search", "Ref-ABC", '{"name": "Hans Hansen"}')
+        db_util.bulk_create_queue_elements("Search", ("Ref-DEF", "Ref-GHI"), ('{"name": "Grete"}', None))
+        db_util.create_queue_element("Other Queue", "Ref-ABC", '{"name": "Hans Hansen"}')
+
+        def search(term: str) -> set[str | None]:
+            return {e.reference for e in db_util.get_queue_elements("Search", search_term=term)}
+
+        # Words and word prefixes in any case and order
+        self.assertEqual(search("hans"), {"Ref-ABC"})
+        self.assertEqual(search("HANSEN hans"), {"Ref-ABC"})
+        self.assertEqual(search("gre"), {"Ref-DEF"})
+        self.assertEqual(search("ref"), {"Ref-ABC", "Ref-DEF", "Ref-GHI"})
+        self.assertEqual(search("ansen"), set())
+        self.assertEqual(search("hans grete"), set())
+
+        # Terms without words use LIKE
+        self.assertEqual(search("Ref-"), {"Ref-ABC", "Ref-DEF", "Ref-GHI"})
+
+        # Counts use the index as well
+        _, count = db_util.get_queue_elements("Search", search_term="ref", include_count=True)
+        self.assertEqual(count, 3)
+
+        # Messages are replaced
+        db_util.set_queue_element_status(element.id, QueueStatus.FAILED, "Invoice 42 missing")
+        self.assertEqual(search("invoice 42"), {"Ref-ABC"})
+        db_util.set_queue_element_status(element.id, QueueStatus.DONE, "Sent")
+        self.assertEqual(search("invoice"), set())
+        self.assertEqual(search("sent"), {"Ref-ABC"})
+
+        ghi = db_util.get_queue_elements("Search", reference="Ref-GHI")[0]
+        db_util.bulk_set_queue_element_status([(element.id, QueueStatus.DONE, "Archived"), (ghi.id, QueueStatus.DONE, "Archived")])
+        self.assertEqual(search("archived"), {"Ref-ABC", "Ref-GHI"})
+        self.assertEqual(search("sent"), set())
+
+        # Deleted elements are removed from the index
+        db_util.delete_queue_element(element.id)
+        self.assertEqual(search("hans"), set())
+
+        # The same data is found with the like backend
+        db_util.connect(conn_string)
+        self.assertEqual(search("Ref-G"), {"Ref-GHI"})
+        self.assertEqual(search("rete"), {"Ref-DEF"})
+
+    def test_bulk_set_queue_element_status(self):
+        """Test setting the status of multiple queue elements at once."""
+        refs = tuple(f"Ref{i}" for i in range(6))
+        db_util.bulk_create_queue_elements("Bulk Status", references=refs, data=(None,) * 6)
+        elements = db_util.get_queue_elements("Bulk Status")
+
+        updates = [(e.id, QueueStatus.DONE, "Done message") for e in elements[:3]]
+        updates += [(str(e.id), QueueStatus.FAILED, None) for e in elements[3:5]]
+        updates.append((elements[5].id, QueueStatus.IN_PROGRESS, None))
+        db_util.bulk_set_queue_element_status(updates)
+
+        done = db_util.get_queue_elements("Bulk Status", status=QueueStatus.DONE)
+        self.assertEqual(len(done), 3)
+        self.assertTrue(all(e.message == "Done message" and e.end_date is not None for e in done))
+
+        failed = db_util.get_queue_elements("Bulk Status", status=QueueStatus.FAILED)
+        self.assertEqual(len(failed), 2)
+        self.assertTrue(all(e.message is None and e.end_date is not None for e in failed))
+
+        in_progress = db_util.get_queue_elements("Bulk Status", status=QueueStatus.IN_PROGRESS)
+        self.assertEqual(len(in_progress), 1)
+        self.assertIsNotNone(in_progress[0].start_date)
+        self.assertIsNone(in_progress[0].end_date)
+
+        # Unknown ids roll back the whole update
+        with self.assertRaises(ValueError):
+            db_util.bulk_set_queue_element_status([(elements[0].id, QueueStatus.NEW, None), (uuid4(), QueueStatus.NEW, None)])
+
+        self.assertEqual(db_util.get_queue_elements("Bulk Status", status=QueueStatus.NEW), ())
+
+    def test_concurrent_queue_claims(self):
+        """Test that concurrent workers never claim the same queue element."""
+        num_elements = 20
+        refs = tuple(f"Ref{i}" for i in range(num_elements))
+        db_util.bulk_create_queue_elements("Concurrent", references=refs, data=(None,) * num_elements)
+
+        def drain_queue() -> list:
+            claimed = []
+            while (element := db_util.get_next_queue_element("Concurrent")) is not None:
+                claimed.append(element.id)
+            return claimed
+
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda _: drain_queue(), range(4)))
+
+        claimed_ids = [element_id for result in results for element_id in result]
+        self.assertEqual(len(claimed_ids), num_elements)
+        self.assertEqual(len(set(claimed_ids)), num_elements)
+
+        elements = db_util.get_queue_elements("Concurrent", status=QueueStatus.IN_PROGRESS)
+        self.assertEqual(len(elements), num_elements)
+        self.assertTrue(all(element.start_date is not None for element in elements))
+
+    def test_queue_counts(self):
+        """Test that the queue counts follow the changes to the queue elements."""
+        refs = tuple(f"Ref{i}" for i in range(5))
+        db_util.bulk_create_queue_elements("Counted", references=refs, data=(None,) * 5)
+        db_util.create_queue_element("Counted")
+        self.assertEqual(db_util.get_queue_count()["Counted"], {QueueStatus.NEW: 6})
+
+        elements = db_util.get_next_queue_elements("Counted", 3)
+        db_util.set_queue_element_status(elements[0].id, QueueStatus.DONE)
+        db_util.bulk_set_queue_element_status([(elements[1].id, QueueStatus.FAILED, None), (elements[2].id, QueueStatus.FAILED, None)])
+        db_util.delete_queue_element(elements[0].id)
+
+        expected = {QueueStatus.NEW: 3, QueueStatus.FAILED: 2}
+        self.assertEqual(db_util.get_queue_count()["Counted"], expected)
+
+        # Rebuilding the counts gives the same result
+        db_util.rebuild_queue_counts()
+        self.assertEqual(db_util.get_queue_count()["Counted"], expected)
+
+        # Failed updates don't change the counts
+        with self.assertRaises(ValueError):
+            db_util.bulk_set_queue_element_status([(elements[1].id, QueueStatus.DONE, None), (uuid4(), QueueStatus.DONE, None)])
+
+        self.assertEqual(db_util.get_queue_count()["Counted"], expected)
+
+        # Setting the same status again doesn't change the counts
+        db_util.set_queue_element_status(elements[1].id, QueueStatus.FAILED, "Message")
+        new_element = db_util.get_queue_elements("Counted", status=QueueStatus.NEW)[0]
+        db_util.set_queue_element_status(new_element.id, QueueStatus.NEW, "Message")
+        self.assertEqual(db_util.get_queue_count()["Counted"], expected)
+
+    def test_queue_count_shards(self):
+        """Test that counts spread over several shards are summed when read."""
+        db_test_util.reset_triggers()
+        db_util.create_queue_trigger("Trigger", "", "Sharded", "", "", False, False, 3, 0)
+
+        with patch("OpenOrchestrator.database.db_util.random.randrange", side_effect=[0, 1, 2, 3]):
+            for _ in range(3):
+                db_util.create_queue_element("Sharded")
+            db_util.get_next_queue_element("Sharded")
+
+        with db_util._get_session() as session:  # pylint: disable=protected-access
+            shards = set(session.scalars(select(QueueCount.shard).where(QueueCount.count != 0)))
+        self.assertEqual(shards, {0, 1, 2, 3})
+
+        expected = {QueueStatus.NEW: 2, QueueStatus.IN_PROGRESS: 1}
+        self.assertEqual(db_util.get_queue_count()["Sharded"], expected)
+        self.assertEqual(db_util.get_queue_elements("Sharded", include_count=True)[1], 3)
+        self.assertEqual(db_util.get_queue_elements("Sharded", status=QueueStatus.NEW, include_count=True)[1], 2)
+
+        # The trigger needs 3 new elements
+        self.assertEqual(db_util.get_pending_queue_triggers(), [])
+        db_util.create_queue_element("Sharded")
+        self.assertEqual(len(db_util.get_pending_queue_triggers()), 1)
+
+        # Rebuilding moves the counts to the first shard
+        db_util.rebuild_queue_counts()
+        with db_util._get_session() as session:  # pylint: disable=protected-access
+            shards = set(session.scalars(select(QueueCount.shard).where(QueueCount.count != 0)))
+        self.assertEqual(shards, {0})
+        self.assertEqual(db_util.get_queue_count()["Sharded"], {QueueStatus.NEW: 3, QueueStatus.IN_PROGRESS: 1})
+
+    def test_queue_counts_stale_cache(self):
+        """Test that the queue counts stay correct when another process has checked the queue before a rebuild."""
+        db_util.create_queue_element("Stale")
+
+        # Empty the queue without using db_util and rebuild the counts
+        with db_util._get_session() as session:  # pylint: disable=protected-access
+            session.execute(delete(QueueElement).where(QueueElement.queue_name == "Stale"))
+            session.commit()
+        db_util.rebuild_queue_counts()
+        self.assertNotIn("Stale", db_util.get_queue_count())
+
+        # Another process still remembers the queue as checked
+        db_util._counted_queues.add("Stale")  # pylint: disable=protected-access
+        db_util.create_queue_element("Stale")
+        db_util.create_queue_element("Stale")
+        self.assertEqual(db_util.get_queue_count()["Stale"], {QueueStatus.NEW: 2})
+
+        # Missing rows are created when the counts are adjusted
+        with db_util._get_session() as session:  # pylint: disable=protected-access
+            session.execute(delete(QueueCount).where(QueueCount.queue_name == "Stale"))
+            session.commit()
+        db_util.create_queue_element("Stale")
+        self.assertEqual(db_util.get_queue_count()["Stale"], {QueueStatus.NEW: 1})
+
+    def test_queue_element_lock(self):
+        """Test that queue elements are locked with a table hint on MSSQL."""
+        query = db_util._lock_queue_element_query(uuid4())  # pylint: disable=protected-access
+        sql = str(query.compile(dialect=mssql.dialect()))
+        self.assertIn("WITH (ROWLOCK, UPDLOCK)", sql)
+
     def test_triggers(self):
         """Test generic trigger functionality."""
         db_test_util.reset_triggers()
@@ -312,6 +641,61 @@ class TestDBUtil(unittest.TestCase):
         trigger_list = db_util.get_pending_queue_triggers()
         self.assertEqual(len(trigger_list), 0)
 
+    def test_claim_next_trigger(self):
+        """Test claiming triggers in priority and type order."""
+        db_test_util.reset_triggers()
+        db_util.create_queue_element("Trigger Queue")
+        db_util.create_queue_element("Trigger Queue")
+
+        # Single > Scheduled > Queue
+        trigger = db_util.claim_next_trigger("Machine", exclusive=False, allow_blocking=True)
+        self.assertEqual(trigger.trigger_name, "Single")
+        self.assertEqual(trigger.process_status, TriggerStatus.RUNNING)
+        self.assertIsNotNone(trigger.last_run)
+
+        trigger = db_util.claim_next_trigger("Machine", exclusive=False, allow_blocking=True)
+        self.assertEqual(trigger.trigger_name, "Scheduled")
+        self.assertGreater(trigger.next_run, datetime.now())
+        self.assertEqual(db_util.get_trigger(trigger.id).next_run, trigger.next_run)
+
+        trigger = db_util.claim_next_trigger("Machine", exclusive=False, allow_blocking=True)
+        self.assertEqual(trigger.trigger_name, "Queue")
+        self.assertEqual(db_util.get_trigger(trigger.id).process_status, TriggerStatus.RUNNING)
+
+        trigger = db_util.claim_next_trigger("Machine", exclusive=False, allow_blocking=True)
+        self.assertIsNone(trigger)
+
+    def test_next_trigger_run(self):
+        """Test getting the earliest next run of the idle triggers."""
+        self.assertIsNone(db_util.get_next_trigger_run())
+
+        db_util.create_single_trigger("Single", "", datetime(2100, 1, 2), "", "", False, False, 0)
+        db_util.create_scheduled_trigger("Scheduled", "", "0 0 * * *", datetime(2100, 1, 1), "", "", False, False, 0)
+        self.assertEqual(db_util.get_next_trigger_run(), datetime(2100, 1, 1))
+
+        # Triggers that aren't idle are ignored
+        trigger = db_util.get_scheduled_triggers()[0]
+        db_util.set_trigger_status(trigger.id, TriggerStatus.PAUSED)
+        self.assertEqual(db_util.get_next_trigger_run(), datetime(2100, 1, 2))
+
+    def test_concurrent_trigger_claims(self):
+        """Test that concurrent Schedulers never claim the same trigger."""
+        for i in range(10):
+            db_util.create_single_trigger(f"Trigger {i}", "Process", datetime(2000, 1, 1), "", "", False, False, 0)
+
+        def claim_all() -> list:
+            claimed = []
+            while (trigger := db_util.claim_next_trigger("Machine", exclusive=False, allow_blocking=True)) is not None:
+                claimed.append(trigger.id)
+            return claimed
+
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda _: claim_all(), range(4)))
+
+        claimed_ids = [trigger_id for result in results for trigger_id in result]
+        self.assertEqual(len(claimed_ids), 10)
+        self.assertEqual(len(set(claimed_ids)), 10)
+
     def test_log_truncation(self):
         """Create logs with various lengths and test if their length is as expected"""
         # Create some logs
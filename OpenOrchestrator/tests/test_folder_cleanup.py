@@ -0,0 +1,72 @@
+"""This module tests the OpenOrchestrator.scheduler.folder_cleanup module."""
+
+import unittest
+from unittest.mock import patch
+import os
+import tempfile
+
+from OpenOrchestrator.scheduler import folder_cleanup, util
+
+
+class TestFolderCleanup(unittest.TestCase):
+    """Test the background folder cleanup of the Scheduler."""
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        folder_cleanup.pop_report()
+
+        patcher = patch("OpenOrchestrator.scheduler.folder_cleanup.RETRY_DELAYS", (0, 0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        util.remove_folder(self.temp_dir)
+
+    def _create_folder(self, name: str, size: int) -> str:
+        folder_path = os.path.join(self.temp_dir, name)
+        os.makedirs(os.path.join(folder_path, "sub"))
+        with open(os.path.join(folder_path, "sub", "file.txt"), "wb") as file:
+            file.write(b"x" * size)
+        return folder_path
+
+    def test_remove_folder(self):
+        """Test that queued folders are removed and the reclaimed space is reported."""
+        folder1 = self._create_folder("folder1", 1000)
+        folder2 = self._create_folder("folder2", 500)
+
+        folder_cleanup.remove_folder_async(folder1)
+        folder_cleanup.remove_folder_async(folder2)
+        folder_cleanup.wait_for_cleanup()
+
+        self.assertFalse(os.path.exists(folder1))
+        self.assertFalse(os.path.exists(folder2))
+        self.assertEqual(folder_cleanup.pop_report(), (1500, []))
+
+        # The report is reset
+        self.assertEqual(folder_cleanup.pop_report(), (0, []))
+
+    def test_retry(self):
+        """Test that a failed removal is retried."""
+        folder = self._create_folder("folder", 100)
+
+        with patch("OpenOrchestrator.scheduler.util.remove_folder", side_effect=[PermissionError(), None]) as mock_remove:
+            folder_cleanup.remove_folder_async(folder)
+            folder_cleanup.wait_for_cleanup()
+
+        self.assertEqual(mock_remove.call_count, 2)
+        self.assertEqual(folder_cleanup.pop_report(), (100, []))
+
+    def test_failed_removal(self):
+        """Test that a folder that can't be removed is reported."""
+        folder = self._create_folder("folder", 100)
+
+        with patch("OpenOrchestrator.scheduler.util.remove_folder", side_effect=PermissionError()) as mock_remove:
+            folder_cleanup.remove_folder_async(folder)
+            folder_cleanup.wait_for_cleanup()
+
+        self.assertEqual(mock_remove.call_count, 3)
+        self.assertTrue(os.path.exists(folder))
+        self.assertEqual(folder_cleanup.pop_report(), (0, [folder]))
+
+
+if __name__ == '__main__':
+    unittest.main()
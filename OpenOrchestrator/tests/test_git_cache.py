@@ -0,0 +1,84 @@
+"""This module tests the OpenOrchestrator.scheduler.git_cache module."""
+
+import unittest
+from unittest.mock import patch
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from OpenOrchestrator.scheduler import git_cache, util
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed.")
+class TestGitCache(unittest.TestCase):
+    """Test the git mirror cache of the Scheduler."""
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_folder = os.path.join(self.temp_dir, "cache")
+
+        patcher = patch("OpenOrchestrator.scheduler.git_cache.get_cache_folder_path", return_value=self.cache_folder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Create a repo to mirror
+        self.repo_path = os.path.join(self.temp_dir, "repo")
+        self._git("init", "--quiet", "-b", "main", self.repo_path)
+        self._commit("main.py")
+
+    def tearDown(self) -> None:
+        util.remove_folder(self.temp_dir)
+
+    def _git(self, *args: str) -> str:
+        env = {**os.environ, "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@test", "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@test"}
+        result = subprocess.run(["git", *args], check=True, capture_output=True, text=True, env=env)
+        return result.stdout.strip()
+
+    def _commit(self, file_name: str):
+        with open(os.path.join(self.repo_path, file_name), "w", encoding="utf-8") as file:
+            file.write(file_name)
+        self._git("-C", self.repo_path, "add", file_name)
+        self._git("-C", self.repo_path, "commit", "--quiet", "-m", file_name)
+
+    def test_update_mirror(self):
+        """Test creating and updating a mirror."""
+        mirror_path = git_cache.update_mirror(self.repo_path)
+        self.assertEqual(mirror_path, git_cache.get_mirror_path(self.repo_path))
+        self.assertEqual(os.listdir(self.cache_folder), [os.path.basename(mirror_path)])
+
+        # New commits and branches are fetched
+        self._git("-C", self.repo_path, "checkout", "--quiet", "-b", "feature")
+        self._commit("feature.py")
+        git_cache.update_mirror(self.repo_path)
+
+        head = self._git("-C", self.repo_path, "rev-parse", "HEAD")
+        self.assertEqual(self._git("--git-dir", mirror_path, "rev-parse", "feature"), head)
+
+        # A failed clone leaves nothing behind
+        with self.assertRaises(subprocess.CalledProcessError):
+            git_cache.update_mirror(os.path.join(self.temp_dir, "missing"))
+        self.assertEqual(os.listdir(self.cache_folder), [os.path.basename(mirror_path)])
+
+    def test_evict_mirrors(self):
+        """Test evicting mirrors by age and size."""
+        old_mirror = git_cache.update_mirror(self.repo_path)
+        new_mirror = git_cache.update_mirror(self.repo_path + os.sep)
+
+        # Unused for too long
+        os.utime(old_mirror, (time.time() - 100, time.time() - 100))
+        git_cache.evict_mirrors(max_age=50, force=True)
+        self.assertFalse(os.path.exists(old_mirror))
+        self.assertTrue(os.path.exists(new_mirror))
+
+        # The eviction is rate limited
+        git_cache.evict_mirrors(max_bytes=0)
+        self.assertTrue(os.path.exists(new_mirror))
+
+        # Too big
+        git_cache.evict_mirrors(max_bytes=0, force=True)
+        self.assertFalse(os.path.exists(new_mirror))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""This module tests the headless Scheduler."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import logging
+
+from OpenOrchestrator.scheduler import headless
+
+
+class TestHeadlessScheduler(unittest.TestCase):
+    """Test the event loop and logging of the headless Scheduler."""
+    def test_after(self):
+        """Test that scheduled calls run in order and can be cancelled."""
+        app = headless.HeadlessApplication()
+        calls = []
+
+        app.after(20, calls.append, "Second")
+        app.after(0, calls.append, "First")
+        cancel_id = app.after(10, calls.append, "Cancelled")
+        app.after_cancel(cancel_id)
+
+        app.mainloop()
+        self.assertEqual(calls, ["First", "Second"])
+
+    @patch("OpenOrchestrator.scheduler.run_tab.runner")
+    @patch("OpenOrchestrator.scheduler.run_tab.db_util")
+    def test_stop(self, mock_db_util: MagicMock, mock_runner: MagicMock):
+        """Test that a stop request ends the Scheduler loop."""
+        mock_db_util.get_next_trigger_run.return_value = None
+        mock_runner.claim_trigger.return_value = None
+
+        app = headless.HeadlessApplication()
+        app.start()
+        app.after(50, app.request_stop)
+        app.mainloop()
+
+        self.assertFalse(app.running)
+        self.assertIsNone(app.loop_after_id)
+        self.assertGreaterEqual(mock_runner.claim_trigger.call_count, 1)
+
+    def test_log_stream(self):
+        """Test that printed lines are written to the log."""
+        target = MagicMock(spec=logging.Logger)
+        stream = headless._LogStream(target)  # pylint: disable=protected-access
+
+        print("Checking triggers...", file=stream)
+        print("Running trigger: ", "Trigger", file=stream, end="")
+        target.info.assert_called_once_with("Checking triggers...")
+
+        print(file=stream)
+        target.info.assert_called_with("Running trigger:  Trigger")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""This module contains tests for buffered logging through OrchestratorConnection."""
+
+import unittest
+import os
+import time
+
+from OpenOrchestrator.orchestrator_connection.connection import OrchestratorConnection
+from OpenOrchestrator.orchestrator_connection.log_buffer import LogBuffer
+from OpenOrchestrator.common import crypto_util
+from OpenOrchestrator.database import db_util
+from OpenOrchestrator.database.logs import LogLevel
+
+from OpenOrchestrator.tests import db_test_util
+
+
+class TestLogBuffer(unittest.TestCase):
+    """Tests for LogBuffer."""
+    def setUp(self) -> None:
+        db_test_util.establish_clean_database()
+
+    def test_error_flush(self):
+        """Test that error logs flush the buffer immediately and keep the log times."""
+        log_buffer = LogBuffer(flush_interval=60, max_records=100)
+
+        log_buffer.add("Process", LogLevel.TRACE, "Trace")
+        time.sleep(0.01)
+        log_buffer.add("Process", LogLevel.INFO, "Info")
+        self.assertEqual(len(db_util.get_logs(0, 100)), 0)
+
+        log_buffer.add("Process", LogLevel.ERROR, "Error")
+        logs = db_util.get_logs(0, 100)
+        self.assertEqual([log.log_message for log in logs], ["Error", "Info", "Trace"])
+        self.assertLess(logs[2].log_time, logs[1].log_time)
+
+        log_buffer.close()
+
+    def test_batch_flush(self):
+        """Test that the buffer is flushed when it's full and when it's closed."""
+        log_buffer = LogBuffer(flush_interval=60, max_records=5)
+
+        for i in range(5):
+            log_buffer.add("Process", LogLevel.TRACE, f"Message {i}")
+
+        # Wait for the background thread to write the full batch
+        for _ in range(50):
+            if len(db_util.get_logs(0, 100)) == 5:
+                break
+            time.sleep(0.1)
+
+        self.assertEqual(len(db_util.get_logs(0, 100)), 5)
+
+        log_buffer.add("Process", LogLevel.TRACE, "Last message")
+        log_buffer.close()
+        self.assertEqual(len(db_util.get_logs(0, 100)), 6)
+
+        with self.assertRaises(RuntimeError):
+            log_buffer.add("Process", LogLevel.TRACE, "Closed")
+
+    def test_connection_buffer(self):
+        """Test buffered logging through OrchestratorConnection."""
+        connection = OrchestratorConnection("Process", os.environ["CONN_STRING"], crypto_util.get_key(), "", "", buffer_logs=True)
+
+        connection.log_trace("Trace")
+        connection.log_info("Info")
+        connection.flush_logs()
+        self.assertEqual(len(db_util.get_logs(0, 100)), 2)
+
+        connection.log_error("Error")
+        self.assertEqual(len(db_util.get_logs(0, 100)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
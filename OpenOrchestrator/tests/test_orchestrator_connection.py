@@ -126,6 +126,11 @@ class TestOrchestratorConnection(unittest.TestCase):
         element2 = self.connection.get_next_queue_element("Bulk Queue")
         self.assertNotEqual(element, element2)
 
+        # Get next batch
+        elements = self.connection.get_next_queue_elements("Bulk Queue", 3)
+        self.assertEqual(len(elements), 3)
+        self.assertTrue(all(e.status == QueueStatus.IN_PROGRESS for e in elements))
+
         # Set status
         self.connection.set_queue_element_status(element.id, QueueStatus.DONE)
         elements = self.connection.get_queue_elements("Bulk Queue", status=QueueStatus.DONE)
@@ -0,0 +1,61 @@
+"""This module tests the OpenOrchestrator.scheduler.output_capture module."""
+
+import unittest
+import subprocess
+import sys
+
+from OpenOrchestrator.database import db_util
+from OpenOrchestrator.scheduler.output_capture import OutputCapture
+
+from OpenOrchestrator.tests import db_test_util
+
+
+class TestOutputCapture(unittest.TestCase):
+    """Test the capture of process output in the Scheduler."""
+    def setUp(self) -> None:
+        db_test_util.establish_clean_database()
+
+    def _start(self, code: str) -> subprocess.Popen:
+        # pylint: disable-next=consider-using-with
+        return subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+    def test_large_output(self):
+        """Test that a process writing more than the pipe buffer doesn't block
+        and that only the tail of the output is kept.
+        """
+        process = self._start("import sys\nfor i in range(100_000): print(f'Line {i}', file=sys.stderr)\nraise SystemExit(1)")
+        capture = OutputCapture(process, "Process", forward_logs=False, max_chars=1000)
+
+        self.assertEqual(process.wait(timeout=30), 1)
+        capture.close()
+
+        error = capture.get_error()
+        self.assertTrue(error.startswith("..."))
+        self.assertTrue(error.endswith("Line 99999\n"))
+        self.assertLessEqual(len(error), 1003)
+
+    def test_small_output(self):
+        """Test that short output is kept in full."""
+        process = self._start("import sys\nprint('Out')\nprint('Error', file=sys.stderr)")
+        capture = OutputCapture(process, "Process", forward_logs=False)
+
+        process.wait(timeout=30)
+        capture.close()
+
+        self.assertEqual(capture.get_error(), "Error\n")
+        self.assertEqual(capture.stdout_tail.get(), "Out\n")
+
+    def test_forward_logs(self):
+        """Test that the output lines are written to the Logs table."""
+        process = self._start("import sys\nprint('Out 1')\nprint('Out 2')\nprint()\nprint('Error', file=sys.stderr)")
+        capture = OutputCapture(process, "Process", forward_logs=True)
+
+        process.wait(timeout=30)
+        capture.close()
+
+        logs = db_util.get_logs(0, 100, process_name="Process")
+        self.assertCountEqual([log.log_message for log in logs], ["Out 1", "Out 2", "Error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
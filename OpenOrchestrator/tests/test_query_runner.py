@@ -0,0 +1,67 @@
+"""This module tests the QueryRunner used by Orchestrator to run filter queries."""
+
+import asyncio
+import threading
+import unittest
+
+from nicegui import core
+
+from OpenOrchestrator.orchestrator.query_runner import QueryRunner
+
+
+class TestQueryRunner(unittest.IsolatedAsyncioTestCase):
+    """Test debouncing and cancelling of queries."""
+    async def asyncSetUp(self) -> None:
+        core.loop = asyncio.get_running_loop()
+
+    async def test_debounce(self):
+        """Test that only the last of several rapid queries is run."""
+        runner = QueryRunner()
+        queries = []
+        results = []
+
+        for i in range(5):
+            runner.submit(lambda i=i: queries.append(i) or i, results.append, delay=0.05)
+            await asyncio.sleep(0.01)
+
+        await asyncio.sleep(0.3)
+
+        self.assertEqual(queries, [4])
+        self.assertEqual(results, [4])
+
+    async def test_superseded_result(self):
+        """Test that the result of a running query is discarded when it's superseded."""
+        runner = QueryRunner()
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def slow_query():
+            started.set()
+            release.wait(5)
+            return "Slow"
+
+        runner.submit(slow_query, results.append, delay=0)
+        await asyncio.to_thread(started.wait, 5)
+
+        runner.submit(lambda: "Fast", results.append, delay=0)
+        await asyncio.sleep(0.2)
+        release.set()
+        await asyncio.sleep(0.2)
+
+        self.assertEqual(results, ["Fast"])
+
+    async def test_cancel(self):
+        """Test that a cancelled query isn't run."""
+        runner = QueryRunner()
+        results = []
+
+        runner.submit(lambda: "Result", results.append, delay=0.05)
+        runner.cancel()
+        await asyncio.sleep(0.2)
+
+        self.assertEqual(results, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""This module tests the retention of logs and queue elements."""
+
+from datetime import datetime, timedelta
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import select
+
+from OpenOrchestrator.database import db_util, retention
+from OpenOrchestrator.database.logs import LogLevel
+from OpenOrchestrator.database.queues import QueueElement, QueueSearchToken, QueueStatus
+from OpenOrchestrator.scheduler import retention_job
+
+from OpenOrchestrator.tests import db_test_util
+
+
+class TestRetention(unittest.TestCase):
+    """Test applying retention policies."""
+    def setUp(self) -> None:
+        db_test_util.establish_clean_database()
+
+    def _create_logs(self):
+        """Create a new and a 10 days old log for process A and B."""
+        now = datetime.now()
+        old = now - timedelta(days=10)
+        db_util.bulk_create_logs([
+            ("A", LogLevel.INFO, "Old A", old),
+            ("A", LogLevel.INFO, "New A", now),
+            ("B", LogLevel.INFO, "Old B", old),
+            ("B", LogLevel.INFO, "New B", now),
+        ])
+
+    def test_logs(self):
+        """Test that only logs older than their process's policy are deleted."""
+        self._create_logs()
+
+        policy = retention.RetentionPolicy(logs={"A": 5, "*": 30})
+        report = retention.apply_policy(policy)
+
+        self.assertEqual(report.logs_deleted, 1)
+        self.assertGreater(report.bytes_reclaimed, 0)
+
+        messages = {log.log_message for log in db_util.get_logs(0, 100)}
+        self.assertEqual(messages, {"New A", "Old B", "New B"})
+
+        # The default applies to B
+        policy = retention.RetentionPolicy(logs={"A": None, "*": 5})
+        report = retention.apply_policy(policy)
+
+        messages = {log.log_message for log in db_util.get_logs(0, 100)}
+        self.assertEqual(messages, {"New A", "New B"})
+
+    def test_batches(self):
+        """Test that logs are deleted in several batches."""
+        old = datetime.now() - timedelta(days=10)
+        db_util.bulk_create_logs([("A", LogLevel.INFO, f"Log {i}", old) for i in range(25)])
+
+        policy = retention.RetentionPolicy(logs={"*": 1}, batch_size=10)
+        report = retention.apply_policy(policy)
+
+        self.assertEqual(report.logs_deleted, 25)
+        self.assertEqual(len(db_util.get_logs(0, 100)), 0)
+
+    def test_queue_elements(self):
+        """Test that only finished queue elements are deleted and that counts and search tokens follow."""
+        db_util.bulk_create_queue_elements("Queue 1", tuple(f"Ref {i}" for i in range(4)), (None,) * 4)
+        db_util.bulk_create_queue_elements("Queue 2", ("Ref",), (None,))
+        db_util.rebuild_queue_search_index()
+
+        elements = db_util.get_queue_elements("Queue 1", order_by="reference")
+        db_util.set_queue_element_status(elements[0].id, QueueStatus.DONE)
+        db_util.set_queue_element_status(elements[1].id, QueueStatus.FAILED)
+        db_util.set_queue_element_status(elements[2].id, QueueStatus.IN_PROGRESS)
+        db_util.set_queue_element_status(db_util.get_queue_elements("Queue 2")[0].id, QueueStatus.DONE)
+
+        policy = retention.RetentionPolicy(queues={"Queue 1": 5})
+        report = retention.apply_policy(policy, now=datetime.now() + timedelta(days=10))
+
+        self.assertEqual(report.queue_elements_deleted, 2)
+
+        references = {element.reference for element in db_util.get_queue_elements("Queue 1")}
+        self.assertEqual(references, {"Ref 2", "Ref 3"})
+        self.assertEqual(len(db_util.get_queue_elements("Queue 2")), 1)
+
+        self.assertEqual(db_util.get_queue_count(), {
+            "Queue 1": {QueueStatus.NEW: 1, QueueStatus.IN_PROGRESS: 1},
+            "Queue 2": {QueueStatus.DONE: 1}
+        })
+
+        with db_util._get_session() as session:  # pylint: disable=protected-access
+            element_ids = set(session.scalars(select(QueueElement.id)))
+            token_ids = set(session.scalars(select(QueueSearchToken.element_id)))
+        self.assertEqual(token_ids, element_ids)
+
+    def test_archive(self):
+        """Test that deleted rows are written to the archive."""
+        self._create_logs()
+
+        with tempfile.TemporaryDirectory() as folder:
+            policy = retention.RetentionPolicy(logs={"*": 5}, archive_folder=folder)
+            report = retention.apply_policy(policy)
+
+            self.assertEqual(len(report.archive_files), 1)
+
+            with gzip.open(report.archive_files[0], "rt", encoding="utf-8") as file:
+                rows = [json.loads(line) for line in file]
+
+        self.assertEqual({row["log_message"] for row in rows}, {"Old A", "Old B"})
+        self.assertEqual(rows[0]["log_level"], "Info")
+
+    def test_load_policy(self):
+        """Test reading and validating policy files."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "policy.json")
+
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({"logs": {"*": 30}, "queues": {"Queue": None}, "batch_size": 500}, file)
+
+            policy = retention.load_policy(path)
+            self.assertEqual(policy.logs, {"*": 30})
+            self.assertEqual(policy.queues, {"Queue": None})
+            self.assertEqual(policy.batch_size, 500)
+
+            for data in ({"logs": {"*": -1}}, {"logs": {"*": "30"}}, {"log": {}}, {"batch_size": 0}, []):
+                with self.assertRaises(ValueError):
+                    retention.parse_policy(data)
+
+    def test_retention_job(self):
+        """Test running a policy from the Scheduler."""
+        self._create_logs()
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "policy.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({"logs": {"*": 5}}, file)
+
+            retention_job.set_policy(path)
+            self.assertTrue(retention_job.run_if_due())
+            retention_job.wait_for_run(10)
+
+            # Not due again until the interval has passed
+            self.assertFalse(retention_job.run_if_due())
+            retention_job.set_policy(None)
+
+        messages = retention_job.pop_report()
+        self.assertEqual(len(messages), 1)
+        self.assertIn("2 logs", messages[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
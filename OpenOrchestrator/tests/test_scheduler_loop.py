@@ -0,0 +1,117 @@
+"""This module tests the scheduling of the Scheduler's main loop."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from datetime import datetime, timedelta
+
+from OpenOrchestrator.scheduler import run_tab
+
+
+TEST_MODULE = "OpenOrchestrator.scheduler.run_tab"
+
+
+class TestSchedulerLoop(unittest.TestCase):
+    """Test the adaptive timing of the Scheduler loop."""
+    def test_get_next_delay(self):
+        """Test calculating the delay before the next loop."""
+        self.assertEqual(run_tab.get_next_delay(30_000, False, None), 30_000)
+
+        # Running jobs cap the delay
+        self.assertEqual(run_tab.get_next_delay(30_000, True, None), run_tab.RUNNING_POLL_INTERVAL)
+        self.assertEqual(run_tab.get_next_delay(1_000, True, None), 1_000)
+
+        # Wake up for the next trigger
+        delay = run_tab.get_next_delay(30_000, False, datetime.now() + timedelta(seconds=2))
+        self.assertLessEqual(delay, 2_001)
+        self.assertGreater(delay, 1_000)
+
+        # Triggers far in the future or overdue don't change the delay
+        self.assertEqual(run_tab.get_next_delay(30_000, False, datetime.now() + timedelta(hours=1)), 30_000)
+        self.assertEqual(run_tab.get_next_delay(30_000, False, datetime.now() - timedelta(hours=1)), 30_000)
+
+    @patch(f"{TEST_MODULE}.runner")
+    @patch(f"{TEST_MODULE}.db_util")
+    def test_loop_backoff(self, mock_db_util: MagicMock, mock_runner: MagicMock):
+        """Test that the loop backs off when idle and resets when a job is started."""
+        mock_db_util.get_next_trigger_run.return_value = None
+        mock_runner.claim_trigger.return_value = None
+        app = setup_mock_app()
+
+        delays = []
+        for _ in range(7):
+            run_tab.loop(app)
+            delays.append(app.after.call_args.args[0])
+
+        self.assertEqual(delays, [2_000, 4_000, 8_000, 16_000, 30_000, 30_000, 30_000])
+
+        # A started job resets the backoff and starts the process watcher
+        mock_runner.claim_trigger.return_value = MagicMock(is_blocking=True)
+        run_tab.loop(app)
+        self.assertEqual(app.after.call_args_list[-2].args[0], run_tab.MIN_POLL_INTERVAL)
+        self.assertEqual(app.after.call_args_list[-1].args[1], run_tab.watch_processes)
+        self.assertEqual(app.poll_interval, run_tab.MIN_POLL_INTERVAL)
+
+        # Paused with no jobs stops the loop
+        app = setup_mock_app()
+        app.running = False
+        run_tab.loop(app)
+        app.after.assert_not_called()
+
+    @patch(f"{TEST_MODULE}.runner.run_process")
+    @patch(f"{TEST_MODULE}.runner.claim_trigger")
+    def test_fill_slots(self, mock_claim_trigger: MagicMock, mock_run_process: MagicMock):
+        """Test that triggers are started until all job slots are filled."""
+        mock_claim_trigger.side_effect = lambda app: MagicMock(weight=1, is_blocking=False)
+        mock_run_process.side_effect = lambda trigger: MagicMock(trigger=trigger)
+
+        app = setup_mock_app()
+        app.slots = 3
+        self.assertTrue(run_tab.check_triggers(app))
+        self.assertEqual(len(app.running_jobs), 3)
+        self.assertEqual(mock_claim_trigger.call_count, 3)
+
+        # A blocking trigger stops the filling
+        mock_claim_trigger.side_effect = lambda app: MagicMock(weight=1, is_blocking=True)
+        app.running_jobs = []
+        self.assertTrue(run_tab.check_triggers(app))
+        self.assertEqual(len(app.running_jobs), 1)
+
+        # No triggers are started while a blocking job is running
+        mock_claim_trigger.reset_mock()
+        self.assertFalse(run_tab.check_triggers(app))
+        mock_claim_trigger.assert_not_called()
+
+    def test_watch_processes(self):
+        """Test that an exited process triggers a loop right away."""
+        app = setup_mock_app()
+        job = MagicMock()
+        job.process.poll.return_value = None
+        app.running_jobs = [job]
+
+        run_tab.watch_processes(app)
+        app.after.assert_called_once_with(run_tab.PROCESS_WATCH_INTERVAL, run_tab.watch_processes, app)
+
+        job.process.poll.return_value = 0
+        run_tab.watch_processes(app)
+        app.after.assert_called_with(0, run_tab.loop, app)
+        self.assertIsNone(app.watch_after_id)
+
+
+def setup_mock_app() -> MagicMock:
+    """Create a mock Application object to be used in tests.
+
+    Returns:
+        A mock Application object.
+    """
+    mock_app = MagicMock()
+    mock_app.running = True
+    mock_app.running_jobs = []
+    mock_app.loop_after_id = None
+    mock_app.watch_after_id = None
+    mock_app.poll_interval = run_tab.MIN_POLL_INTERVAL
+    mock_app.slots = 1
+    return mock_app
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 """This module tests the OpenOrchestrator.scheduler.runner module."""
 
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, call
+from concurrent.futures import Future
 from datetime import datetime
 import subprocess
 
@@ -20,11 +21,13 @@ class TestSchedulerRunner(unittest.TestCase):
     def setUp(self) -> None:
         db_test_util.establish_clean_database()
 
+    @patch(f"{TEST_MODULE}.git_cache.update_mirror", return_value="mirror_path")
     @patch(f"{TEST_MODULE}.shutil.which", return_value="git")
     @patch(f"{TEST_MODULE}.os.makedirs")
     @patch(f"{TEST_MODULE}.subprocess.run")
     @patch(f"{TEST_MODULE}.get_repo_folder_path", return_value="repo_folder")
-    def test_clone_git_repo(self, mock_get_repo_folder_path: MagicMock, mock_run: MagicMock, mock_makedirs: MagicMock, mock_which: MagicMock):
+    def test_clone_git_repo(self, mock_get_repo_folder_path: MagicMock, mock_run: MagicMock, mock_makedirs: MagicMock, mock_which: MagicMock,
+                            mock_update_mirror: MagicMock):
         """Test the clone_git_repo function of the runner module.
 
         Args:
@@ -32,31 +35,43 @@ class TestSchedulerRunner(unittest.TestCase):
             mock_run: A MagicMock of the subprocess.run function.
             mock_makedirs: A MagicMock of the os.makedirs function.
             mock_which: A MagicMock of the shutil.which function.
+            mock_update_mirror: A MagicMock of the git_cache.update_mirror function.
         """
         repo_url = "https://mock_repo.com/git"
 
         # Run without branch
         repo_path = runner.clone_git_repo(repo_url, "")
 
-        self.assertRegex(repo_path, r"repo_folder\\[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}")
+        self.assertRegex(repo_path, r"repo_folder[\\/][a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}")
         mock_get_repo_folder_path.assert_called_once()
         mock_makedirs.assert_called_once_with(repo_path)
         mock_which.assert_called_once_with("git")
-        mock_run.assert_called_once_with(["git", "clone", repo_url, repo_path], check=True)
+        mock_update_mirror.assert_called_once_with(repo_url)
+        mock_run.assert_has_calls([
+            call(["git", "clone", "mirror_path", repo_path], check=True),
+            call(["git", "-C", repo_path, "remote", "set-url", "origin", repo_url], check=True)
+        ])
 
         # Run with branch
         mock_run.reset_mock()
         repo_path = runner.clone_git_repo(repo_url, "branch1")
-        mock_run.assert_called_once_with(["git", "clone", "-b", "branch1", repo_url, repo_path], check=True)
+        mock_run.assert_any_call(["git", "clone", "-b", "branch1", "mirror_path", repo_path], check=True)
+
+        # Clone directly if the mirror can't be updated
+        mock_run.reset_mock()
+        mock_update_mirror.side_effect = subprocess.CalledProcessError(1, "git")
+        repo_path = runner.clone_git_repo(repo_url, "")
+        mock_run.assert_called_once_with(["git", "clone", repo_url, repo_path], check=True)
 
+    @patch(f"{TEST_MODULE}.venv_cache.get_python_future")
     @patch(f"{TEST_MODULE}.util.get_scheduler_name", return_value="Machine Name")
     @patch(f"{TEST_MODULE}.subprocess.Popen")
     @patch(f"{TEST_MODULE}.os.path.isfile", return_value=True)
     @patch(f"{TEST_MODULE}.find_main_file", return_value="main.py")
     @patch(f"{TEST_MODULE}.clone_git_repo", return_value="folder_path")
-    def test_run_trigger(self, mock_clone_git_repo: MagicMock, mock_find_main_file: MagicMock, mock_isfile: MagicMock,
-                         mock_popen: MagicMock, mock_get_scheduler_name: MagicMock):
-        """Test the run_trigger function in the runner module.
+    def test_run_process(self, mock_clone_git_repo: MagicMock, mock_find_main_file: MagicMock, mock_isfile: MagicMock,
+                         mock_popen: MagicMock, mock_get_scheduler_name: MagicMock, mock_get_python_future: MagicMock):
+        """Test claiming a trigger and running its process with the runner module.
 
         Args:
             mock_clone_git_repo: A MagicMock of the runner.clone_git_repo function.
@@ -64,7 +79,11 @@ class TestSchedulerRunner(unittest.TestCase):
             mock_isfile: A MagicMock of the os.path.isfile function.
             mock_Popen: A MagicMock of the subprocess.Popen class.
             mock_get_scheduler_name: A MagicMock of the util.get_scheduler_name function.
+            mock_get_python_future: A MagicMock of the venv_cache.get_python_future function.
         """
+        mock_get_python_future.return_value = Future()
+        mock_get_python_future.return_value.set_result("venv_python")
+
         trigger_id = db_util.create_single_trigger(
             trigger_name="Trigger Name",
             process_name="Process Name",
@@ -78,8 +97,13 @@ class TestSchedulerRunner(unittest.TestCase):
             git_branch="Branch"
         )
 
-        trigger = db_util.get_trigger(trigger_id)
-        job = runner.run_trigger(trigger)
+        mock_app = MagicMock(running_jobs=[], is_exclusive=False)
+        trigger = runner.claim_trigger(mock_app)
+        self.assertEqual(trigger.id, trigger_id)
+
+        mock_popen.return_value.stdout = None
+        mock_popen.return_value.stderr = None
+        job = runner.run_process(trigger)
 
         # Check the job object
         self.assertEqual(job.trigger, trigger)
@@ -89,9 +113,10 @@ class TestSchedulerRunner(unittest.TestCase):
         mock_clone_git_repo.assert_called_once_with(trigger.process_path, trigger.git_branch)
         mock_find_main_file.assert_called_once_with("folder_path")
         mock_isfile.assert_called_once_with("main.py")
-        mock_popen.assert_called_once_with(['python', "main.py", trigger.process_name, db_util.get_conn_string(), crypto_util.get_key(), trigger.process_args, str(trigger.id)],
-                                           stderr=subprocess.PIPE, text=True)
-        mock_get_scheduler_name.assert_called_once()
+        mock_get_python_future.assert_called_once_with(trigger.process_path, "folder_path", "main.py")
+        mock_popen.assert_called_once_with(['venv_python', "main.py", trigger.process_name, db_util.get_conn_string(), crypto_util.get_key(), trigger.process_args, str(trigger.id)],
+                                           stdout=None, stderr=subprocess.PIPE, text=True, errors="replace")
+        self.assertEqual(mock_get_scheduler_name.call_count, 2)
 
         # Check that trigger status was set
         trigger = db_util.get_trigger(trigger_id)
@@ -102,6 +127,49 @@ class TestSchedulerRunner(unittest.TestCase):
         self.assertEqual(schedulers[0].machine_name, "Machine Name")
         self.assertEqual(schedulers[0].latest_trigger, "Trigger Name")
 
+    @patch(f"{TEST_MODULE}.clear_folder")
+    @patch(f"{TEST_MODULE}.venv_cache.get_python_future")
+    @patch(f"{TEST_MODULE}.subprocess.Popen")
+    @patch(f"{TEST_MODULE}.os.path.isfile", return_value=True)
+    @patch(f"{TEST_MODULE}.find_main_file", return_value="main.py")
+    @patch(f"{TEST_MODULE}.clone_git_repo", return_value="folder_path")
+    def test_waiting_job(self, _, __, ___, mock_popen: MagicMock, mock_get_python_future: MagicMock, mock_clear_folder: MagicMock):
+        """Test that a process waits for its virtual environment without blocking.
+
+        Args:
+            mock_popen: A MagicMock of the subprocess.Popen class.
+            mock_get_python_future: A MagicMock of the venv_cache.get_python_future function.
+            mock_clear_folder: A MagicMock of the runner.clear_folder function.
+        """
+        db_util.create_single_trigger("Trigger", "Process", datetime.now(), "https://mock_repo.com/git", "", True, False, 0)
+        mock_app = MagicMock(running_jobs=[], is_exclusive=False)
+        mock_popen.return_value.stdout = None
+        mock_popen.return_value.stderr = None
+
+        # The process is started when the environment is ready
+        mock_get_python_future.return_value = Future()
+        job = runner.run_process(runner.claim_trigger(mock_app))
+        self.assertIsNone(job.process)
+        self.assertFalse(runner.needs_check(job))
+        mock_popen.assert_not_called()
+
+        job.python_future.set_result("venv_python")
+        self.assertTrue(runner.needs_check(job))
+        self.assertTrue(runner.start_waiting_job(job))
+        self.assertIs(job.process, mock_popen.return_value)
+        self.assertEqual(mock_popen.call_args.args[0][0], "venv_python")
+        job.output.close()
+
+        # The job fails if the environment couldn't be built
+        trigger_id = db_util.create_single_trigger("Trigger 2", "Process", datetime.now(), "https://mock_repo.com/git", "", True, False, 0)
+        mock_get_python_future.return_value = Future()
+        job = runner.run_process(runner.claim_trigger(mock_app))
+
+        job.python_future.set_exception(subprocess.CalledProcessError(1, "pip"))
+        self.assertFalse(runner.start_waiting_job(job))
+        self.assertEqual(db_util.get_trigger(trigger_id).process_status, TriggerStatus.FAILED)
+        mock_clear_folder.assert_called_once_with("folder_path")
+
 
 if __name__ == '__main__':
     unittest.main()
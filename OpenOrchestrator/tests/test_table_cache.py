@@ -0,0 +1,32 @@
+"""This module tests the OpenOrchestrator.orchestrator.table_cache module."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from OpenOrchestrator.orchestrator.table_cache import TableCache
+
+
+class TestTableCache(unittest.TestCase):
+    """Test skipping of unchanged table updates in Orchestrator."""
+    def test_update(self):
+        """Test that rows are only sent to the table when they change."""
+        table = MagicMock()
+        cache = TableCache(table)
+
+        rows = [{"Name": "A", "Value": 1}, {"Name": "B", "Value": 2}]
+        self.assertTrue(cache.update(rows))
+        table.update_rows.assert_called_once_with(rows)
+
+        # Same data in new objects with a different key order
+        table.update_rows.reset_mock()
+        self.assertFalse(cache.update([{"Value": 1, "Name": "A"}, {"Value": 2, "Name": "B"}]))
+        table.update_rows.assert_not_called()
+
+        # Changed data
+        rows[1]["Value"] = 3
+        self.assertTrue(cache.update(rows))
+        table.update_rows.assert_called_once_with(rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ from datetime import datetime
 
 from OpenOrchestrator.scheduler import runner
 from OpenOrchestrator.database import db_util
-from OpenOrchestrator.database.triggers import SingleTrigger
+from OpenOrchestrator.database.triggers import SingleTrigger, TriggerStatus
 from OpenOrchestrator.tests import db_test_util
 
 
@@ -16,126 +16,155 @@ class TestTriggerPolling(unittest.TestCase):
     def setUp(self) -> None:
         db_test_util.establish_clean_database()
 
-    def test_poll_triggers_single(self, *_):
-        """Test polling single triggers."""
+    def test_claim_triggers_single(self, *_):
+        """Test claiming single triggers."""
         mock_app = setup_mock_app(has_running_jobs=False, is_exclusive=False)
 
         # Test with no triggers
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertIsNone(trigger)
 
         # Test with idle trigger
         db_util.create_single_trigger("Future single trigger", "", datetime(2100, 1, 1), "", "", False, False, 0)
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertIsNone(trigger)
 
         # Test with overdue trigger
         db_util.create_single_trigger("Past single trigger", "", datetime(2020, 1, 1), "", "", False, False, 0)
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertIsInstance(trigger, SingleTrigger)
         self.assertEqual(trigger.trigger_name, "Past single trigger")
 
-    def test_poll_triggers_priority(self, *_):
-        """Test polling triggers with priorities set."""
+        # A claimed trigger isn't claimed again
+        trigger = runner.claim_trigger(mock_app)
+        self.assertIsNone(trigger)
+
+    def test_claim_triggers_priority(self, *_):
+        """Test claiming triggers with priorities set."""
         mock_app = setup_mock_app(has_running_jobs=False, is_exclusive=False)
 
         db_util.create_single_trigger("Low", "", datetime(2000, 1, 1), "", "", False, False, 0)
         db_util.create_single_trigger("High", "", datetime(2000, 1, 1), "", "", False, False, 100)
+        db_util.create_single_trigger("Higher Future", "", datetime(2100, 1, 1), "", "", False, False, 200)
 
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertEqual(trigger.trigger_name, "High")
 
-        db_util.create_single_trigger("Higher Future", "", datetime(2100, 1, 1), "", "", False, False, 200)
+        trigger = runner.claim_trigger(mock_app)
+        self.assertEqual(trigger.trigger_name, "Low")
 
-        trigger = runner.poll_triggers(mock_app)
-        self.assertEqual(trigger.trigger_name, "High")
+        trigger = runner.claim_trigger(mock_app)
+        self.assertIsNone(trigger)
 
-    def test_poll_triggers_mixed(self, *_):
+    def test_claim_triggers_mixed(self, *_):
         """Test mixed trigger types with priorities set.
         Equal priorities should be prioritied by trigger type:
         Single > Scheduled > Queue
         """
         mock_app = setup_mock_app(has_running_jobs=False, is_exclusive=False)
 
-        db_util.create_queue_trigger("Queue", "", "Queue", "", "", False, False, 1, 0)
         db_util.create_queue_element("Queue")
-        trigger = runner.poll_triggers(mock_app)
-        self.assertEqual(trigger.trigger_name, "Queue")
-
-        db_util.create_scheduled_trigger("Scheduled", "", "", datetime(2000, 1, 1), "", "", False, False, 0)
-        trigger = runner.poll_triggers(mock_app)
-        self.assertEqual(trigger.trigger_name, "Scheduled")
-
+        db_util.create_queue_trigger("Queue", "", "Queue", "", "", False, False, 1, 0)
+        db_util.create_scheduled_trigger("Scheduled", "", "0 0 * * *", datetime(2000, 1, 1), "", "", False, False, 0)
         db_util.create_single_trigger("Single", "", datetime(2000, 1, 1), "", "", False, False, 0)
-        trigger = runner.poll_triggers(mock_app)
-        self.assertEqual(trigger.trigger_name, "Single")
-
         db_util.create_queue_trigger("Queue High", "", "Queue", "", "", False, False, 1, 1)
-        trigger = runner.poll_triggers(mock_app)
-        self.assertEqual(trigger.trigger_name, "Queue High")
-
-        db_util.create_scheduled_trigger("Scheduled High", "", "", datetime(2000, 1, 1), "", "", False, False, 1)
-        trigger = runner.poll_triggers(mock_app)
-        self.assertEqual(trigger.trigger_name, "Scheduled High")
-
+        db_util.create_scheduled_trigger("Scheduled High", "", "0 0 * * *", datetime(2000, 1, 1), "", "", False, False, 1)
         db_util.create_single_trigger("Single High", "", datetime(2000, 1, 1), "", "", False, False, 1)
-        trigger = runner.poll_triggers(mock_app)
-        self.assertEqual(trigger.trigger_name, "Single High")
 
-    def test_poll_triggers_blocking(self, *_):
-        """Test polling triggers when other jobs are running."""
+        for name in ("Single High", "Scheduled High", "Queue High", "Single", "Scheduled", "Queue"):
+            trigger = runner.claim_trigger(mock_app)
+            self.assertEqual(trigger.trigger_name, name)
+
+    def test_claim_triggers_blocking(self, *_):
+        """Test claiming triggers when other jobs are running."""
         mock_app = setup_mock_app(has_running_jobs=True, is_exclusive=False)
 
         db_util.create_single_trigger("Single Blocking", "", datetime(2000, 1, 1), "", "", False, True, 0)
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertIsNone(trigger)
 
         db_util.create_single_trigger("Single Non-blocking", "", datetime(2000, 1, 1), "", "", False, False, 0)
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertEqual(trigger.trigger_name, "Single Non-blocking")
 
-    def test_poll_triggers_whitelist_non_exclusive(self, *_):
-        """Test polling whitelisted triggers when Scheduler is not exclusive."""
+    def test_claim_triggers_whitelist_non_exclusive(self, *_):
+        """Test claiming whitelisted triggers when Scheduler is not exclusive."""
         mock_app = setup_mock_app(has_running_jobs=False, is_exclusive=False)
 
         db_util.create_single_trigger("Single non machine", "", datetime(2000, 1, 1), "", "", False, False, 0, ["Non machine"])
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertIsNone(trigger)
 
         db_util.create_single_trigger("Single no whitelist", "", datetime(2000, 1, 1), "", "", False, False, 0)
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertEqual(trigger.trigger_name, "Single no whitelist")
 
-    def test_poll_triggers_whitelist_exclusive(self, *_):
-        """Test polling whitelisted triggers when Scheduler is exclusive."""
+    def test_claim_triggers_whitelist_exclusive(self, *_):
+        """Test claiming whitelisted triggers when Scheduler is exclusive."""
         mock_app = setup_mock_app(has_running_jobs=False, is_exclusive=True)
 
         db_util.create_single_trigger("Single non machine", "", datetime(2000, 1, 1), "", "", False, False, 0, ["Non machine"])
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertIsNone(trigger)
 
         db_util.create_single_trigger("Single no whitelist", "", datetime(2000, 1, 1), "", "", False, False, 0)
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertIsNone(trigger)
 
         db_util.create_single_trigger("Single whitelist", "", datetime(2000, 1, 1), "", "", False, False, 0, ["Machine"])
-        trigger = runner.poll_triggers(mock_app)
+        trigger = runner.claim_trigger(mock_app)
         self.assertEqual(trigger.trigger_name, "Single whitelist")
 
+    def test_claim_trigger(self, *_):
+        """Test claiming triggers through the runner."""
+        mock_app = setup_mock_app(has_running_jobs=True, is_exclusive=False)
+
+        db_util.create_single_trigger("Single Blocking", "", datetime(2000, 1, 1), "", "", False, True, 1)
+        db_util.create_single_trigger("Single Non-blocking", "", datetime(2000, 1, 1), "", "", False, False, 0)
+
+        trigger = runner.claim_trigger(mock_app)
+        self.assertEqual(trigger.trigger_name, "Single Non-blocking")
+        self.assertEqual(trigger.process_status, TriggerStatus.RUNNING)
+
+        trigger = runner.claim_trigger(mock_app)
+        self.assertIsNone(trigger)
+
+        mock_app = setup_mock_app(has_running_jobs=False, is_exclusive=False)
+        trigger = runner.claim_trigger(mock_app)
+        self.assertEqual(trigger.trigger_name, "Single Blocking")
+
+    def test_claim_trigger_weight(self, *_):
+        """Test that claimed triggers fit in the free job slots."""
+        db_util.create_single_trigger("Heavy", "", datetime(2000, 1, 1), "", "", False, False, 1, weight=4)
+        db_util.create_single_trigger("Light", "", datetime(2000, 1, 1), "", "", False, False, 0, weight=2)
+
+        # One running job with weight 1 leaves 3 of 4 slots free
+        mock_app = setup_mock_app(has_running_jobs=True, is_exclusive=False, slots=4)
+        self.assertEqual(runner.get_free_slots(mock_app), 3)
+        trigger = runner.claim_trigger(mock_app)
+        self.assertEqual(trigger.trigger_name, "Light")
+
+        # Any trigger may run alone
+        mock_app = setup_mock_app(has_running_jobs=False, is_exclusive=False, slots=1)
+        trigger = runner.claim_trigger(mock_app)
+        self.assertEqual(trigger.trigger_name, "Heavy")
+
 
-def setup_mock_app(*, has_running_jobs: bool, is_exclusive: bool) -> MagicMock:
+def setup_mock_app(*, has_running_jobs: bool, is_exclusive: bool, slots: int = 8) -> MagicMock:
     """Create a mock Application object to be used in tests.
 
     Args:
         has_running_jobs: If the app should simulate having running jobs.
         is_exclusive: If the app should simulate only running whitelisted triggers.
+        slots: The number of job slots of the app.
 
     Returns:
         A mock Application object.
     """
     mock_app = MagicMock()
-    mock_app.running_jobs = [None] if has_running_jobs else []
-    mock_app.settings_tab_.whitelist_value.get.return_value = is_exclusive
+    mock_app.running_jobs = [MagicMock(trigger=MagicMock(weight=1))] if has_running_jobs else []
+    mock_app.slots = slots
+    mock_app.is_exclusive = is_exclusive
     return mock_app
 
 
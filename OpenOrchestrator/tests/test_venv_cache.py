@@ -0,0 +1,136 @@
+"""This module tests the OpenOrchestrator.scheduler.venv_cache module."""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+from OpenOrchestrator.scheduler import venv_cache, util
+
+
+class TestVenvCache(unittest.TestCase):
+    """Test the virtual environment cache of the Scheduler."""
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_folder = os.path.join(self.temp_dir, "cache")
+
+        patcher = patch("OpenOrchestrator.scheduler.venv_cache.get_cache_folder_path", return_value=self.cache_folder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.repo_path = os.path.join(self.temp_dir, "repo")
+        self.main_path = os.path.join(self.repo_path, "robot", "main.py")
+        os.makedirs(os.path.dirname(self.main_path))
+
+    def tearDown(self) -> None:
+        util.remove_folder(self.temp_dir)
+
+    def _write(self, path: str, content: str):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+
+    def test_find_requirements(self):
+        """Test finding the requirements of a process."""
+        self.assertIsNone(venv_cache.find_requirements(self.repo_path, self.main_path))
+
+        # pyproject.toml without dependencies is ignored
+        pyproject_path = os.path.join(self.repo_path, "pyproject.toml")
+        self._write(pyproject_path, '[project]\nname = "robot"\n')
+        self.assertIsNone(venv_cache.find_requirements(self.repo_path, self.main_path))
+
+        self._write(pyproject_path, '[project]\nname = "robot"\ndependencies = ["requests", "OpenOrchestrator>=1.0"]\n')
+        self.assertEqual(venv_cache.find_requirements(self.repo_path, self.main_path), (pyproject_path, ["requests", "OpenOrchestrator>=1.0"]))
+
+        # Requirements closest to the main file win
+        requirements_path = os.path.join(self.repo_path, "robot", "requirements.txt")
+        self._write(requirements_path, "requests\n")
+        self.assertEqual(venv_cache.find_requirements(self.repo_path, self.main_path), (requirements_path, ["-r", requirements_path]))
+
+    def test_venv_path(self):
+        """Test that the environment path follows the repo and requirements."""
+        requirements_path = os.path.join(self.repo_path, "requirements.txt")
+        self._write(requirements_path, "requests\n")
+        path = venv_cache.get_venv_path("repo_url", requirements_path)
+
+        self.assertEqual(venv_cache.get_venv_path("repo_url", requirements_path), path)
+        self.assertNotEqual(venv_cache.get_venv_path("other_url", requirements_path), path)
+
+        self._write(requirements_path, "requests==2.0\n")
+        self.assertNotEqual(venv_cache.get_venv_path("repo_url", requirements_path), path)
+
+    def test_get_python(self):
+        """Test building and reusing an environment."""
+        self.assertEqual(venv_cache.get_python("repo_url", self.repo_path, self.main_path), "python")
+
+        self._write(os.path.join(self.repo_path, "requirements.txt"), "# No requirements\n")
+        python_path = venv_cache.get_python("repo_url", self.repo_path, self.main_path)
+        self.assertTrue(os.path.isfile(python_path))
+
+        # The environment can see the packages of the Scheduler
+        subprocess.run([python_path, "-c", "import OpenOrchestrator"], check=True)
+
+        # The environment is reused
+        with patch("OpenOrchestrator.scheduler.venv_cache.build_venv") as mock_build_venv:
+            self.assertEqual(venv_cache.get_python("repo_url", self.repo_path, self.main_path), python_path)
+            mock_build_venv.assert_not_called()
+
+    def test_background_build(self):
+        """Test that environments are built in the background and builds are shared."""
+        self._write(os.path.join(self.repo_path, "requirements.txt"), "requests\n")
+        release = threading.Event()
+
+        def build_venv(venv_path, *_):
+            release.wait(5)
+            os.makedirs(venv_path)
+            self._write(os.path.join(venv_path, venv_cache.COMPLETE_MARKER), "Complete")
+
+        with patch("OpenOrchestrator.scheduler.venv_cache.build_venv", side_effect=build_venv) as mock_build_venv:
+            future = venv_cache.get_python_future("repo_url", self.repo_path, self.main_path)
+            self.assertFalse(future.done())
+            self.assertIs(venv_cache.get_python_future("repo_url", self.repo_path, self.main_path), future)
+
+            # The cache isn't evicted during a build
+            with patch("OpenOrchestrator.scheduler.venv_cache.util.evict_least_recently_used") as mock_evict:
+                venv_cache.evict_venvs(force=True)
+                mock_evict.assert_not_called()
+
+            release.set()
+            python_path = future.result(5)
+            mock_build_venv.assert_called_once()
+
+        self.assertTrue(venv_cache.get_python_future("repo_url", self.repo_path, self.main_path).done())
+        self.assertEqual(venv_cache.get_python("repo_url", self.repo_path, self.main_path), python_path)
+
+    @patch("OpenOrchestrator.scheduler.venv_cache.subprocess.run")
+    def test_failed_build(self, mock_run: MagicMock):
+        """Test that a failed build leaves nothing behind."""
+        mock_run.side_effect = [None, subprocess.CalledProcessError(1, "pip")]
+        venv_path = os.path.join(self.cache_folder, "venv")
+        os.makedirs(venv_path)
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            venv_cache.build_venv(venv_path, ["requests"], self.repo_path)
+
+        self.assertFalse(os.path.exists(venv_path))
+
+    def test_evict_venvs(self):
+        """Test evicting incomplete, old and least recently used environments."""
+        paths = [os.path.join(self.cache_folder, name) for name in ("incomplete", "old", "new")]
+        for path in paths:
+            os.makedirs(path)
+        for path in paths[1:]:
+            self._write(os.path.join(path, venv_cache.COMPLETE_MARKER), "Complete")
+        os.utime(paths[1], (time.time() - 100, time.time() - 100))
+
+        venv_cache.evict_venvs(max_age=50, force=True)
+        self.assertEqual(os.listdir(self.cache_folder), ["new"])
+
+        venv_cache.evict_venvs(max_bytes=0, force=True)
+        self.assertEqual(os.listdir(self.cache_folder), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
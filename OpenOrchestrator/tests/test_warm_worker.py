@@ -0,0 +1,84 @@
+"""This module tests the OpenOrchestrator.scheduler.warm_worker module."""
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from OpenOrchestrator.database import db_util
+from OpenOrchestrator.scheduler import warm_worker
+
+from OpenOrchestrator.tests import db_test_util
+
+SCRIPT = """
+import sys
+import json
+
+with open(sys.argv[1], "w", encoding="utf-8") as file:
+    json.dump({"argv": sys.argv, "main": __name__, "modules": "sqlalchemy" in sys.modules}, file)
+
+if sys.argv[2] == "fail":
+    raise RuntimeError("Process failed")
+"""
+
+
+class TestWarmWorker(unittest.TestCase):
+    """Test running processes in warm workers."""
+    def setUp(self) -> None:
+        db_test_util.establish_clean_database()
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.script_path = os.path.join(self.temp_dir, "main.py")
+        self.output_path = os.path.join(self.temp_dir, "output.json")
+
+        with open(self.script_path, "w", encoding="utf-8") as file:
+            file.write(SCRIPT)
+
+    def tearDown(self) -> None:
+        warm_worker.stop_pool()
+        shutil.rmtree(self.temp_dir)
+
+    def test_disabled(self):
+        """Test that no worker is used when the pool is disabled."""
+        self.assertIsNone(warm_worker.run_in_worker([self.script_path, self.output_path, "ok"]))
+
+    def test_not_connected(self):
+        """Test that workers are only started once connected to the database."""
+        db_util.disconnect()
+
+        warm_worker.set_pool_size(1)
+        self.assertIsNone(warm_worker.run_in_worker([self.script_path, self.output_path, "ok"]))
+
+        db_test_util.establish_clean_database()
+        warm_worker.fill_pool()
+        process = warm_worker.run_in_worker([self.script_path, self.output_path, "ok"])
+        self.assertIsNotNone(process)
+        process.communicate(timeout=30)
+
+    def test_run_in_worker(self):
+        """Test running a process in a warm worker."""
+        warm_worker.set_pool_size(1)
+        warm_worker.fill_pool()
+
+        process = warm_worker.run_in_worker([self.script_path, self.output_path, "ok"])
+        self.assertIsNotNone(process)
+        _, error = process.communicate(timeout=30)
+        self.assertEqual(process.returncode, 0, error)
+
+        with open(self.output_path, encoding="utf-8") as file:
+            output = file.read()
+
+        self.assertIn(f'"argv": [{self.script_path!r}'.replace("'", '"'), output)
+        self.assertIn('"main": "__main__"', output)
+        self.assertIn('"modules": true', output)
+
+        # The pool is refilled
+        process = warm_worker.run_in_worker([self.script_path, self.output_path, "fail"])
+        self.assertIsNotNone(process)
+        _, error = process.communicate(timeout=30)
+        self.assertEqual(process.returncode, 1)
+        self.assertIn("RuntimeError: Process failed", error)
+
+
+if __name__ == '__main__':
+    unittest.main()
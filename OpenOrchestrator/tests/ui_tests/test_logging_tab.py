@@ -145,6 +145,9 @@ class TestLogsTab(unittest.TestCase):
         if to_date:
             to_input.send_keys(to_date.strftime("%d-%m-%Y %H:%M"))
 
+        # Wait for the debounced query
+        time.sleep(0.5)
+
     def _set_process_filter(self, index: int):
         """Select a process in the process filter.
 
@@ -1,6 +1,7 @@
 """Tests relating to the queues tab in Orchestrator."""
 
 import unittest
+import time
 from datetime import datetime, timedelta
 
 from selenium.webdriver.common.by import By
@@ -238,6 +239,9 @@ class TestQueuesTab(unittest.TestCase):
         if to_date:
             to_input.send_keys(to_date.strftime("%d-%m-%Y %H:%M"))
 
+        # Wait for the debounced query
+        time.sleep(0.5)
+
     def _set_status_filter(self, status=None):
         """Set status filter in queue popup."""
         if status is None:
@@ -246,6 +250,7 @@ class TestQueuesTab(unittest.TestCase):
         status_select.click()
         option = status_select.find_element(By.XPATH, f"//div[contains(@class,'q-item')]//span[text()='{status}']")
         option.click()
+        time.sleep(0.5)
 
     def _set_search_filter(self, search_term=""):
         """Set reference search filter in queue popup."""
@@ -254,6 +259,9 @@ class TestQueuesTab(unittest.TestCase):
         if search_term:
             search_field.send_keys(search_term)
 
+        # Wait for the debounced query
+        time.sleep(0.5)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,44 @@
+"""Database revision '3c1f0b7d2e84': Added queue counts table"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# pylint: disable=invalid-name
+# revision identifiers, used by Alembic.
+revision: str = '3c1f0b7d2e84'
+down_revision = '9698388a0709'
+branch_labels = None
+depends_on = None
+
+
+STATUSES = ('NEW', 'IN_PROGRESS', 'DONE', 'FAILED', 'ABANDONED')
+
+
+def upgrade() -> None:
+    """Upgrade the database."""
+    queue_counts = op.create_table(
+        'Queue_Counts',
+        sa.Column('queue_name', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.Enum(*STATUSES, name='queuestatus'), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('queue_name', 'status')
+    )
+
+    # Count the existing queue elements and create a row for every status of every queue
+    queues = sa.table('Queues', sa.column('queue_name'), sa.column('status'))
+    query = (
+        sa.select(queues.c.queue_name, queues.c.status, sa.func.count())  # pylint: disable=not-callable
+        .group_by(queues.c.queue_name, queues.c.status)
+    )
+    counts = {(queue_name, str(status)): count for queue_name, status, count in op.get_bind().execute(query)}
+    queue_names = {queue_name for queue_name, _ in counts}
+
+    op.bulk_insert(
+        queue_counts,
+        [
+            {'queue_name': queue_name, 'status': status, 'count': counts.get((queue_name, status), 0)}
+            for queue_name in queue_names
+            for status in STATUSES
+        ]
+    )
@@ -0,0 +1,16 @@
+"""Database revision '5e7b1c9d2a46': Added index for paging queue elements"""
+
+from alembic import op
+
+
+# pylint: disable=invalid-name
+# revision identifiers, used by Alembic.
+revision: str = '5e7b1c9d2a46'
+down_revision = 'd83a5e2c7f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database."""
+    op.create_index('ix_Queues_queue_name_created_date_id', 'Queues', ['queue_name', 'created_date', 'id'], unique=False)
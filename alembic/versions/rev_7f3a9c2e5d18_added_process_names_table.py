@@ -0,0 +1,30 @@
+"""Database revision '7f3a9c2e5d18': Added process names table"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# pylint: disable=invalid-name
+# revision identifiers, used by Alembic.
+revision: str = '7f3a9c2e5d18'
+down_revision = 'b2f8e4a61c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database."""
+    process_names = op.create_table(
+        'Process_Names',
+        sa.Column('process_name', sa.String(length=100), nullable=False),
+        sa.PrimaryKeyConstraint('process_name')
+    )
+
+    # Register the process names of the existing logs and triggers
+    logs = sa.table('Logs', sa.column('process_name'))
+    triggers = sa.table('Triggers', sa.column('process_name'))
+    query = sa.union(
+        sa.select(logs.c.process_name),
+        sa.select(triggers.c.process_name)
+    )
+    op.execute(sa.insert(process_names).from_select(['process_name'], query))
@@ -0,0 +1,23 @@
+"""Database revision 'a41e6c9f5b13': Added composite indexes to queues and logs"""
+
+from alembic import op
+
+
+# pylint: disable=invalid-name
+# revision identifiers, used by Alembic.
+revision: str = 'a41e6c9f5b13'
+down_revision = '3c1f0b7d2e84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database."""
+    # The queue_name index is a prefix of the new composite index
+    op.drop_index('ix_Queues_queue_name', table_name='Queues')
+    op.create_index('ix_Queues_queue_name_status_created_date', 'Queues', ['queue_name', 'status', 'created_date'], unique=False)
+    op.create_index('ix_Queues_queue_name_reference', 'Queues', ['queue_name', 'reference'], unique=False)
+
+    op.create_index('ix_Logs_log_time', 'Logs', ['log_time'], unique=False)
+    op.create_index('ix_Logs_process_name_log_time', 'Logs', ['process_name', 'log_time'], unique=False)
+    op.create_index('ix_Logs_log_level_log_time', 'Logs', ['log_level', 'log_time'], unique=False)
@@ -0,0 +1,26 @@
+"""Database revision 'b2f8e4a61c37': Added queue search tokens table"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# pylint: disable=invalid-name
+# revision identifiers, used by Alembic.
+revision: str = 'b2f8e4a61c37'
+down_revision = '5e7b1c9d2a46'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database."""
+    # The table is filled by db_util.rebuild_queue_search_index when the token search backend is enabled
+    op.create_table(
+        'Queue_Search_Tokens',
+        sa.Column('queue_name', sa.String(length=100), nullable=False),
+        sa.Column('token', sa.String(length=50), nullable=False),
+        sa.Column('element_id', sa.Uuid(), nullable=False),
+        sa.Column('in_message', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('queue_name', 'token', 'element_id', 'in_message')
+    )
+    op.create_index('ix_Queue_Search_Tokens_element_id', 'Queue_Search_Tokens', ['element_id'], unique=False)
@@ -0,0 +1,38 @@
+"""Database revision 'c4d7a2e9f031': Added queue count shards"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# pylint: disable=invalid-name
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7a2e9f031'
+down_revision = '7f3a9c2e5d18'
+branch_labels = None
+depends_on = None
+
+
+STATUSES = ('NEW', 'IN_PROGRESS', 'DONE', 'FAILED', 'ABANDONED')
+
+
+def upgrade() -> None:
+    """Upgrade the database."""
+    # The primary key changes, so the table is recreated with the existing counts in the first shard
+    old_counts = sa.table('Queue_Counts', sa.column('queue_name'), sa.column('status'), sa.column('count'))
+    rows = [
+        {'queue_name': queue_name, 'status': str(status), 'shard': 0, 'count': count}
+        for queue_name, status, count in op.get_bind().execute(sa.select(old_counts))
+    ]
+
+    op.drop_table('Queue_Counts')
+
+    queue_counts = op.create_table(
+        'Queue_Counts',
+        sa.Column('queue_name', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.Enum(*STATUSES, name='queuestatus'), nullable=False),
+        sa.Column('shard', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('queue_name', 'status', 'shard')
+    )
+
+    op.bulk_insert(queue_counts, rows)
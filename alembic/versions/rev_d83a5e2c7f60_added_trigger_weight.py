@@ -0,0 +1,17 @@
+"""Database revision 'd83a5e2c7f60': Added weight to triggers"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# pylint: disable=invalid-name
+# revision identifiers, used by Alembic.
+revision: str = 'd83a5e2c7f60'
+down_revision = 'a41e6c9f5b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database."""
+    op.add_column('Triggers', sa.Column('weight', sa.Integer(), nullable=False, server_default='1'))